@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Build the bundled license fingerprint index (diversity_standard/license_index.json)."""
+
+import json
+import sys
+from pathlib import Path
+
+from diversity_standard.licenses import (
+    LICENSE_INDEX_FILE,
+    LICENSE_INDEX_FORMAT,
+    SHINGLE_WORDS,
+    encode_fingerprint,
+    license_fingerprint,
+)
+
+
+def collect_license_texts(cli_root: Path) -> dict:
+    """Gather SPDX identifier -> license text from license_texts/<SPDX id>.txt."""
+    texts = {}
+    for path in sorted((cli_root / "license_texts").glob("*.txt")):
+        texts[path.stem] = path.read_text(encoding="utf-8")
+    return texts
+
+
+def build_license_index():
+    """Fingerprint every license text and write the index."""
+    cli_root = Path(__file__).parent
+    texts = collect_license_texts(cli_root)
+    if not texts:
+        sys.exit("No license texts found")
+
+    index = {
+        "format": LICENSE_INDEX_FORMAT,
+        "shingle_words": SHINGLE_WORDS,
+        "licenses": {
+            spdx_id: encode_fingerprint(license_fingerprint(text))
+            for spdx_id, text in sorted(texts.items())
+        },
+    }
+    LICENSE_INDEX_FILE.write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    print(f"\n✓ Indexed {len(texts)} license(s) in {LICENSE_INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    build_license_index()
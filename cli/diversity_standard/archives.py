@@ -0,0 +1,207 @@
+"""Read release archives (tarballs and zip files) without extracting them."""
+
+import datetime
+import io
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from diversity_standard.sources import walk_order_key
+from diversity_standard.utils import (
+    DEFAULT_EXCLUDES,
+    FileEntry,
+    IgnoreRules,
+    is_excluded,
+    parse_ignore_patterns,
+)
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+ZIP_SUFFIXES = (".zip",)
+
+# Markdown members of a streamed tarball are kept in memory up to this many
+# bytes in total; beyond it they are re-read from the archive on demand
+TAR_BUFFER_BYTES = 64 * 1024 * 1024
+
+
+def is_archive(path: Path) -> bool:
+    """Check whether a path is a tarball or zip archive the inspector reads.
+
+    Args:
+        path: Path to check
+
+    Returns:
+        True for a regular file with a supported archive suffix
+    """
+    name = path.name.lower()
+    return path.is_file() and name.endswith(TAR_SUFFIXES + ZIP_SUFFIXES)
+
+
+def _member_path(name: str) -> Optional[str]:
+    """Normalise an archive member name to a POSIX relative path."""
+    parts = [part for part in name.replace("\\", "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        return None
+    return "/".join(parts)
+
+
+class ArchiveSource:
+    """Lists an archive's files and opens its members as streams.
+
+    Member paths become FileEntry objects under the archive path, so
+    ``entry.path.relative_to(archive)`` gives the member name. Zip archives
+    are listed from their central directory and only the members that are
+    opened get decompressed. Tarballs have no index, so they are streamed
+    once: the listing is collected and markdown members are buffered as the
+    stream passes them.
+    """
+
+    def __init__(
+        self, path: Path, exclude: Optional[List[str]] = None, max_bytes: Optional[int] = None
+    ):
+        """Prepare to read an archive; nothing is opened until list_files.
+
+        Args:
+            path: Archive file
+            exclude: Extra .gitignore-style patterns to skip, on top of the
+                    built-in deny list (.gitignore files inside the archive
+                    are not applied)
+            max_bytes: Only keep this many bytes of each tarball member read
+                      into memory. If None, members are read whole.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ignore = IgnoreRules(
+            parse_ignore_patterns(DEFAULT_EXCLUDES), parse_ignore_patterns(exclude or [])
+        )
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        self._lock = threading.Lock()
+        self._buffered: Dict[str, bytes] = {}
+        self._members: Dict[str, str] = {}
+        self._verdicts: Dict[str, bool] = {}
+        self._is_zip = path.name.lower().endswith(ZIP_SUFFIXES)
+
+    def list_files(self) -> List[FileEntry]:
+        """List the archive's regular files that are not ignored.
+
+        Returns:
+            FileEntry objects in walk order
+
+        Raises:
+            OSError: If the archive is corrupt or cannot be read
+        """
+        try:
+            if self._is_zip:
+                return self._list_zip()
+            return self._list_tar()
+        except (tarfile.TarError, zipfile.BadZipFile, EOFError) as e:
+            raise OSError(f"Cannot read archive {self.path}: {e}") from e
+
+    def open(self, entry: FileEntry) -> BinaryIO:
+        """Open a listed member for reading.
+
+        Args:
+            entry: Entry returned by list_files
+
+        Returns:
+            Binary stream of the member's content
+
+        Raises:
+            OSError: If the member cannot be read
+        """
+        buffered = self._buffered.get(entry.rel_path)
+        if buffered is not None:
+            return io.BytesIO(buffered)
+        name = self._members[entry.rel_path]
+        try:
+            if self._is_zip:
+                assert self._zip is not None
+                return self._zip.open(name)
+            with self._lock:
+                # Random access into a compressed tarball is slow, so this
+                # only happens for members beyond the buffer budget
+                if self._tar is None:
+                    self._tar = tarfile.open(self.path)
+                member = self._tar.extractfile(name)
+                if member is None:
+                    raise OSError(f"{name} is not a regular file")
+                return io.BytesIO(member.read(self.max_bytes))
+        except (tarfile.TarError, zipfile.BadZipFile, RuntimeError, KeyError) as e:
+            # RuntimeError: encrypted zip member
+            raise OSError(f"Cannot read {name} from {self.path}: {e}") from e
+
+    def close(self) -> None:
+        """Close the archive."""
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+    def __enter__(self) -> "ArchiveSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _list_zip(self) -> List[FileEntry]:
+        """List a zip archive from its central directory."""
+        self._zip = zipfile.ZipFile(self.path)
+        entries = []
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            entry = self._add_member(info.filename, info.file_size, _zip_mtime_ns(info))
+            if entry is not None:
+                entries.append(entry)
+        return self._sorted(entries)
+
+    def _list_tar(self) -> List[FileEntry]:
+        """List a tarball in one streaming pass, buffering markdown members."""
+        entries = []
+        budget = TAR_BUFFER_BYTES
+        with tarfile.open(self.path, mode="r|*") as tar:
+            for member in tar:
+                if not member.isreg():
+                    continue
+                entry = self._add_member(member.name, member.size, int(member.mtime) * 10**9)
+                if entry is None:
+                    continue
+                entries.append(entry)
+                size = member.size if self.max_bytes is None else min(member.size, self.max_bytes)
+                if entry.name.endswith(".md") and size <= budget:
+                    stream = tar.extractfile(member)
+                    if stream is not None:
+                        self._buffered[entry.rel_path] = stream.read(size)
+                        budget -= size
+        return self._sorted(entries)
+
+    def _add_member(self, name: str, size: int, mtime_ns: int) -> Optional[FileEntry]:
+        """Record a member and build its FileEntry, or None if it is skipped."""
+        rel_path = _member_path(name)
+        if rel_path is None or rel_path in self._members:
+            return None
+        if is_excluded(rel_path, self.ignore, self._verdicts):
+            return None
+        self._members[rel_path] = name
+        return FileEntry(
+            path=self.path / rel_path,
+            rel_path=rel_path,
+            name=rel_path.rsplit("/", 1)[-1],
+            size=size,
+            mtime_ns=mtime_ns,
+        )
+
+    def _sorted(self, entries: List[FileEntry]) -> List[FileEntry]:
+        """Order members like a directory walk of the extracted archive."""
+        entries.sort(key=lambda entry: walk_order_key(entry.rel_path))
+        return entries
+
+
+def _zip_mtime_ns(info: zipfile.ZipInfo) -> int:
+    """Convert a zip member's DOS timestamp to nanoseconds (naive, local)."""
+    try:
+        return int(datetime.datetime(*info.date_time).timestamp()) * 10**9
+    except (OverflowError, ValueError):
+        return 0
@@ -0,0 +1,201 @@
+"""Persistent cache that makes repeat inspections incremental."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from diversity_standard import __version__
+from diversity_standard.utils import DirectoryItem, FileEntry, scan_directory
+
+CACHE_DIR_NAME = ".diversity-standard-cache"
+CACHE_FILE_NAME = "inspect.json"
+
+# Anything modified this recently may still change within the same mtime
+# tick, so it is re-checked on the next run instead of being trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def mapping_fingerprint(mapping_file: Path, *settings: Any) -> str:
+    """Fingerprint the tool version and document mapping a cache depends on.
+
+    Args:
+        mapping_file: Path to document_mapping.yml
+        *settings: Scan settings that change keyword hits (e.g. byte caps)
+
+    Returns:
+        Hex digest that changes whenever cached results may be stale
+    """
+    digest = hashlib.sha256(__version__.encode("utf-8"))
+    digest.update(repr(settings).encode("utf-8"))
+    try:
+        digest.update(mapping_file.read_bytes())
+    except OSError:
+        pass
+    return digest.hexdigest()
+
+
+class InspectionCache:
+    """On-disk cache of directory listings and per-file keyword hits.
+
+    Directory listings are keyed by the directory's (mtime_ns, inode), so an
+    unchanged directory is not re-listed and its files are not re-stat'ed.
+    Keyword hits are keyed by each file's (size, mtime_ns, inode), so only
+    files that changed are read again.
+    """
+
+    def __init__(self, project_root: Path, fingerprint: str):
+        """Initialize an empty cache.
+
+        Args:
+            project_root: Root directory of the inspected project
+            fingerprint: Value from mapping_fingerprint()
+        """
+        self.project_root = project_root
+        self.fingerprint = fingerprint
+        self.cache_dir = project_root / CACHE_DIR_NAME
+        self.directories: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self._seen_directories: Set[str] = set()
+        self._dirty = False
+        self._started_ns = time.time_ns()
+
+    @classmethod
+    def load(cls, project_root: Path, fingerprint: str) -> "InspectionCache":
+        """Load the cache for a project, discarding it if it is stale.
+
+        Args:
+            project_root: Root directory of the inspected project
+            fingerprint: Value from mapping_fingerprint()
+
+        Returns:
+            InspectionCache (empty if missing, unreadable or stale)
+        """
+        cache = cls(project_root, fingerprint)
+        try:
+            data = json.loads((cache.cache_dir / CACHE_FILE_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+            return cache
+        cache.directories = data.get("directories", {})
+        cache.files = data.get("files", {})
+        return cache
+
+    def list_directory(self, directory: Path, prefix: str) -> List[DirectoryItem]:
+        """List a directory, reusing the cached listing if it is unchanged.
+
+        Entries of an unchanged directory carry the stat data recorded when
+        it was last listed; callers revalidate files before trusting hits.
+
+        Args:
+            directory: Directory to list
+            prefix: Directory path relative to the project root ("" for root)
+
+        Returns:
+            Directory items as returned by scan_directory
+
+        Raises:
+            OSError: If the directory cannot be read
+        """
+        stat = os.stat(directory)
+        key = [stat.st_mtime_ns, stat.st_ino]
+        self._seen_directories.add(prefix)
+
+        cached = self.directories.get(prefix)
+        if cached and cached.get("key") == key:
+            return [tuple(item) for item in cached["items"]]
+
+        items = scan_directory(directory)
+        if self._is_settled(stat.st_mtime_ns):
+            self.directories[prefix] = {"key": key, "items": items}
+        else:
+            self.directories.pop(prefix, None)
+        self._dirty = True
+        return items
+
+    def get_hits(self, entry: FileEntry) -> Optional[Set[str]]:
+        """Return cached keyword hits for a file if it has not changed.
+
+        Args:
+            entry: File to look up
+
+        Returns:
+            Set of matched blueprint names, or None if the file must be read
+        """
+        cached = self.files.get(entry.rel_path)
+        if not cached:
+            return None
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            return None
+        if cached.get("key") != [stat.st_size, stat.st_mtime_ns, stat.st_ino]:
+            return None
+        return set(cached["hits"])
+
+    def set_hits(self, entry: FileEntry, hits: Set[str]) -> None:
+        """Record the complete keyword hits of a file.
+
+        Args:
+            entry: File that was scanned
+            hits: Every blueprint name whose keywords occur in the file
+        """
+        try:
+            stat = os.stat(entry.path)
+        except OSError:
+            return
+        self._dirty = True
+        if not self._is_settled(stat.st_mtime_ns):
+            self.files.pop(entry.rel_path, None)
+            return
+        self.files[entry.rel_path] = {
+            "key": [stat.st_size, stat.st_mtime_ns, stat.st_ino],
+            "hits": sorted(hits),
+        }
+
+    def save(self, index: List[FileEntry]) -> None:
+        """Write the cache to disk, dropping entries for vanished paths.
+
+        Nothing is written when the run found the cache fully up to date.
+
+        Args:
+            index: File index of the run, used to prune deleted files
+        """
+        live_files = {entry.rel_path for entry in index}
+        directories = {
+            prefix: listing
+            for prefix, listing in self.directories.items()
+            if prefix in self._seen_directories
+        }
+        files = {
+            rel_path: hits
+            for rel_path, hits in self.files.items()
+            if rel_path in live_files
+        }
+        pruned = len(directories) != len(self.directories) or len(files) != len(self.files)
+        if not self._dirty and not pruned:
+            return
+
+        data = {
+            "fingerprint": self.fingerprint,
+            "directories": directories,
+            "files": files,
+        }
+        try:
+            self.cache_dir.mkdir(exist_ok=True)
+            ignore_file = self.cache_dir / ".gitignore"
+            if not ignore_file.exists():
+                ignore_file.write_text("# Created by diversity-standard\n*\n", encoding="utf-8")
+            tmp_path = self.cache_dir / (CACHE_FILE_NAME + ".tmp")
+            tmp_path.write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.cache_dir / CACHE_FILE_NAME)
+        except OSError:
+            # A read-only checkout simply runs without a cache
+            pass
+
+    def _is_settled(self, mtime_ns: int) -> bool:
+        """Check whether a timestamp is old enough to be trusted as a key."""
+        return mtime_ns < self._started_ns - RACY_WINDOW_NS
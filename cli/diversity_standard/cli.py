@@ -1,18 +1,33 @@
 """Main CLI interface for diversity standard tool."""
 
+import json
+import sys
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
 
 import click
 from rich.console import Console
+from rich.live import Live
+from rich.markup import escape
+from rich.progress import Progress
 from rich.table import Table
 
+from diversity_standard.archives import is_archive
 from diversity_standard.config import ProjectConfig
+from diversity_standard.fleet import checkpoint_path, discover_repositories, load_checkpoint, scan_fleet
 from diversity_standard.generator import DocumentGenerator
-from diversity_standard.inspector import ProjectInspector
+from diversity_standard.history import HistoryInspector
+from diversity_standard.inspector import DocumentMatch, InspectionResult, ProjectInspector
 from diversity_standard.questionnaire import Questionnaire
+from diversity_standard.registry import MappingRegistry
+from diversity_standard.sources import SOURCE_AUTO, SOURCES
+from diversity_standard.watch import ProjectWatcher
+from diversity_standard.workspace import PackageReport, iter_workspace
 
 console = Console()
 
+OUTPUT_FORMATS = ["table", "json", "ndjson"]
+
 
 @click.group()
 @click.version_option(version="0.1.0")
@@ -22,31 +37,146 @@ def main():
 
 
 @main.command()
-@click.argument("path", type=click.Path(exists=True, file_okay=False, path_type=Path), default=".")
-def inspect(path: Path):
+@click.argument("path", type=click.Path(exists=True, path_type=Path), default=".")
+@click.option("--no-cache", is_flag=True, help="Rescan everything and skip the .diversity-standard-cache/ directory")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Number of files read in parallel while matching content (worker processes with --workspace)")
+@click.option(
+    "--source",
+    type=click.Choice(SOURCES),
+    default=SOURCE_AUTO,
+    show_default=True,
+    help="List files from the git index or by walking the filesystem (auto uses git-index when .git exists)",
+)
+@click.option("--workspace", is_flag=True, help="Treat PATH as a monorepo and inspect each package separately")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default="table",
+    show_default=True,
+    help="Output format; ndjson streams one line per document (or package) as soon as it is decided",
+)
+@click.option("--watch", is_flag=True, help="Keep running and update coverage as files change")
+@click.option("--rev", default=None, metavar="REF", help="Inspect a git revision (tag, branch, commit) without checking it out")
+@click.option("--history", "history_range", default=None, metavar="RANGE", help="Show coverage for every commit of a git range, e.g. v1.0..HEAD")
+def inspect(
+    path: Path,
+    no_cache: bool,
+    jobs: Optional[int],
+    source: str,
+    workspace: bool,
+    output_format: str,
+    watch: bool,
+    rev: Optional[str],
+    history_range: Optional[str],
+):
     """Inspect a project for existing diversity documentation."""
-    inspector = ProjectInspector()
-    result = inspector.inspect(path)
-
-    # Load config to check for intentionally skipped documents
+    # Load config for exclude patterns and intentionally skipped documents
     project_config = ProjectConfig(path)
     project_config.load_from_file()
-    
+
+    inspector_options = {
+        "use_cache": not no_cache,
+        "jobs": jobs,
+        "max_file_bytes": project_config.get("inspect.max_file_bytes"),
+        "source": source,
+    }
+    inspector = ProjectInspector(**inspector_options)
+    registry = inspector.registry
+
+    if path.is_file():
+        if not is_archive(path):
+            raise click.UsageError(
+                f"{path} is not a directory or a supported archive (.tar[.gz|.bz2|.xz], .tgz, .zip)."
+            )
+        if workspace or watch or rev or history_range:
+            raise click.UsageError(
+                "--workspace, --watch, --rev and --history need a directory, not an archive."
+            )
+    if sum(map(bool, [workspace, watch, rev, history_range])) > 1:
+        raise click.UsageError("--workspace, --watch, --rev and --history are mutually exclusive.")
+
+    if workspace:
+        reports = iter_workspace(
+            path,
+            inspector_options,
+            exclude=project_config.get("inspect.exclude", []),
+            processes=jobs,
+        )
+        if output_format == "table":
+            _print_workspace_report(path, list(reports), registry)
+        else:
+            _emit_workspace_report(path, reports, registry, output_format)
+        return
+
     answers = project_config.get("answers", {})
-    
+    documents = registry.documents
+
+    if history_range:
+        _print_history(path, inspector, project_config, history_range, output_format)
+        return
+
+    if watch:
+        if output_format == "json":
+            raise click.UsageError("--watch supports --format table or ndjson.")
+        _watch_project(path, inspector, project_config, output_format)
+        return
+
+    on_decision = None
+    if output_format == "ndjson":
+
+        def on_decision(blueprint_name: str, matches: List[DocumentMatch]) -> None:
+            _emit_line(
+                _document_record(path, blueprint_name, matches, documents, registry, answers)
+            )
+
+    try:
+        if rev:
+            result = inspector.inspect_revision(
+                path, rev, exclude=project_config.get("inspect.exclude", []), on_decision=on_decision
+            )
+        else:
+            result = inspector.inspect(
+                path, exclude=project_config.get("inspect.exclude", []), on_decision=on_decision
+            )
+    except OSError as e:
+        # Directories tolerate unreadable files; only a broken archive or an
+        # unknown revision ends up here
+        raise click.ClickException(str(e))
+
     # Filter out documents that were intentionally skipped
-    from diversity_standard.generator import DocumentGenerator
-    generator = DocumentGenerator()
     actually_missing = []
     intentionally_skipped = []
     
     for doc_name in result.missing_documents:
-        if generator._should_skip_document(doc_name, answers):
+        if registry.is_skipped(doc_name, answers):
             intentionally_skipped.append(doc_name)
         else:
             actually_missing.append(doc_name)
 
-    console.print(f"\n[bold]Inspecting project:[/bold] {path}\n")
+    if output_format == "ndjson":
+        summary = {
+            "type": "summary",
+            "project_root": str(result.project_root),
+            "found": len({doc.blueprint_name for doc in result.found_documents}),
+            "missing_documents": actually_missing,
+            "intentionally_skipped": intentionally_skipped,
+        }
+        if rev:
+            summary["revision"] = rev
+        _emit_line(summary)
+        return
+    if output_format == "json":
+        data = result.to_dict()
+        data["missing_documents"] = actually_missing
+        data["intentionally_skipped"] = intentionally_skipped
+        if rev:
+            data["revision"] = rev
+        click.echo(json.dumps(data, indent=2))
+        return
+
+    revision = f" at {rev}" if rev else ""
+    console.print(f"\n[bold]Inspecting project:[/bold] {path}{revision}\n")
 
     # Show found documents
     if result.found_documents:
@@ -76,24 +206,8 @@ def inspect(path: Path):
         table.add_column("Category", style="yellow")
         table.add_column("Reason", style="dim")
 
-        # Load mapping to get categories
-        import yaml
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        with open(mapping_file) as f:
-            mapping = yaml.safe_load(f)
-
-        skip_reasons = {
-            "FUNDING.md": "No funding (has_funding: false)",
-            "MEETINGS.md": "No meetings (has_meetings: false)",
-            "LOCALIZATION.md": "No multi-language support (supports_multiple_languages: false)",
-            "ADOPTERS.md": "Not tracking adopters (tracks_adopters: false)",
-        }
-
         for doc_name in intentionally_skipped:
-            doc_config = mapping.get("documents", {}).get(doc_name, {})
-            category = doc_config.get("category", "Unknown")
-            reason = skip_reasons.get(doc_name, "Skipped based on questionnaire")
-            table.add_row(doc_name, category, reason)
+            table.add_row(doc_name, registry.category(doc_name), registry.skip_reason(doc_name))
 
         console.print(table)
         console.print()
@@ -104,16 +218,8 @@ def inspect(path: Path):
         table.add_column("Document", style="cyan")
         table.add_column("Category", style="yellow")
 
-        # Load mapping to get categories
-        import yaml
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        with open(mapping_file) as f:
-            mapping = yaml.safe_load(f)
-
         for doc_name in actually_missing:
-            doc_config = mapping.get("documents", {}).get(doc_name, {})
-            category = doc_config.get("category", "Unknown")
-            table.add_row(doc_name, category)
+            table.add_row(doc_name, registry.category(doc_name))
 
         console.print(table)
         console.print(f"\n[bold]Total missing:[/bold] {len(actually_missing)}")
@@ -127,22 +233,376 @@ def inspect(path: Path):
             console.print("[green]✓ All documents found![/green]\n")
 
 
+def _document_record(
+    path: Path,
+    blueprint_name: str,
+    matches: List[DocumentMatch],
+    documents: Mapping[str, Mapping],
+    registry: MappingRegistry,
+    answers: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Describe one document's inspection outcome as an NDJSON record.
+
+    Args:
+        path: Project root, for relative match paths
+        blueprint_name: Blueprint document name
+        matches: Matches found for the document (empty if missing)
+        documents: Document mapping, for the category
+        registry: Registry used to tell skipped documents from missing ones
+        answers: Questionnaire answers of the project
+
+    Returns:
+        JSON-serialisable dictionary
+    """
+    if matches:
+        status = "found"
+    elif registry.is_skipped(blueprint_name, answers):
+        status = "skipped"
+    else:
+        status = "missing"
+    return {
+        "type": "document",
+        "blueprint_name": blueprint_name,
+        "category": documents.get(blueprint_name, {}).get("category", "Unknown"),
+        "status": status,
+        "matches": [match.to_dict(relative_to=path) for match in matches],
+    }
+
+
+def _watch_project(
+    path: Path,
+    inspector: ProjectInspector,
+    project_config: ProjectConfig,
+    output_format: str,
+) -> None:
+    """Inspect a project, then keep its coverage up to date until Ctrl+C.
+
+    Args:
+        path: Project root
+        inspector: Inspector to take the mapping and settings from
+        project_config: Loaded project configuration
+        output_format: "table" redraws a coverage table in place; "ndjson"
+                       emits a record whenever a document's outcome changes
+    """
+    answers = project_config.get("answers", {})
+    registry = inspector.registry
+    documents = registry.documents
+    watcher = ProjectWatcher(inspector, path, exclude=project_config.get("inspect.exclude", []))
+    result = watcher.start()
+
+    try:
+        if output_format == "ndjson":
+            records: Dict[str, Dict[str, Any]] = {}
+
+            def emit(result: InspectionResult, affected: Iterable[str], elapsed: float) -> None:
+                for blueprint_name in affected:
+                    record = _document_record(
+                        path,
+                        blueprint_name,
+                        watcher.matches.get(blueprint_name, []),
+                        documents,
+                        registry,
+                        answers,
+                    )
+                    if records.get(blueprint_name) != record:
+                        records[blueprint_name] = record
+                        _emit_line(record)
+
+            emit(result, documents, 0.0)
+            watcher.run(emit)
+            return
+
+        def render(result: InspectionResult, elapsed: Optional[float]) -> Table:
+            return _coverage_table(
+                path, result, documents, registry, answers, watcher.events.name, elapsed
+            )
+
+        with Live(render(result, None), console=console, auto_refresh=False) as live:
+            watcher.run(
+                lambda result, affected, elapsed: live.update(render(result, elapsed), refresh=True)
+            )
+    except KeyboardInterrupt:
+        pass
+
+
+def _coverage_table(
+    path: Path,
+    result: InspectionResult,
+    documents: Mapping[str, Mapping],
+    registry: MappingRegistry,
+    answers: Dict[str, Any],
+    events_name: str,
+    elapsed: Optional[float],
+) -> Table:
+    """Build the single coverage table shown by inspect --watch."""
+    locations: Dict[str, List[str]] = {}
+    for doc in result.found_documents:
+        locations.setdefault(doc.blueprint_name, []).append(
+            str(doc.actual_path.relative_to(path))
+        )
+
+    found = 0
+    required = 0
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Document", style="cyan")
+    table.add_column("Category", style="yellow")
+    table.add_column("Status")
+    table.add_column("Location", style="green")
+    for blueprint_name in sorted(documents):
+        category = documents[blueprint_name].get("category", "Unknown")
+        if blueprint_name in locations:
+            found += 1
+            required += 1
+            status = "[green]found[/green]"
+        elif registry.is_skipped(blueprint_name, answers):
+            status = "[dim]skipped[/dim]"
+        else:
+            required += 1
+            status = "[red]missing[/red]"
+        table.add_row(blueprint_name, category, status, ", ".join(locations.get(blueprint_name, [])))
+
+    table.title = f"Coverage of {path}: {found}/{required}"
+    updated = f"updated in {elapsed * 1000:.0f} ms, " if elapsed is not None else ""
+    table.caption = f"{updated}watching via {events_name}; press Ctrl+C to stop"
+    return table
+
+
+def _print_history(
+    path: Path,
+    inspector: ProjectInspector,
+    project_config: ProjectConfig,
+    revision_range: str,
+    output_format: str,
+) -> None:
+    """Show documentation coverage for every commit of a range.
+
+    The table lists only the commits where the set of found documents
+    changed; JSON and NDJSON include every commit.
+
+    Args:
+        path: Project root inside a git repository
+        inspector: Inspector to take the mapping and settings from
+        project_config: Loaded project configuration
+        revision_range: Range passed to git log, e.g. "v1.0..HEAD"
+        output_format: "table", "json" or "ndjson"
+    """
+    history = HistoryInspector(inspector, path, exclude=project_config.get("inspect.exclude", []))
+    try:
+        points = history.timeline(revision_range)
+        if output_format == "ndjson":
+            for point in points:
+                _emit_line(dict(point.to_dict(), type="commit"))
+            return
+        if output_format == "json":
+            data = {
+                "project_root": str(path),
+                "range": revision_range,
+                "commits": [point.to_dict() for point in points],
+            }
+            click.echo(json.dumps(data, indent=2))
+            return
+
+        console.print(f"\n[bold]Coverage history:[/bold] {path} ({revision_range})\n")
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Commit", style="cyan")
+        table.add_column("Date", style="dim")
+        table.add_column("Found", justify="right", style="yellow")
+        table.add_column("Changes")
+        table.add_column("Subject", style="dim")
+
+        total = len(inspector.registry.documents)
+        commits = 0
+        previous: Optional[List[str]] = None
+        for point in points:
+            commits += 1
+            found = point.found
+            if found == previous:
+                continue
+            added = sorted(set(found) - set(previous or []))
+            removed = sorted(set(previous or []) - set(found))
+            changes = [f"[green]+{name}[/green]" for name in added]
+            changes += [f"[red]-{name}[/red]" for name in removed]
+            table.add_row(
+                point.commit[:10],
+                point.to_dict()["date"][:10],
+                f"{len(found)}/{total}",
+                " ".join(changes) if previous is not None else f"{len(found)} documents",
+                escape(point.subject),
+            )
+            previous = found
+    except OSError as e:
+        raise click.ClickException(str(e))
+
+    table.caption = f"{commits} commits, {table.row_count} with coverage changes"
+    console.print(table)
+    console.print()
+
+
+def _emit_line(data: Dict[str, Any]) -> None:
+    """Write one NDJSON record to stdout and flush it immediately."""
+    click.echo(json.dumps(data))
+    sys.stdout.flush()
+
+
+def _package_coverage(report: PackageReport, registry: MappingRegistry) -> Dict[str, Any]:
+    """Summarise one workspace package for tables and JSON output.
+
+    Args:
+        report: Package report from the workspace inspection
+        registry: Registry used to tell skipped documents from missing ones
+
+    Returns:
+        JSON-serialisable dictionary with found, missing and skipped documents
+    """
+    found = sorted({doc.blueprint_name for doc in report.result.found_documents})
+    missing = []
+    skipped = []
+    for doc_name in report.result.missing_documents:
+        if registry.is_skipped(doc_name, report.answers):
+            skipped.append(doc_name)
+        else:
+            missing.append(doc_name)
+    required = len(found) + len(missing)
+    return {
+        "package": report.name,
+        "project_name": report.project_name,
+        "found": found,
+        "missing_documents": missing,
+        "intentionally_skipped": skipped,
+        "coverage": round(len(found) / required, 4) if required else 1.0,
+        "found_documents": report.result.to_dict()["found_documents"],
+    }
+
+
+def _workspace_summary(packages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate package coverage into workspace-wide numbers.
+
+    Args:
+        packages: Package summaries from _package_coverage
+
+    Returns:
+        Dictionary with package count, overall coverage and missing counts
+    """
+    total_found = sum(len(package["found"]) for package in packages)
+    total_required = total_found + sum(len(package["missing_documents"]) for package in packages)
+    missing_counts: Dict[str, int] = {}
+    for package in packages:
+        for doc_name in package["missing_documents"]:
+            missing_counts[doc_name] = missing_counts.get(doc_name, 0) + 1
+    return {
+        "packages": len(packages),
+        "found": total_found,
+        "required": total_required,
+        "coverage": round(total_found / total_required, 4) if total_required else 1.0,
+        "missing_counts": dict(sorted(missing_counts.items(), key=lambda item: (-item[1], item[0]))),
+    }
+
+
+def _emit_workspace_report(
+    path: Path,
+    reports: Iterable[PackageReport],
+    registry: MappingRegistry,
+    output_format: str,
+) -> None:
+    """Write a workspace inspection as JSON, or as NDJSON while it runs.
+
+    Args:
+        path: Workspace root
+        reports: Package reports, consumed as they become available
+        registry: Registry used to tell skipped documents from missing ones
+        output_format: "json" or "ndjson"
+    """
+    packages = []
+    for report in reports:
+        package = _package_coverage(report, registry)
+        packages.append(package)
+        if output_format == "ndjson":
+            _emit_line(dict(package, type="package"))
+
+    summary = _workspace_summary(packages)
+    if output_format == "ndjson":
+        _emit_line(dict(summary, type="summary", workspace_root=str(path)))
+    else:
+        data = {"workspace_root": str(path), "packages": packages, "summary": summary}
+        click.echo(json.dumps(data, indent=2))
+
+
+def _print_workspace_report(
+    path: Path, reports: List[PackageReport], registry: MappingRegistry
+) -> None:
+    """Print per-package coverage and an aggregate for a workspace inspection.
+
+    Args:
+        path: Workspace root
+        reports: Package reports from inspect_workspace
+        registry: Registry used to tell skipped documents from missing ones
+    """
+    console.print(f"\n[bold]Inspecting workspace:[/bold] {path}\n")
+
+    table = Table(title="Package Coverage", show_header=True, header_style="bold magenta")
+    table.add_column("Package", style="cyan")
+    table.add_column("Project", style="green")
+    table.add_column("Found", justify="right")
+    table.add_column("Missing", justify="right", style="red")
+    table.add_column("Skipped", justify="right", style="dim")
+    table.add_column("Coverage", justify="right", style="yellow")
+    table.add_column("Missing Documents", style="dim")
+
+    packages = [_package_coverage(report, registry) for report in reports]
+    for package in packages:
+        table.add_row(
+            package["package"],
+            package["project_name"],
+            str(len(package["found"])),
+            str(len(package["missing_documents"])),
+            str(len(package["intentionally_skipped"])),
+            f"{package['coverage']:.0%}",
+            ", ".join(package["missing_documents"]),
+        )
+
+    console.print(table)
+    console.print()
+
+    summary = _workspace_summary(packages)
+    console.print(f"[bold]Packages:[/bold] {summary['packages']}")
+    console.print(
+        f"[bold]Overall coverage:[/bold] {summary['coverage']:.0%} "
+        f"({summary['found']}/{summary['required']} documents)"
+    )
+
+    if summary["missing_counts"]:
+        table = Table(title="Most Commonly Missing", show_header=True, header_style="bold red")
+        table.add_column("Document", style="cyan")
+        table.add_column("Packages Missing It", justify="right")
+        for doc_name, count in summary["missing_counts"].items():
+            table.add_row(doc_name, f"{count}/{summary['packages']}")
+        console.print()
+        console.print(table)
+    console.print()
+
+
 @main.command()
 @click.argument("path", type=click.Path(exists=True, file_okay=False, path_type=Path), default=".")
 @click.option("--backup", is_flag=True, help="Backup existing files before overwriting")
 @click.option("--force", is_flag=True, help="Overwrite existing files without backup")
-def init(path: Path, backup: bool, force: bool):
+@click.option("--no-cache", is_flag=True, help="Rescan everything and skip the .diversity-standard-cache/ directory")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Number of files read while matching content, and documents generated, in parallel")
+def init(path: Path, backup: bool, force: bool, no_cache: bool, jobs: Optional[int]):
     """Initialize project with diversity documentation using interactive questionnaire."""
     # Load configuration
     project_config = ProjectConfig(path)
     project_config.load_from_file()
 
-    # Auto-detect missing values
-    project_config.auto_detect()
+    # Auto-detect missing values, falling back to git history for maintainers
+    project_config.auto_detect(history=True)
 
     # Inspect project first
-    inspector = ProjectInspector()
-    result = inspector.inspect(path)
+    inspector = ProjectInspector(
+        use_cache=not no_cache,
+        jobs=jobs,
+        max_file_bytes=project_config.get("inspect.max_file_bytes"),
+    )
+    result = inspector.inspect(path, exclude=project_config.get("inspect.exclude", []))
 
     if not result.missing_documents:
         console.print("[green]✓ All documents already exist![/green]")
@@ -174,7 +634,9 @@ def init(path: Path, backup: bool, force: bool):
     output_preferences = inspector.get_document_location_preference(path, project_config)
 
     # Generate documents
-    generator = DocumentGenerator()
+    generator = DocumentGenerator(jobs=jobs)
+    for message in generator.template_conflict_messages():
+        console.print(f"[yellow]{message}[/yellow]")
     generated = generator.generate_missing_documents(
         result,
         project_config,
@@ -193,6 +655,52 @@ def init(path: Path, backup: bool, force: bool):
     console.print(f"[dim]Configuration saved to {config_path}[/dim]\n")
 
 
+@main.command("scan-fleet")
+@click.argument("directory", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("fleet-report.json"),
+    show_default=True,
+    help="Where to write the aggregated JSON report",
+)
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None, help="Number of repositories inspected in parallel")
+@click.option("--restart", is_flag=True, help="Ignore an existing checkpoint and scan every repository again")
+def scan_fleet_command(directory: Path, output: Path, jobs: Optional[int], restart: bool):
+    """Inspect every repository cloned under DIRECTORY and write one report."""
+    repositories = discover_repositories(directory)
+    checkpoint = checkpoint_path(output)
+    if checkpoint.exists() and not restart:
+        console.print(f"[dim]Resuming from checkpoint {checkpoint}[/dim]")
+
+    with Progress(console=console) as progress:
+        task = progress.add_task("Scanning repositories", total=len(repositories))
+        progress.update(task, completed=len(load_checkpoint(checkpoint)) if not restart else 0)
+        report = scan_fleet(
+            directory,
+            output,
+            processes=jobs,
+            restart=restart,
+            on_record=lambda record: progress.advance(task),
+        )
+
+    summary = report["summary"]
+    console.print(f"\n[bold]Repositories scanned:[/bold] {summary['repositories']}")
+    if summary["errors"]:
+        console.print(f"[yellow]Repositories with errors: {summary['errors']}[/yellow]")
+    console.print(f"[bold]Overall coverage:[/bold] {summary['coverage']:.0%}")
+
+    if summary["missing_counts"]:
+        table = Table(title="Most Commonly Missing", show_header=True, header_style="bold red")
+        table.add_column("Document", style="cyan")
+        table.add_column("Repositories Missing It", justify="right")
+        for doc_name, count in summary["missing_counts"].items():
+            table.add_row(doc_name, f"{count}/{summary['repositories']}")
+        console.print()
+        console.print(table)
+
+    console.print(f"\n[dim]Report written to {output}[/dim]\n")
 
 
 if __name__ == "__main__":
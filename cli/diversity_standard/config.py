@@ -1,17 +1,29 @@
 """Configuration management for the diversity standard CLI."""
 
-import json
+import dataclasses
+import re
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 
-from diversity_standard.utils import (
-    extract_project_name,
-    extract_repository_url,
-    read_file_content,
-    read_json_file,
+from diversity_standard.contributors import (
+    DEFAULT_TOP_MAINTAINERS,
+    DEFAULT_WINDOW_DAYS,
+    Contributor,
+    detect_contributors,
 )
+from diversity_standard.licenses import (
+    LicenseMatch,
+    declared_license_identifier,
+    identify_license,
+    license_file_names,
+)
+from diversity_standard.metadata import ProjectMetadata
+from diversity_standard.utils import FileEntry, read_file_content
+
+# Cell of a markdown table's header separator row, e.g. "---" or ":--:"
+_TABLE_SEPARATOR = re.compile(r":?-+:?")
 
 
 class ProjectConfig:
@@ -25,6 +37,15 @@ class ProjectConfig:
         """
         self.project_root = project_root
         self.config: Dict[str, Any] = {}
+        # Bumped on every change made through this class, so consumers can
+        # cache values derived from the configuration; code writing to
+        # self.config directly must call touch()
+        self.revision = 0
+        # License file that auto_detect identified the license from, if any
+        self.license_match: Optional[LicenseMatch] = None
+        # Active committers, if auto_detect(history=True) had to look at git
+        # history
+        self.contributors: List[Contributor] = []
 
     def load_from_file(self, config_path: Optional[Path] = None) -> bool:
         """Load configuration from YAML file.
@@ -46,24 +67,39 @@ class ProjectConfig:
                 content = read_file_content(config_path)
                 if content:
                     self.config = yaml.safe_load(content) or {}
+                    self.touch()
                     return True
             except Exception:
                 pass
         return False
 
-    def auto_detect(self) -> None:
-        """Auto-detect project information from existing files."""
+    def auto_detect(
+        self, index: Optional[List[FileEntry]] = None, history: bool = False
+    ) -> None:
+        """Auto-detect project information from existing files.
+
+        Each manifest is read at most once, however many fields it feeds.
+
+        Args:
+            index: File index of the project, if one is already built. Only
+                  used when the README is not in a usual location.
+            history: If no maintainers are declared, fall back to the most
+                    active committers from git history. This walks the git
+                    log, so only init asks for it.
+        """
+        metadata = ProjectMetadata(self.project_root, index)
+
         # Project name
         if "project" not in self.config:
             self.config["project"] = {}
         if "name" not in self.config["project"]:
-            name = extract_project_name(self.project_root)
+            name = metadata.project_name()
             if name:
                 self.config["project"]["name"] = name
 
         # Repository
         if "repository" not in self.config["project"]:
-            repo = extract_repository_url(self.project_root)
+            repo = metadata.repository_url()
             if repo:
                 self.config["project"]["repository"] = repo
 
@@ -71,139 +107,96 @@ class ProjectConfig:
         if "license" not in self.config:
             self.config["license"] = {}
         if "type" not in self.config["license"]:
-            license_type = self._detect_license()
+            license_type = self._detect_license(metadata)
             if license_type:
                 self.config["license"]["type"] = license_type
 
         # Maintainers
         if "maintainers" not in self.config:
-            self.config["maintainers"] = self._detect_maintainers()
+            self.config["maintainers"] = self._detect_maintainers(metadata, history)
 
         # Description
         if "description" not in self.config["project"]:
-            desc = self._detect_description()
+            desc = self._detect_description(metadata)
             if desc:
                 self.config["project"]["description"] = desc
 
-    def _detect_license(self) -> Optional[str]:
+        self.touch()
+
+    def _detect_license(self, metadata: ProjectMetadata) -> Optional[str]:
         """Detect license type from project files."""
-        # Check LICENSE file
-        license_file = self.project_root / "LICENSE"
-        if not license_file.exists():
-            license_file = self.project_root / "LICENSE.txt"
-        if not license_file.exists():
-            license_file = self.project_root / "LICENSE.md"
-
-        if license_file.exists():
-            content = read_file_content(license_file)
-            if content:
-                content_upper = content.upper()
-                if "GNU GENERAL PUBLIC LICENSE" in content_upper or "GPL" in content_upper:
-                    if "VERSION 3" in content_upper or "v3" in content_upper:
-                        return "GPL-3.0"
-                    elif "VERSION 2" in content_upper or "v2" in content_upper:
-                        return "GPL-2.0"
-                elif "MIT" in content_upper:
-                    return "MIT"
-                elif "APACHE" in content_upper:
-                    if "2.0" in content_upper:
-                        return "Apache-2.0"
-                elif "BSD" in content_upper:
-                    return "BSD"
-
-        # Check package.json
-        package_json = self.project_root / "package.json"
-        if package_json.exists():
-            data = read_json_file(package_json)
-            if data and "license" in data:
-                return str(data["license"])
-
-        # Check setup.py
-        setup_py = self.project_root / "setup.py"
-        if setup_py.exists():
-            content = read_file_content(setup_py)
-            if content:
-                match = __import__("re").search(
-                    r'license\s*=\s*["\']([^"\']+)["\']', content
+        # Compare LICENSE, LICENSE.*, COPYING* against the license index
+        texts = []
+        for name in license_file_names(metadata.root_names()):
+            content = metadata.read_text(name)
+            if not content:
+                continue
+            match = identify_license(content)
+            if match:
+                self.license_match = dataclasses.replace(
+                    match, path=self.project_root / name
                 )
-                if match:
-                    return match.group(1)
+                return match.spdx_id
+            texts.append(content)
+
+        # A license file that is not a known text may still name its license
+        for content in texts:
+            identifier = declared_license_identifier(content)
+            if identifier:
+                return identifier
 
-        return None
+        # Check manifests (package.json, pyproject.toml, Cargo.toml, ...)
+        return metadata.declared("license")
 
-    def _detect_maintainers(self) -> list[Dict[str, str]]:
+    def _detect_maintainers(
+        self, metadata: ProjectMetadata, history: bool = False
+    ) -> list[Dict[str, str]]:
         """Detect maintainers from project files."""
-        maintainers = []
-
-        # Check package.json
-        package_json = self.project_root / "package.json"
-        if package_json.exists():
-            data = read_json_file(package_json)
-            if data:
-                # Check author field
-                author = data.get("author")
-                if isinstance(author, str):
-                    maintainers.append({"name": author})
-                elif isinstance(author, dict):
-                    maintainers.append(author)
-
-                # Check maintainers field
-                if "maintainers" in data:
-                    if isinstance(data["maintainers"], list):
-                        maintainers.extend(data["maintainers"])
+        # Check manifests (authors and maintainers)
+        maintainers = metadata.declared_maintainers()
 
         # Check MAINTAINERS.md
-        maintainers_file = self.project_root / "MAINTAINERS.md"
-        if not maintainers_file.exists():
-            maintainers_file = self.project_root / "Long-Term" / "MAINTAINERS.md"
-        if not maintainers_file.exists():
-            maintainers_file = self.project_root / "docs" / "MAINTAINERS.md"
-
-        if maintainers_file.exists():
-            content = read_file_content(maintainers_file)
-            if content:
-                # Simple parsing - look for markdown table or list
-                lines = content.split("\n")
-                for line in lines:
-                    if "|" in line and "Name" in line:
-                        # Table format - skip header
-                        continue
-                    if "|" in line:
-                        parts = [p.strip() for p in line.split("|")]
-                        if len(parts) >= 2:
-                            maintainers.append({"name": parts[1]})
+        content = None
+        for name in ("MAINTAINERS.md", "Long-Term/MAINTAINERS.md", "docs/MAINTAINERS.md"):
+            if (self.project_root / name).exists():
+                content = metadata.read_text(name)
+                break
+
+        if content:
+            maintainers.extend(parse_maintainers_table(content))
+
+        # Fall back to the most active committers of the recency window
+        if not maintainers and history:
+            self.contributors = detect_contributors(
+                self.project_root,
+                window_days=self.get("contributors.window_days", DEFAULT_WINDOW_DAYS),
+            )
+            top = self.get("contributors.max_maintainers", DEFAULT_TOP_MAINTAINERS)
+            maintainers = [contributor.to_dict() for contributor in self.contributors[:top]]
 
         return maintainers
 
-    def _detect_description(self) -> Optional[str]:
-        """Detect project description from README."""
-        readme = self.project_root / "README.md"
-        if readme.exists():
-            content = read_file_content(readme)
-            if content:
-                # Get first paragraph (non-empty lines before first heading)
-                lines = content.split("\n")
-                desc_lines = []
-                for line in lines:
-                    line = line.strip()
-                    if not line:
-                        if desc_lines:
-                            break
-                        continue
-                    if line.startswith("#"):
+    def _detect_description(self, metadata: ProjectMetadata) -> Optional[str]:
+        """Detect project description from the root README."""
+        content = metadata.readme_text(root_only=True)
+        if content:
+            # Get first paragraph (non-empty lines before first heading)
+            lines = content.split("\n")
+            desc_lines = []
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    if desc_lines:
                         break
-                    desc_lines.append(line)
-                if desc_lines:
-                    return " ".join(desc_lines[:3])  # First few lines
+                    continue
+                if line.startswith("#"):
+                    break
+                desc_lines.append(line)
+            if desc_lines:
+                return " ".join(desc_lines[:3])  # First few lines
 
-        # Check package.json
-        package_json = self.project_root / "package.json"
-        if package_json.exists():
-            data = read_json_file(package_json)
-            if data and "description" in data:
-                return data["description"]
-
-        return None
+        # Check manifests
+        return metadata.declared("description")
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value using dot notation.
@@ -240,6 +233,11 @@ class ProjectConfig:
                 config[k] = {}
             config = config[k]
         config[keys[-1]] = value
+        self.touch()
+
+    def touch(self) -> None:
+        """Mark the configuration as changed."""
+        self.revision += 1
 
     def save(self, config_path: Optional[Path] = None) -> None:
         """Save configuration to YAML file.
@@ -254,3 +252,53 @@ class ProjectConfig:
         with open(config_path, "w") as f:
             yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
 
+
+def parse_maintainers_table(content: str) -> List[Dict[str, str]]:
+    """Read people from the markdown tables of a MAINTAINERS file.
+
+    Columns are found from each table's header row: the one mentioning
+    "name" (or "handle", else the first column), and optionally
+    "email"/"contact" and "role"/"area". Separator rows and rows with an
+    empty name are skipped.
+
+    Args:
+        content: MAINTAINERS.md content
+
+    Returns:
+        Maintainer entries with name and, when present, email and role
+    """
+    maintainers: List[Dict[str, str]] = []
+    columns: Optional[Dict[str, int]] = None
+    for line in content.splitlines():
+        line = line.strip()
+        if not line.startswith("|"):
+            columns = None  # Tables end at the first non-table line
+            continue
+        cells = [cell.strip() for cell in line.strip("|").split("|")]
+        if all(_TABLE_SEPARATOR.fullmatch(cell) for cell in cells):
+            continue
+        if columns is None:
+            columns = _maintainer_columns(cells)
+            continue
+        entry = {
+            key: cells[index]
+            for key, index in columns.items()
+            if index < len(cells) and cells[index]
+        }
+        if entry.get("name"):
+            maintainers.append(entry)
+    return maintainers
+
+
+def _maintainer_columns(header: List[str]) -> Dict[str, int]:
+    """Map maintainer fields to column indexes of a table header."""
+    columns: Dict[str, int] = {}
+    for index, title in enumerate(cell.lower() for cell in header):
+        if any(word in title for word in ("name", "handle", "maintainer", "person")):
+            columns.setdefault("name", index)
+        elif "email" in title or "contact" in title:
+            columns.setdefault("email", index)
+        elif "role" in title or "area" in title:
+            columns.setdefault("role", index)
+    columns.setdefault("name", 0)
+    return columns
@@ -0,0 +1,200 @@
+"""Maintainer and active-contributor detection from git history."""
+
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Default recency window: people who committed in the last year
+DEFAULT_WINDOW_DAYS = 365
+
+# How many authors are tracked at most; more distinct authors than this in
+# the window only costs accuracy for the smallest counts, not memory
+DEFAULT_CAPACITY = 1000
+
+DEFAULT_TOP_MAINTAINERS = 5
+
+_BOT_MARKERS = ("[bot]", "dependabot", "renovate", "github-actions")
+
+
+@dataclass
+class Contributor:
+    """Commit activity of one author (after .mailmap) within the window."""
+
+    name: str
+    email: str
+    commits: int
+    last_commit: int  # Unix timestamp
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the maintainer entry used in the project configuration."""
+        return {"name": self.name, "email": self.email}
+
+
+class TopKCounter:
+    """Approximate commit counts per author in bounded memory (Misra-Gries).
+
+    At most ``capacity`` authors are tracked. When a new author arrives and
+    every slot is taken, all counts are decremented and authors reaching zero
+    are dropped. Any author with more than n / (capacity + 1) of n commits is
+    guaranteed to survive, and counts are underestimated by at most that.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize an empty counter.
+
+        Args:
+            capacity: Maximum number of authors tracked at once
+        """
+        self.capacity = max(1, capacity)
+        self.counts: Dict[str, int] = {}
+        self.names: Dict[str, str] = {}
+        self.last_commit: Dict[str, int] = {}
+        self.total = 0
+
+    def add(self, key: str, name: str, timestamp: int) -> None:
+        """Count one commit.
+
+        Args:
+            key: Author identity (lowercased email)
+            name: Author name, kept from the most recent commit
+            timestamp: Commit time
+        """
+        self.total += 1
+        if key in self.counts:
+            self.counts[key] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = 1
+        else:
+            for other in list(self.counts):
+                self.counts[other] -= 1
+                if not self.counts[other]:
+                    del self.counts[other]
+                    self.names.pop(other, None)
+                    self.last_commit.pop(other, None)
+            return
+        if timestamp >= self.last_commit.get(key, 0):
+            self.last_commit[key] = timestamp
+            self.names[key] = name
+
+    def most_common(self, limit: Optional[int] = None) -> List[Contributor]:
+        """Return the tracked authors, most commits first.
+
+        Args:
+            limit: Maximum number of authors. If None, all are returned.
+
+        Returns:
+            Contributors ordered by commit count, then most recent activity
+        """
+        ranked = sorted(
+            self.counts.items(),
+            key=lambda item: (-item[1], -self.last_commit.get(item[0], 0), item[0]),
+        )
+        return [
+            Contributor(self.names[key], key, count, self.last_commit.get(key, 0))
+            for key, count in ranked[:limit]
+        ]
+
+
+def is_bot(name: str, email: str) -> bool:
+    """Check whether a commit author is an automation account."""
+    identity = f"{name} {email}".lower()
+    return any(marker in identity for marker in _BOT_MARKERS)
+
+
+def iter_git_authors(
+    root: Path, window_days: Optional[int] = DEFAULT_WINDOW_DAYS
+) -> Iterator[Tuple[str, str, int]]:
+    """Stream (name, email, timestamp) of the non-merge commits under root.
+
+    Names and emails are resolved through .mailmap. The log is read line by
+    line from the git process, so memory use does not grow with history.
+
+    Args:
+        root: Directory inside a git repository
+        window_days: Only commits from the last this many days. If None,
+                    the whole history is read.
+
+    Yields:
+        Author name, email and commit time
+
+    Raises:
+        OSError: If git cannot be run or root is not in a repository
+    """
+    command = [
+        "git",
+        "-C",
+        str(root),
+        "log",
+        "--use-mailmap",
+        "--no-merges",
+        "--format=%aN%x00%aE%x00%at",
+    ]
+    if window_days is not None:
+        command.append(f"--since={int(time.time()) - window_days * 86400}")
+    # Only commits touching root, so a package of a monorepo gets its own people
+    command.extend(["--", "."])
+    # stderr goes to a file: a pipe nobody reads while stdout streams would
+    # block git (and this reader) once warnings fill the pipe buffer
+    with tempfile.TemporaryFile() as stderr:
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+        except OSError as e:
+            raise OSError(f"Cannot run git: {e}") from e
+
+        assert process.stdout is not None
+        try:
+            for line in process.stdout:
+                fields = line.rstrip(b"\n").decode("utf-8", "replace").split("\0")
+                if len(fields) == 3 and fields[2].isdigit():
+                    yield fields[0], fields[1], int(fields[2])
+        finally:
+            process.stdout.close()
+            returncode = process.wait()
+        if returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", "replace").strip()
+            raise OSError(f"Cannot read git history of {root}: {message}")
+
+
+def count_contributors(
+    authors: Iterable[Tuple[str, str, int]], capacity: int = DEFAULT_CAPACITY
+) -> TopKCounter:
+    """Aggregate a commit stream into bounded per-author counters.
+
+    Args:
+        authors: (name, email, timestamp) per commit
+        capacity: Maximum number of authors tracked at once
+
+    Returns:
+        Filled counter; bots are not counted
+    """
+    counter = TopKCounter(capacity)
+    for name, email, timestamp in authors:
+        if is_bot(name, email):
+            continue
+        counter.add((email or name).lower(), name, timestamp)
+    return counter
+
+
+def detect_contributors(
+    root: Path,
+    window_days: Optional[int] = DEFAULT_WINDOW_DAYS,
+    capacity: int = DEFAULT_CAPACITY,
+) -> List[Contributor]:
+    """Find the active contributors of a repository, most active first.
+
+    Args:
+        root: Directory inside a git repository
+        window_days: Recency window in days; None for the whole history
+        capacity: Maximum number of authors tracked at once
+
+    Returns:
+        Contributors ordered by commits; empty if git history is unavailable
+    """
+    try:
+        return count_contributors(iter_git_authors(root, window_days), capacity).most_common()
+    except OSError:
+        return []
@@ -0,0 +1,224 @@
+"""Organisation-wide inspection of a directory full of repositories."""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from diversity_standard.config import ProjectConfig
+from diversity_standard.inspector import ProjectInspector
+
+_worker_inspector: Optional[ProjectInspector] = None
+
+
+def discover_repositories(directory: Path) -> List[Path]:
+    """List the repositories of a fleet directory.
+
+    Every non-hidden immediate subdirectory is treated as one repository.
+
+    Args:
+        directory: Directory holding the cloned repositories
+
+    Returns:
+        Repository paths sorted by name
+    """
+    repositories = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.startswith("."):
+                continue
+            if entry.is_dir():
+                repositories.append(Path(entry.path))
+    return sorted(repositories, key=lambda path: path.name)
+
+
+def checkpoint_path(output: Path) -> Path:
+    """Return the checkpoint file used while producing an output report."""
+    return output.with_name(output.name + ".checkpoint.ndjson")
+
+
+def _init_worker() -> None:
+    """Load the document mapping once per worker process."""
+    global _worker_inspector
+
+    # Repositories are read-only mirrors: no cache is written into them
+    _worker_inspector = ProjectInspector(use_cache=False, jobs=1)
+
+
+def _scan_repository(repository: Path) -> Dict[str, Any]:
+    """Inspect one repository and return a JSON-serialisable record."""
+    if _worker_inspector is None:
+        _init_worker()
+
+    record: Dict[str, Any] = {
+        "repository": repository.name,
+        "path": str(repository),
+        "found": [],
+        "missing": [],
+        "skipped": [],
+        "error": None,
+    }
+    try:
+        config = ProjectConfig(repository)
+        config.load_from_file()
+        result = _worker_inspector.inspect(repository, exclude=config.get("inspect.exclude", []))
+    except Exception as e:  # One broken repository must not stop the fleet
+        record["error"] = f"{type(e).__name__}: {e}"
+        return record
+
+    answers = config.get("answers", {})
+    record["found"] = [
+        {
+            "document": doc.blueprint_name,
+            "path": doc.actual_path.relative_to(repository).as_posix(),
+            "match_type": doc.match_type,
+        }
+        for doc in result.found_documents
+    ]
+    for doc_name in result.missing_documents:
+        if _worker_inspector.registry.is_skipped(doc_name, answers):
+            record["skipped"].append(doc_name)
+        else:
+            record["missing"].append(doc_name)
+    return record
+
+
+def load_checkpoint(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Read the records of repositories finished by an earlier run.
+
+    A truncated last line (from an interrupted write) is ignored.
+
+    Args:
+        path: Checkpoint file
+
+    Returns:
+        Dictionary mapping repository name to its record
+    """
+    records: Dict[str, Dict[str, Any]] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                records[record["repository"]] = record
+    except OSError:
+        pass
+    return records
+
+
+def _ends_with_newline(path: Path) -> bool:
+    """Check whether a non-empty file ends with a newline."""
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-repository records into fleet-wide coverage.
+
+    Args:
+        records: Repository records from _scan_repository
+
+    Returns:
+        Summary with coverage and per-document found/missing counts
+    """
+    found_counts: Dict[str, int] = {}
+    missing_counts: Dict[str, int] = {}
+    total_found = 0
+    total_required = 0
+    errors = 0
+
+    for record in records:
+        if record.get("error"):
+            errors += 1
+            continue
+        found = {match["document"] for match in record["found"]}
+        for doc_name in found:
+            found_counts[doc_name] = found_counts.get(doc_name, 0) + 1
+        for doc_name in record["missing"]:
+            missing_counts[doc_name] = missing_counts.get(doc_name, 0) + 1
+        total_found += len(found)
+        total_required += len(found) + len(record["missing"])
+
+    return {
+        "repositories": len(records),
+        "errors": errors,
+        "coverage": round(total_found / total_required, 4) if total_required else 1.0,
+        "found_counts": dict(sorted(found_counts.items())),
+        "missing_counts": dict(sorted(missing_counts.items(), key=lambda item: (-item[1], item[0]))),
+    }
+
+
+def scan_fleet(
+    directory: Path,
+    output: Path,
+    processes: Optional[int] = None,
+    restart: bool = False,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Inspect every repository under a directory and write one report.
+
+    Repositories are inspected in a process pool whose workers load the
+    document mapping once. Each finished repository is appended to a
+    checkpoint file next to the output, so an interrupted run resumes where
+    it stopped; the checkpoint is removed once the report is written.
+
+    Args:
+        directory: Directory holding the cloned repositories
+        output: Path of the aggregated JSON report
+        processes: Number of worker processes. If None, one per CPU.
+        restart: Discard an existing checkpoint instead of resuming
+        on_record: Called in this process for every finished repository
+
+    Returns:
+        The report that was written to output
+    """
+    checkpoint = checkpoint_path(output)
+    if restart and checkpoint.exists():
+        checkpoint.unlink()
+
+    repositories = discover_repositories(directory)
+    records = load_checkpoint(checkpoint)
+    pending = [repo for repo in repositories if repo.name not in records]
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(checkpoint, "a", encoding="utf-8") as checkpoint_file:
+        if checkpoint_file.tell() and not _ends_with_newline(checkpoint):
+            # Terminate a line cut short by an interrupted run
+            checkpoint_file.write("\n")
+
+        def finish(record: Dict[str, Any]) -> None:
+            records[record["repository"]] = record
+            checkpoint_file.write(json.dumps(record) + "\n")
+            checkpoint_file.flush()
+            if on_record:
+                on_record(record)
+
+        processes = min(processes or os.cpu_count() or 1, max(len(pending), 1))
+        if processes <= 1:
+            for repository in pending:
+                finish(_scan_repository(repository))
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as executor:
+                futures = [executor.submit(_scan_repository, repo) for repo in pending]
+                for future in as_completed(futures):
+                    finish(future.result())
+
+    names = {repo.name for repo in repositories}
+    ordered = [records[name] for name in sorted(records) if name in names]
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "directory": str(directory),
+        "summary": summarize(ordered),
+        "repositories": ordered,
+    }
+
+    tmp_output = output.with_name(output.name + ".tmp")
+    tmp_output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    os.replace(tmp_output, output)
+    checkpoint.unlink()
+    return report
@@ -1,41 +1,122 @@
 """Document generation from templates."""
 
+import copy
+import os
+import secrets
 import shutil
+import stat
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from diversity_standard.config import ProjectConfig
 from diversity_standard.inspector import InspectionResult
+from diversity_standard.registry import get_registry
+from diversity_standard.utils import user_cache_dir
+
+# Documents rendered and written at the same time by default
+DEFAULT_JOBS = min(8, (os.cpu_count() or 1) + 4)
+
+# Template directory spellings of each category, by precedence
+CATEGORY_TEMPLATE_DIRS = {
+    "Daily": ["Daily", "daily"],
+    "Procedural": ["Procedural", "procedural"],
+    "Long-Term": ["Long-Term", "LongTerm", "long-term", "long_term"],
+}
+
+
+def template_bytecode_cache() -> Optional[BytecodeCache]:
+    """Return the persistent cache of compiled templates.
+
+    Compiled templates are kept in ~/.cache/diversity-standard/jinja/, so
+    repeat runs skip parsing and compiling templates that did not change.
+
+    Returns:
+        Bytecode cache, or None if the cache directory cannot be created
+    """
+    cache_dir = user_cache_dir() / "jinja"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(cache_dir))
+
+
+def _create_temp_file(target: Path) -> Tuple[int, str]:
+    """Create a new, uniquely named temporary file next to a target.
+
+    The file is opened with mode 0o666, so the process umask applies as it
+    would to a plain write. tempfile.mkstemp always creates 0o600 files, and
+    the umask can only be read by changing it for every thread.
+
+    Args:
+        target: File the temporary file will replace
+
+    Returns:
+        (file descriptor open for writing, path of the temporary file)
+
+    Raises:
+        OSError: If the file cannot be created
+    """
+    for _ in range(100):
+        tmp_path = os.path.join(target.parent, f".{target.name}.{secrets.token_hex(4)}.tmp")
+        try:
+            return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), tmp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No free temporary file name next to {target}")
 
 
 class DocumentGenerator:
     """Generates documents from templates."""
 
-    def __init__(self, blueprint_root: Optional[Path] = None, template_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        blueprint_root: Optional[Path] = None,
+        template_dir: Optional[Path] = None,
+        jobs: Optional[int] = None,
+    ):
         """Initialize generator.
 
         Args:
             blueprint_root: Root directory of blueprint repository
             template_dir: Directory containing templates. If None, uses
                          blueprint_root/templates as template source
+            jobs: Number of documents generated concurrently. If None,
+                 DEFAULT_JOBS is used; 1 generates serially.
         """
         if blueprint_root is None:
             blueprint_root = Path(__file__).parent.parent.parent
 
         self.blueprint_root = blueprint_root
+        self.registry = get_registry()
+        self.jobs = max(1, jobs or DEFAULT_JOBS)
 
         if template_dir is None:
             # Try to find templates in templates/ directory
             template_dir = blueprint_root / "templates"
         self.template_dir = template_dir
 
+        # (blueprint_name, category) -> template, and the category-less fallback
+        self.template_manifest: Dict[Tuple[str, str], Path] = {}
+        self.default_templates: Dict[str, Path] = {}
+        # Documents with templates in more than one directory
+        self.template_conflicts: Dict[str, List[Path]] = {}
+        self._build_template_manifest()
+
+        # ProjectConfig -> (revision, base context built at that revision)
+        self._base_contexts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
         # Setup Jinja2 environment
         self.env = Environment(
             loader=FileSystemLoader(str(self.template_dir)),
             trim_blocks=True,
             lstrip_blocks=True,
+            bytecode_cache=template_bytecode_cache(),
         )
 
     def generate_document(
@@ -61,35 +142,135 @@ class DocumentGenerator:
         if not template_path:
             return False
 
-        # Read template
-        try:
-            template_content = template_path.read_text(encoding="utf-8")
-        except IOError:
-            return False
-
         # Prepare template context
         context = self._build_context(config, blueprint_name, category)
 
-        # Render template with Jinja2 (supports conditionals)
+        # Render template with Jinja2 (supports conditionals). Loading by name
+        # goes through the environment's template and bytecode caches.
         try:
-            template = self.env.from_string(template_content)
+            template = self.env.get_template(self._template_name(template_path))
             rendered = template.render(**context)
-        except Exception as e:
+        except Exception:
             # Fallback: simple placeholder replacement
-            # Log error for debugging (can be enhanced with proper logging later)
+            try:
+                template_content = template_path.read_text(encoding="utf-8")
+            except IOError:
+                return False
             rendered = self._simple_replace(template_content, context)
 
         # Write output
         try:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            output_path.write_text(rendered, encoding="utf-8")
+            self._write_atomic(output_path, rendered)
             return True
         except IOError:
             return False
 
+    def _write_atomic(self, output_path: Path, content: str) -> None:
+        """Write a file through a temporary file in its directory.
+
+        The temporary file is renamed over the target, so readers never see
+        a half-written document and an interrupted run leaves no partial file.
+        A symlinked target is written through the link, and an existing
+        file keeps its permission bits; new files get the mode a plain write
+        would give them.
+
+        Args:
+            output_path: Where to write
+            content: File content
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        target = Path(os.path.realpath(output_path))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            mode: Optional[int] = stat.S_IMODE(os.stat(target).st_mode)
+        except FileNotFoundError:
+            mode = None
+
+        fd, tmp_path = _create_temp_file(target)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _build_template_manifest(self) -> None:
+        """Index the template directory once, so lookups need no file system access.
+
+        Templates are taken from the root of the template directory and from
+        its direct subdirectories. A document found in more than one of them
+        is recorded in template_conflicts.
+        """
+        root_files: Dict[str, Path] = {}
+        directories: Dict[str, Dict[str, Path]] = {}
+        try:
+            entries = sorted(os.scandir(self.template_dir), key=lambda entry: entry.name)
+        except OSError:
+            entries = []
+        for entry in entries:
+            if entry.is_file():
+                root_files[entry.name] = Path(entry.path)
+            elif entry.is_dir():
+                try:
+                    directories[entry.name] = {
+                        child.name: Path(child.path)
+                        for child in sorted(os.scandir(entry.path), key=lambda child: child.name)
+                        if child.is_file()
+                    }
+                except OSError:
+                    continue
+
+        # Without a matching category directory: root first, then subdirectories by name
+        self.default_templates = dict(root_files)
+        for files in directories.values():
+            for name, path in files.items():
+                self.default_templates.setdefault(name, path)
+
+        for category, dir_names in CATEGORY_TEMPLATE_DIRS.items():
+            # Earlier spellings win, so they are written last
+            for dir_name in reversed(dir_names):
+                for name, path in directories.get(dir_name, {}).items():
+                    self.template_manifest[(name, category)] = path
+
+        locations: Dict[str, List[Path]] = {}
+        for files in [root_files, *directories.values()]:
+            for name, path in files.items():
+                if name in self.registry.documents:
+                    locations.setdefault(name, []).append(path)
+        self.template_conflicts = {
+            name: paths for name, paths in locations.items() if len(paths) > 1
+        }
+
+    def template_conflict_messages(self) -> List[str]:
+        """Describe each document with more than one template.
+
+        Returns:
+            One message per conflict, naming the template that is used (for
+            the document's mapped category) and the ones that are not
+        """
+        messages = []
+        for blueprint_name, paths in sorted(self.template_conflicts.items()):
+            chosen = self._find_template(blueprint_name, self.registry.category(blueprint_name))
+            others = ", ".join(
+                path.relative_to(self.template_dir).as_posix() for path in paths if path != chosen
+            )
+            messages.append(
+                f"{blueprint_name} has {len(paths)} templates; using "
+                f"{self._template_name(chosen)}, ignoring {others}"
+            )
+        return messages
+
     def _find_template(self, blueprint_name: str, category: str) -> Optional[Path]:
         """Find template file for a blueprint document.
 
+        The category's own directory is preferred, then the template
+        directory root, then any other subdirectory.
+
         Args:
             blueprint_name: Name of blueprint document
             category: Document category
@@ -97,43 +278,65 @@ class DocumentGenerator:
         Returns:
             Path to template file or None
         """
-        # Try category-specific directory in templates/
-        category_dirs = {
-            "Daily": ["Daily", "daily"],
-            "Procedural": ["Procedural", "procedural"],
-            "Long-Term": ["Long-Term", "LongTerm", "long-term", "long_term"],
-        }
-
-        for dir_name in category_dirs.get(category, []):
-            template_path = self.template_dir / dir_name / blueprint_name
-            if template_path.exists() and template_path.is_file():
-                return template_path
-
-        # Try templates directory root (for flat structure)
-        template_path = self.template_dir / blueprint_name
-        if template_path.exists() and template_path.is_file():
-            return template_path
+        template_path = self.template_manifest.get((blueprint_name, category))
+        if template_path is None:
+            template_path = self.default_templates.get(blueprint_name)
+        return template_path
 
-        # Try in subdirectories of templates
-        if self.template_dir.exists():
-            for subdir in self.template_dir.iterdir():
-                if subdir.is_dir():
-                    template_path = subdir / blueprint_name
-                    if template_path.exists() and template_path.is_file():
-                        return template_path
-
-        return None
+    def _template_name(self, template_path: Path) -> str:
+        """Return the loader name of a template file ("Daily/SUPPORT.md")."""
+        return template_path.relative_to(self.template_dir).as_posix()
 
     def _build_context(
         self, config: ProjectConfig, blueprint_name: str, category: str
     ) -> Dict:
         """Build template context from configuration.
 
+        Only the document's name and category are added per call; everything
+        else comes from the shared base context of the configuration.
+
         Args:
             config: Project configuration
             blueprint_name: Name of document being generated
             category: Document category
 
+        Returns:
+            Dictionary of template variables
+        """
+        context = dict(self._base_context(config))
+        context["blueprint_name"] = blueprint_name
+        context["category"] = category
+        return context
+
+    def _base_context(self, config: ProjectConfig) -> Mapping[str, Any]:
+        """Return the document-independent template variables of a configuration.
+
+        The variables are built once and reused until the configuration's
+        revision changes. They hold copies of the configuration's lists and
+        dicts (maintainers, answers), so a cached context never shares state
+        with the configuration; changes must go through ProjectConfig.set()
+        or be followed by touch() to be picked up.
+
+        Args:
+            config: Project configuration
+
+        Returns:
+            Read-only mapping of template variables
+        """
+        cached = self._base_contexts.get(config)
+        if cached is not None and cached[0] == config.revision:
+            return cached[1]
+        revision = config.revision
+        context = MappingProxyType(copy.deepcopy(self._build_base_context(config)))
+        self._base_contexts[config] = (revision, context)
+        return context
+
+    def _build_base_context(self, config: ProjectConfig) -> Dict[str, Any]:
+        """Build the template variables shared by every document.
+
+        Args:
+            config: Project configuration
+
         Returns:
             Dictionary of template variables
         """
@@ -244,10 +447,8 @@ class DocumentGenerator:
             force: If True, overwrite existing files without backup
 
         Returns:
-            List of generated file paths
+            List of generated file paths, in the order of the missing documents
         """
-        generated = []
-
         if output_preferences is None:
             from diversity_standard.inspector import ProjectInspector
 
@@ -256,23 +457,20 @@ class DocumentGenerator:
                 inspection_result.project_root, config
             )
 
-        # Load document mapping to get categories
-        import yaml
-
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        with open(mapping_file) as f:
-            mapping = yaml.safe_load(f)
-
         # Get answers to check for conditional skipping
         answers = config.get("answers", {})
 
+        # Build the shared context before the workers start reading it
+        self._base_context(config)
+
+        # Decide what to write (and take backups) first, then render in parallel
+        planned: List[Tuple[str, Path, str]] = []
         for blueprint_name in inspection_result.missing_documents:
             # Check if document should be skipped based on answers
             if self._should_skip_document(blueprint_name, answers):
                 continue
 
-            doc_config = mapping.get("documents", {}).get(blueprint_name, {})
-            category = doc_config.get("category", "Unknown")
+            category = self.registry.category(blueprint_name)
 
             # Determine output path
             base_path = output_preferences.get(category, inspection_result.project_root)
@@ -288,12 +486,23 @@ class DocumentGenerator:
                     backup_path = output_path.with_suffix(output_path.suffix + ".backup")
                     shutil.copy2(output_path, backup_path)
 
-            # Generate document
-            success = self.generate_document(blueprint_name, output_path, config, category)
-            if success:
-                generated.append(output_path)
+            planned.append((blueprint_name, output_path, category))
 
-        return generated
+        if self.jobs <= 1 or len(planned) <= 1:
+            results = [
+                self.generate_document(name, path, config, category)
+                for name, path, category in planned
+            ]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(planned))) as executor:
+                futures = [
+                    executor.submit(self.generate_document, name, path, config, category)
+                    for name, path, category in planned
+                ]
+                # Collected in submission order, whichever document finishes first
+                results = [future.result() for future in futures]
+
+        return [path for (_, path, _), success in zip(planned, results) if success]
 
     def _should_skip_document(self, doc_name: str, answers: Dict) -> bool:
         """Check if document should be skipped based on questionnaire answers.
@@ -305,13 +514,5 @@ class DocumentGenerator:
         Returns:
             True if document should be skipped
         """
-        # Check for explicit skip conditions
-        skip_conditions = {
-            "FUNDING.md": not bool(answers.get("has_funding", False)),
-            "MEETINGS.md": not bool(answers.get("has_meetings", False)),
-            "LOCALIZATION.md": not bool(answers.get("supports_multiple_languages", False)),
-            "ADOPTERS.md": not bool(answers.get("tracks_adopters", False)),
-        }
-
-        return skip_conditions.get(doc_name, False)
+        return self.registry.is_skipped(doc_name, answers)
 
@@ -0,0 +1,271 @@
+"""Documentation coverage over a range of git history."""
+
+import io
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from diversity_standard.inspector import DocumentMatch, InspectionResult, ProjectInspector
+from diversity_standard.sources import GitBlobReader
+from diversity_standard.utils import IgnoreRules, iter_stream_chunks
+
+_TREE_MODE = b"40000"
+_REGULAR_FILE_MODES = {b"100644", b"100755"}
+
+
+@dataclass
+class _TreeSummary:
+    """Everything inspection needs from one subtree, in walk order."""
+
+    # Blueprint name -> (rel_path, kind) of every filename match
+    filename: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    # Blueprint name -> rel_path of the first markdown file whose content matches
+    content: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class HistoryPoint:
+    """Documentation coverage at one commit."""
+
+    commit: str
+    timestamp: int
+    subject: str
+    result: InspectionResult
+
+    @property
+    def found(self) -> List[str]:
+        """Names of the documents found at this commit, sorted."""
+        return sorted({doc.blueprint_name for doc in self.result.found_documents})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the point for JSON output, without match details.
+
+        Returns:
+            JSON-serialisable dictionary
+        """
+        return {
+            "commit": self.commit,
+            "date": datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat(),
+            "subject": self.subject,
+            "found": self.found,
+            "missing": list(self.result.missing_documents),
+        }
+
+
+class HistoryInspector:
+    """Inspects many commits, reusing work for everything they share.
+
+    Trees are read through one ``git cat-file --batch`` process and each
+    subtree is summarised once per (tree hash, path): a subtree that did not
+    change between commits is not read or walked again. Keyword hits are
+    memoised per blob hash, so a markdown file is scanned once no matter
+    how many commits contain it.
+    """
+
+    def __init__(
+        self,
+        inspector: ProjectInspector,
+        project_root: Path,
+        exclude: Optional[List[str]] = None,
+    ):
+        """Initialize the history inspector.
+
+        Args:
+            inspector: Inspector providing the mapping, matchers and settings
+            project_root: Project root inside a git repository
+            exclude: Extra .gitignore-style patterns to skip
+        """
+        self.inspector = inspector
+        self.project_root = project_root
+        self.ignore = IgnoreRules.for_project(project_root, exclude)
+        self.documents: Mapping[str, Mapping] = inspector.registry.documents
+        self._trees: Dict[Tuple[str, str], _TreeSummary] = {}
+        self._blob_hits: Dict[str, Set[str]] = {}
+        self._reader: Optional[GitBlobReader] = None
+
+    def timeline(self, revision_range: str, first_parent: bool = False) -> Iterator[HistoryPoint]:
+        """Inspect every commit of a range, oldest first.
+
+        Args:
+            revision_range: Anything ``git log`` accepts, e.g. "v1.0..HEAD"
+            first_parent: Follow only the first parent of merge commits
+
+        Returns:
+            Iterator of one HistoryPoint per commit
+
+        Raises:
+            OSError: If git is unavailable or the range is invalid
+        """
+        # Listed eagerly, so a bad range fails before anything is yielded
+        commits = self._list_commits(revision_range, first_parent)
+        return self._inspect_commits(commits)
+
+    def _inspect_commits(
+        self, commits: List[Tuple[str, str, int, str]]
+    ) -> Iterator[HistoryPoint]:
+        """Yield the coverage of each listed commit, sharing the memo tables."""
+        prefix = self._repository_prefix()
+        self._reader = GitBlobReader(self.project_root)
+        try:
+            for commit, tree, timestamp, subject in commits:
+                tree = self._descend(tree, prefix)
+                summary = self._summarize(tree, "") if tree else _TreeSummary()
+                yield HistoryPoint(commit, timestamp, subject, self._result(summary))
+        finally:
+            self._reader.close()
+            self._reader = None
+
+    def _list_commits(
+        self, revision_range: str, first_parent: bool
+    ) -> List[Tuple[str, str, int, str]]:
+        """List (commit, root tree, commit time, subject) oldest first."""
+        command = [
+            "git",
+            "-C",
+            str(self.project_root),
+            "log",
+            "--reverse",
+            # NUL-terminated records: subjects may hold form feeds and other
+            # characters str.splitlines() would break on
+            "--format=%H%x00%T%x00%ct%x00%s%x00",
+        ]
+        if first_parent:
+            command.append("--first-parent")
+        command.extend([revision_range, "--"])
+        try:
+            completed = subprocess.run(
+                command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=False
+            )
+        except OSError as e:
+            raise OSError(f"Cannot run git: {e}") from e
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip()
+            raise OSError(f"Cannot list commits {revision_range}: {message}")
+
+        commits = []
+        for record in completed.stdout.decode("utf-8", "replace").split("\0\n"):
+            fields = record.split("\0")
+            if len(fields) != 4 or not fields[2].isdigit():
+                continue
+            commit, tree, timestamp, subject = fields
+            commits.append((commit, tree, int(timestamp), subject))
+        return commits
+
+    def _repository_prefix(self) -> List[str]:
+        """Return the path components from the repository root to project_root."""
+        completed = subprocess.run(
+            ["git", "-C", str(self.project_root), "rev-parse", "--show-prefix"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        prefix = completed.stdout.decode("utf-8").strip() if completed.returncode == 0 else ""
+        return [part for part in prefix.split("/") if part]
+
+    def _descend(self, tree: str, components: List[str]) -> Optional[str]:
+        """Follow a path from a root tree to the tree of a subdirectory."""
+        for component in components:
+            for mode, name, object_id in self._read_tree(tree):
+                if mode == _TREE_MODE and name == component:
+                    tree = object_id
+                    break
+            else:
+                return None
+        return tree
+
+    def _read_tree(self, tree: str) -> List[Tuple[bytes, str, str]]:
+        """Parse a tree object into (mode, name, object id) entries."""
+        assert self._reader is not None
+        data = self._reader.read(tree)
+        hash_size = len(tree) // 2
+        entries = []
+        offset = 0
+        while offset < len(data):
+            space = data.index(b" ", offset)
+            nul = data.index(b"\0", space)
+            mode = data[offset:space]
+            name = data[space + 1 : nul].decode("utf-8", "surrogateescape")
+            object_id = data[nul + 1 : nul + 1 + hash_size].hex()
+            entries.append((mode, name, object_id))
+            offset = nul + 1 + hash_size
+        return entries
+
+    def _summarize(self, tree: str, prefix: str) -> _TreeSummary:
+        """Summarise a subtree, reusing the summary of an identical one."""
+        key = (tree, prefix)
+        summary = self._trees.get(key)
+        if summary is not None:
+            return summary
+
+        summary = _TreeSummary()
+        files = []
+        subdirs = []
+        for mode, name, object_id in self._read_tree(tree):
+            rel_path = prefix + name
+            if mode == _TREE_MODE:
+                if not self.ignore.is_ignored(rel_path, True):
+                    subdirs.append((name, object_id))
+            elif mode in _REGULAR_FILE_MODES:
+                if not self.ignore.is_ignored(rel_path, False):
+                    files.append((name, object_id))
+
+        # Same order as the walker: files first, then subdirectories
+        for name, blob in sorted(files):
+            rel_path = prefix + name
+            for blueprint_name, kind in self.inspector.filename_matcher.match(name):
+                summary.filename.setdefault(blueprint_name, []).append((rel_path, kind))
+            if name.endswith(".md"):
+                for blueprint_name in self._hits(blob):
+                    summary.content.setdefault(blueprint_name, rel_path)
+        for name, subtree in sorted(subdirs):
+            child = self._summarize(subtree, prefix + name + "/")
+            for blueprint_name, matches in child.filename.items():
+                summary.filename.setdefault(blueprint_name, []).extend(matches)
+            for blueprint_name, rel_path in child.content.items():
+                summary.content.setdefault(blueprint_name, rel_path)
+
+        self._trees[key] = summary
+        return summary
+
+    def _hits(self, blob: str) -> Set[str]:
+        """Return every document whose keywords occur in a blob, memoised."""
+        hits = self._blob_hits.get(blob)
+        if hits is None:
+            assert self._reader is not None
+            try:
+                max_bytes = self.inspector.max_file_bytes
+                stream = io.BytesIO(self._reader.read(blob, max_bytes))
+                hits = self.inspector.keyword_automaton.search_chunks(
+                    iter_stream_chunks(stream, max_bytes=max_bytes)
+                )
+            except OSError:
+                hits = set()
+            self._blob_hits[blob] = hits
+        return hits
+
+    def _result(self, summary: _TreeSummary) -> InspectionResult:
+        """Turn a root summary into the InspectionResult of that commit."""
+        found_documents: List[DocumentMatch] = []
+        for blueprint_name in self.documents:
+            filename_matches = summary.filename.get(blueprint_name)
+            if filename_matches:
+                found_documents.extend(
+                    self.inspector.filename_match(
+                        blueprint_name, self.project_root / rel_path, kind
+                    )
+                    for rel_path, kind in filename_matches
+                )
+            elif blueprint_name in summary.content:
+                found_documents.append(
+                    self.inspector.content_match(
+                        blueprint_name, self.project_root / summary.content[blueprint_name]
+                    )
+                )
+        found = {doc.blueprint_name for doc in found_documents}
+        return InspectionResult(
+            found_documents=found_documents,
+            missing_documents=sorted(set(self.documents) - found),
+            project_root=self.project_root,
+        )
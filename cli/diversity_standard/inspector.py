@@ -1,16 +1,36 @@
 """Project inspection logic for finding and mapping documents."""
 
-import yaml
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from diversity_standard.archives import ArchiveSource, is_archive
+from diversity_standard.cache import InspectionCache, mapping_fingerprint
+from diversity_standard.matcher import MATCH_EXACT, MATCH_PARTIAL
+from diversity_standard.registry import MAPPING_FILE, get_registry
+from diversity_standard.sources import (
+    SOURCE_AUTO,
+    SOURCE_GIT_INDEX,
+    GitRevisionSource,
+    list_git_index_files,
+)
 from diversity_standard.utils import (
-    contains_keywords,
-    find_files_by_patterns,
-    read_file_content,
+    FileEntry,
+    IgnoreRules,
+    build_file_index,
+    iter_stream_chunks,
+    iter_text_chunks,
 )
 
+# Content matching is I/O-bound, so allow more readers than cores
+DEFAULT_JOBS = min(8, (os.cpu_count() or 1) + 4)
+
+# A file named exactly like a rule is a stronger hit than one containing it
+FILENAME_CONFIDENCE = {MATCH_EXACT: 0.9, MATCH_PARTIAL: 0.8}
+
 
 @dataclass
 class DocumentMatch:
@@ -22,6 +42,24 @@ class DocumentMatch:
     confidence: float  # 0.0 to 1.0
     match_type: str  # "filename" or "content"
 
+    def to_dict(self, relative_to: Optional[Path] = None) -> Dict[str, Any]:
+        """Serialise the match for JSON output.
+
+        Args:
+            relative_to: If given, report actual_path relative to this root
+
+        Returns:
+            JSON-serialisable dictionary
+        """
+        path = self.actual_path.relative_to(relative_to) if relative_to else self.actual_path
+        return {
+            "blueprint_name": self.blueprint_name,
+            "path": path.as_posix(),
+            "category": self.category,
+            "confidence": self.confidence,
+            "match_type": self.match_type,
+        }
+
 
 @dataclass
 class InspectionResult:
@@ -31,59 +69,219 @@ class InspectionResult:
     missing_documents: List[str]
     project_root: Path
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialise the result for JSON output, with project-relative paths.
+
+        Returns:
+            JSON-serialisable dictionary
+        """
+        return {
+            "project_root": str(self.project_root),
+            "found_documents": [
+                doc.to_dict(relative_to=self.project_root) for doc in self.found_documents
+            ],
+            "missing_documents": list(self.missing_documents),
+        }
+
+
+# Called with (blueprint_name, matches) as soon as a document is decided;
+# an empty list means the document is missing
+DecisionCallback = Callable[[str, List[DocumentMatch]], None]
+
+# Opens an index entry that does not live on disk, e.g. an archive member
+EntryOpener = Callable[[FileEntry], BinaryIO]
+
 
 class ProjectInspector:
     """Inspects projects to find existing documents."""
 
-    def __init__(self, blueprint_root: Optional[Path] = None):
+    def __init__(
+        self,
+        blueprint_root: Optional[Path] = None,
+        use_cache: bool = False,
+        jobs: Optional[int] = None,
+        max_file_bytes: Optional[int] = None,
+        source: str = SOURCE_AUTO,
+    ):
         """Initialize inspector.
 
         Args:
             blueprint_root: Root directory of blueprint repository.
                           If None, tries to find it relative to this file.
+            use_cache: Keep an incremental cache in the inspected project's
+                      .diversity-standard-cache/ directory
+            jobs: Number of files read concurrently during content matching.
+                 If None, DEFAULT_JOBS is used; 1 reads serially.
+            max_file_bytes: Only scan this many bytes of each markdown file
+                           for content keywords. If None, files are scanned
+                           in full (in constant memory either way).
+            source: How to list the project's files: "git-index" asks git
+                   for tracked and untracked files, "filesystem" walks the
+                   tree, and "auto" uses git-index when project_root has a
+                   .git directory. Falls back to the walker if git fails.
         """
         if blueprint_root is None:
             # Assume we're in cli/diversity_standard/, go up to repo root
             blueprint_root = Path(__file__).parent.parent.parent
         self.blueprint_root = blueprint_root
-        self.mapping = self._load_document_mapping()
+        self.use_cache = use_cache
+        self.jobs = max(1, jobs or DEFAULT_JOBS)
+        self.max_file_bytes = max_file_bytes
+        self.source = source
+        self.mapping_file = MAPPING_FILE
+        self.registry = get_registry(self.mapping_file)
+        self.mapping = self.registry.mapping
+        self.filename_matcher = self.registry.filename_matcher
+        self.keyword_automaton = self.registry.keyword_automaton
+
+    def inspect(
+        self,
+        project_root: Path,
+        exclude: Optional[List[str]] = None,
+        on_decision: Optional[DecisionCallback] = None,
+    ) -> InspectionResult:
+        """Inspect a project for existing documents.
 
-    def _load_document_mapping(self) -> Dict:
-        """Load document mapping configuration.
+        Args:
+            project_root: Root directory of the project to inspect, or a
+                         tarball or zip archive of one (see inspect_archive)
+            exclude: Extra .gitignore-style patterns to skip, on top of the
+                    built-in deny list and the project's ignore files
+            on_decision: Called for each document as soon as it is found or
+                        known to be missing, for streaming output
 
         Returns:
-            Document mapping dictionary
+            InspectionResult with found and missing documents
         """
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        if mapping_file.exists():
-            with open(mapping_file) as f:
-                return yaml.safe_load(f)
-        return {"documents": {}}
+        if is_archive(project_root):
+            return self.inspect_archive(project_root, exclude, on_decision)
 
-    def inspect(self, project_root: Path) -> InspectionResult:
-        """Inspect a project for existing documents.
+        cache = None
+        if self.use_cache:
+            cache = InspectionCache.load(
+                project_root, mapping_fingerprint(self.mapping_file, self.max_file_bytes)
+            )
+
+        # List the project once; every blueprint lookup is answered from this
+        ignore = IgnoreRules.for_project(project_root, exclude)
+        index = self.build_index(project_root, ignore, cache)
+
+        result = self.inspect_index(project_root, index, cache, on_decision)
+
+        if cache:
+            cache.save(index)
+
+        return result
+
+    def inspect_archive(
+        self,
+        archive: Path,
+        exclude: Optional[List[str]] = None,
+        on_decision: Optional[DecisionCallback] = None,
+    ) -> InspectionResult:
+        """Inspect a tarball or zip archive without extracting it.
+
+        Filenames are matched on the archive listing and only markdown
+        members are decompressed for content matching. Found documents have
+        paths under the archive path (archive / member name). The inspection
+        cache and the source setting do not apply to archives.
+
+        Args:
+            archive: Archive file (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz, .zip)
+            exclude: Extra .gitignore-style patterns to skip
+            on_decision: Called for each document as soon as it is decided
+
+        Returns:
+            InspectionResult with project_root set to the archive path
+
+        Raises:
+            OSError: If the archive is corrupt or cannot be read
+        """
+        with ArchiveSource(archive, exclude, self.max_file_bytes) as source:
+            index = source.list_files()
+            return self.inspect_index(
+                archive, index, on_decision=on_decision, open_entry=source.open
+            )
+
+    def inspect_revision(
+        self,
+        project_root: Path,
+        rev: str,
+        exclude: Optional[List[str]] = None,
+        on_decision: Optional[DecisionCallback] = None,
+    ) -> InspectionResult:
+        """Inspect a project as of a git revision, without checking it out.
+
+        The revision's tree is listed with one ``git ls-tree`` and markdown
+        blobs are read through a single ``git cat-file --batch`` process.
+        Paths in the result are under project_root, as for a checkout of
+        the revision. The inspection cache does not apply.
 
         Args:
-            project_root: Root directory of the project to inspect
+            project_root: Project root inside a git work tree or repository
+            rev: Revision to inspect, e.g. a tag, branch or commit hash
+            exclude: Extra .gitignore-style patterns to skip
+            on_decision: Called for each document as soon as it is decided
 
         Returns:
             InspectionResult with found and missing documents
+
+        Raises:
+            OSError: If git is unavailable or the revision does not exist
         """
+        ignore = IgnoreRules.for_project(project_root, exclude)
+        with GitRevisionSource(project_root, rev, ignore, self.max_file_bytes) as source:
+            index = source.list_files()
+            return self.inspect_index(
+                project_root, index, on_decision=on_decision, open_entry=source.open
+            )
+
+    def inspect_index(
+        self,
+        project_root: Path,
+        index: List[FileEntry],
+        cache: Optional[InspectionCache] = None,
+        on_decision: Optional[DecisionCallback] = None,
+        open_entry: Optional[EntryOpener] = None,
+    ) -> InspectionResult:
+        """Inspect a project from an already-built file index.
+
+        Args:
+            project_root: Root directory the index was built for
+            index: Files of the project in walk order
+            cache: Inspection cache for content keyword hits, if enabled
+            on_decision: Called for each document as soon as it is decided
+            open_entry: Opens entries whose content is not at entry.path.
+                       If None, files are read from disk.
+
+        Returns:
+            InspectionResult with found and missing documents
+        """
+        documents = self.registry.documents
         found_documents: List[DocumentMatch] = []
-        found_blueprint_names = set()
 
-        # Search for each blueprint document
-        for blueprint_name, config in self.mapping.get("documents", {}).items():
-            matches = self._find_document(
-                project_root, blueprint_name, config
+        # Match every blueprint document's filenames in one pass over the index
+        matches_by_document = self._find_by_filename(index)
+        if on_decision:
+            for blueprint_name in documents:
+                if blueprint_name in matches_by_document:
+                    on_decision(blueprint_name, matches_by_document[blueprint_name])
+
+        # Fall back to content search for everything else, in a single pass
+        pending = [name for name in documents if name not in matches_by_document]
+        if pending:
+            matches_by_document.update(
+                self._find_by_content(pending, index, cache, on_decision, open_entry)
             )
-            if matches:
-                found_documents.extend(matches)
-                found_blueprint_names.add(blueprint_name)
+
+        for blueprint_name in documents:
+            found_documents.extend(matches_by_document.get(blueprint_name, []))
 
         # Determine missing documents
-        all_blueprint_docs = set(self.mapping.get("documents", {}).keys())
-        missing_documents = sorted(all_blueprint_docs - found_blueprint_names)
+        missing_documents = sorted(set(documents) - set(matches_by_document))
+        if on_decision:
+            for blueprint_name in missing_documents:
+                on_decision(blueprint_name, [])
 
         return InspectionResult(
             found_documents=found_documents,
@@ -91,59 +289,210 @@ class ProjectInspector:
             project_root=project_root,
         )
 
-    def _find_document(
-        self, project_root: Path, blueprint_name: str, config: Dict
-    ) -> List[DocumentMatch]:
-        """Find a specific document in the project.
+    def build_index(
+        self,
+        project_root: Path,
+        ignore: IgnoreRules,
+        cache: Optional[InspectionCache] = None,
+    ) -> List[FileEntry]:
+        """List the project's files from the configured source.
 
         Args:
             project_root: Project root directory
-            blueprint_name: Name of the blueprint document
-            config: Document mapping configuration
+            ignore: Ignore rules for the project
+            cache: Inspection cache whose directory listings are reused
+
+        Returns:
+            File index in walk order
+        """
+        list_directory = cache.list_directory if cache else None
+        use_git = self.source == SOURCE_GIT_INDEX or (
+            self.source == SOURCE_AUTO and (project_root / ".git").exists()
+        )
+        if use_git:
+            index = list_git_index_files(project_root, ignore, list_directory)
+            if index is not None:
+                return index
+        return build_file_index(project_root, ignore, list_directory)
+
+    def _find_by_filename(self, index: List[FileEntry]) -> Dict[str, List[DocumentMatch]]:
+        """Find documents by filename with a single pass over the index.
+
+        Args:
+            index: File index of the project
 
         Returns:
-            List of DocumentMatch objects (may be empty)
+            Dictionary mapping blueprint names to their filename matches,
+            each list in walk order
         """
-        matches: List[DocumentMatch] = []
-        filenames = config.get("filenames", [])
-        content_keywords = config.get("content_keywords", [])
-        category = config.get("category", "Unknown")
-
-        # Search by filename
-        filename_matches = find_files_by_patterns(project_root, filenames)
-        for path in filename_matches:
-            matches.append(
-                DocumentMatch(
-                    blueprint_name=blueprint_name,
-                    actual_path=path,
-                    category=category,
-                    confidence=0.9,  # High confidence for filename match
-                    match_type="filename",
+        matches: Dict[str, List[DocumentMatch]] = {}
+        for entry in index:
+            for blueprint_name, kind in self.filename_matcher.match(entry.name):
+                matches.setdefault(blueprint_name, []).append(
+                    self.filename_match(blueprint_name, entry.path, kind)
                 )
-            )
+        return matches
 
-        # If no filename match, try content-based search
-        if not matches:
-            # Search all markdown files for content keywords
-            for md_file in project_root.rglob("*.md"):
-                if md_file in [m.actual_path for m in matches]:
-                    continue  # Already matched by filename
-
-                content = read_file_content(md_file)
-                if content and contains_keywords(content, content_keywords):
-                    matches.append(
-                        DocumentMatch(
-                            blueprint_name=blueprint_name,
-                            actual_path=md_file,
-                            category=category,
-                            confidence=0.6,  # Lower confidence for content match
-                            match_type="content",
-                        )
-                    )
-                    break  # Only take first content match
+    def filename_match(self, blueprint_name: str, path: Path, kind: str) -> DocumentMatch:
+        """Build the DocumentMatch for a filename hit of the given kind."""
+        return DocumentMatch(
+            blueprint_name=blueprint_name,
+            actual_path=path,
+            category=self.registry.category(blueprint_name),
+            confidence=FILENAME_CONFIDENCE[kind],
+            match_type="filename",
+        )
+
+    def content_match(self, blueprint_name: str, path: Path) -> DocumentMatch:
+        """Build the DocumentMatch for a file whose content mentions a document."""
+        return DocumentMatch(
+            blueprint_name=blueprint_name,
+            actual_path=path,
+            category=self.registry.category(blueprint_name),
+            confidence=0.6,  # Lower confidence for content match
+            match_type="content",
+        )
+
+    def _find_by_content(
+        self,
+        blueprint_names: List[str],
+        index: List[FileEntry],
+        cache: Optional[InspectionCache] = None,
+        on_decision: Optional[DecisionCallback] = None,
+        open_entry: Optional[EntryOpener] = None,
+    ) -> Dict[str, List[DocumentMatch]]:
+        """Find documents by content keywords, reading each markdown file once.
+
+        Every markdown file is scanned with the keyword automaton for all
+        pending documents at the same time. Each document takes the first
+        file (in walk order) that mentions one of its keywords.
+
+        Args:
+            blueprint_names: Documents that had no filename match
+            index: File index of the project
+            cache: Inspection cache. Unchanged files reuse their recorded hits;
+                  new or changed files are scanned for every keyword.
+            on_decision: Called for each document as soon as it is matched
+            open_entry: Opens entries that are not files on disk
+
+        Returns:
+            Dictionary mapping blueprint names to their content match
+        """
+        pending = set(blueprint_names)
+        matches: Dict[str, List[DocumentMatch]] = {}
+
+        candidates = (entry for entry in index if entry.name.endswith(".md"))
+        scans = self._scan_in_order(candidates, pending, cache, open_entry)
+        try:
+            for entry, hits, complete in scans:
+                if hits is None:
+                    continue
+                if cache and complete:
+                    cache.set_hits(entry, hits)
+
+                hits &= pending
+                for blueprint_name in hits:
+                    matches[blueprint_name] = [self.content_match(blueprint_name, entry.path)]
+                    if on_decision:
+                        on_decision(blueprint_name, matches[blueprint_name])
+                pending -= hits
+                if not pending:
+                    break
+        finally:
+            scans.close()
 
         return matches
 
+    def _scan_in_order(
+        self,
+        candidates: Iterator[FileEntry],
+        pending: Set[str],
+        cache: Optional[InspectionCache],
+        open_entry: Optional[EntryOpener] = None,
+    ) -> Iterator[Tuple[FileEntry, Optional[Set[str]], bool]]:
+        """Scan markdown files for keywords, reading up to self.jobs at a time.
+
+        Files are fetched concurrently through a bounded thread pool but
+        results are yielded strictly in walk order, so the first content
+        match is the same as in a serial run. Closing the generator cancels
+        reads that have not started yet.
+
+        Args:
+            candidates: Markdown files in walk order
+            pending: Documents still unresolved; read live at submit time
+            cache: Inspection cache, if enabled
+            open_entry: Opens entries that are not files on disk
+
+        Yields:
+            (entry, hits, complete) tuples. hits is None for unreadable files;
+            complete is True when the file was freshly scanned for every keyword.
+        """
+        if self.jobs <= 1:
+            for entry in candidates:
+                yield (entry, *self.scan_file(entry, set(pending), cache, open_entry))
+            return
+
+        window: Deque[Tuple[FileEntry, "Future[Tuple[Optional[Set[str]], bool]]"]] = deque()
+        executor = ThreadPoolExecutor(max_workers=self.jobs)
+        try:
+
+            def submit_next() -> None:
+                entry = next(candidates, None)
+                if entry is not None:
+                    future = executor.submit(
+                        self.scan_file, entry, set(pending), cache, open_entry
+                    )
+                    window.append((entry, future))
+
+            for _ in range(self.jobs * 2):
+                submit_next()
+            while window:
+                entry, future = window.popleft()
+                yield (entry, *future.result())
+                submit_next()
+        finally:
+            for _, future in window:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def scan_file(
+        self,
+        entry: FileEntry,
+        targets: Optional[Set[str]],
+        cache: Optional[InspectionCache],
+        open_entry: Optional[EntryOpener] = None,
+    ) -> Tuple[Optional[Set[str]], bool]:
+        """Read one markdown file and find the documents its content matches.
+
+        Args:
+            entry: File to scan
+            targets: Documents worth looking for; the scan may stop once all
+                    of them are found. None scans for every document.
+            cache: Inspection cache. Unchanged files reuse their recorded hits;
+                  new or changed files are scanned for every keyword.
+            open_entry: Opens the entry if it is not a file on disk
+
+        Returns:
+            (hits, complete) as yielded by _scan_in_order
+        """
+        if cache:
+            hits = cache.get_hits(entry)
+            if hits is not None:
+                return hits, False
+
+        if open_entry is None:
+            chunks = iter_text_chunks(entry.path, max_bytes=self.max_file_bytes)
+        else:
+            chunks = _iter_opened_chunks(open_entry, entry, self.max_file_bytes)
+        try:
+            if cache:
+                return self.keyword_automaton.search_chunks(chunks), True
+            return self.keyword_automaton.search_chunks(chunks, targets), False
+        except OSError:
+            return None, False
+        finally:
+            chunks.close()
+
     def get_document_location_preference(self, project_root: Path, config: Optional[Any] = None) -> Dict[str, Path]:
         """Determine preferred document locations based on config or existing structure.
 
@@ -215,3 +564,10 @@ class ProjectInspector:
 
         return preferences
 
+
+def _iter_opened_chunks(
+    open_entry: EntryOpener, entry: FileEntry, max_bytes: Optional[int]
+) -> Iterator[str]:
+    """Stream an entry opened by open_entry as decoded text chunks."""
+    with open_entry(entry) as stream:
+        yield from iter_stream_chunks(stream, max_bytes=max_bytes)
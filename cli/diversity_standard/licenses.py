@@ -0,0 +1,183 @@
+"""License detection against a bundled index of SPDX license fingerprints."""
+
+import array
+import base64
+import json
+import re
+import sys
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+LICENSE_INDEX_FILE = Path(__file__).parent / "license_index.json"
+LICENSE_INDEX_FORMAT = 1
+
+# Consecutive words hashed together; long enough that unrelated licenses
+# sharing stock phrases ("without warranty of any kind") stay far apart
+SHINGLE_WORDS = 5
+
+# Jaccard similarity a file needs to count as a copy of a license text
+LICENSE_MATCH_THRESHOLD = 0.75
+
+# Names of files holding a project's license, lowercased, by precedence
+LICENSE_FILE_STEMS = ["license", "licence", "copying"]
+
+_COPYRIGHT_LINE = re.compile(r"^[^\S\n]*(?:copyright\b|\(c\)|©).*$", re.IGNORECASE | re.MULTILINE)
+# LICENSE, LICENSE-MIT, COPYING.LESSER, LICENCE.md, ... but not source files
+# such as license_check.py or LICENSE.go
+_LICENSE_FILE = re.compile(
+    r"(license|licence|copying)(?:[\-_][a-z0-9+]+)?(?:\.(?:txt|md|rst|lesser|lib))?",
+    re.IGNORECASE,
+)
+_WORD = re.compile(r"[a-z0-9]+")
+_SPDX_IDENTIFIER = re.compile(r"SPDX-License-Identifier:\s*([A-Za-z0-9.+()\- ]+)")
+
+# Spelling variants the SPDX matching guidelines treat as equivalent
+_EQUIVALENT_WORDS = {
+    "licence": "license",
+    "licences": "licenses",
+    "licenced": "licensed",
+    "sublicence": "sublicense",
+    "https": "http",
+}
+
+
+@dataclass(frozen=True)
+class LicenseMatch:
+    """Best matching license for a license file."""
+
+    spdx_id: str
+    score: float  # Jaccard similarity of the shingle sets, 0.0 - 1.0
+    path: Optional[Path] = None
+
+
+def normalize_license_text(text: str) -> List[str]:
+    """Reduce a license text to the words that identify it.
+
+    Copyright lines, case, punctuation and spelling variants are dropped,
+    so a license with a filled-in copyright holder matches its template.
+
+    Args:
+        text: License text
+
+    Returns:
+        Normalised words
+    """
+    text = _COPYRIGHT_LINE.sub(" ", text).lower()
+    return [_EQUIVALENT_WORDS.get(word, word) for word in _WORD.findall(text)]
+
+
+def license_fingerprint(text: str) -> Set[int]:
+    """Hash every run of SHINGLE_WORDS normalised words of a text.
+
+    Args:
+        text: License text
+
+    Returns:
+        Set of 32-bit shingle hashes
+    """
+    words = normalize_license_text(text)
+    if len(words) < SHINGLE_WORDS:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i : i + SHINGLE_WORDS]).encode())
+        for i in range(len(words) - SHINGLE_WORDS + 1)
+    }
+
+
+def encode_fingerprint(fingerprint: Iterable[int]) -> str:
+    """Pack a fingerprint as base64 of sorted little-endian uint32 values."""
+    packed = array.array("I", sorted(fingerprint))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def decode_fingerprint(encoded: str) -> FrozenSet[int]:
+    """Unpack a fingerprint written by encode_fingerprint."""
+    packed = array.array("I")
+    packed.frombytes(base64.b64decode(encoded))
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return frozenset(packed)
+
+
+@lru_cache(maxsize=1)
+def load_license_index() -> Dict[str, FrozenSet[int]]:
+    """Load the bundled license index, once per process.
+
+    Returns:
+        SPDX identifier -> fingerprint; empty if the index is missing or was
+        built for another format
+    """
+    try:
+        data = json.loads(LICENSE_INDEX_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("format") != LICENSE_INDEX_FORMAT or data.get("shingle_words") != SHINGLE_WORDS:
+        return {}
+    return {
+        spdx_id: decode_fingerprint(encoded)
+        for spdx_id, encoded in data.get("licenses", {}).items()
+    }
+
+
+def identify_license(text: str) -> Optional[LicenseMatch]:
+    """Find the indexed license a text is a copy of.
+
+    Args:
+        text: Content of a license file
+
+    Returns:
+        Best match if its similarity reaches LICENSE_MATCH_THRESHOLD, else None
+    """
+    fingerprint = license_fingerprint(text)
+    if not fingerprint:
+        return None
+
+    best_id = None
+    best_score = 0.0
+    size = len(fingerprint)
+    for spdx_id, reference in load_license_index().items():
+        # Jaccard similarity can never exceed the ratio of the set sizes
+        if min(size, len(reference)) / max(size, len(reference)) <= best_score:
+            continue
+        shared = len(fingerprint & reference)
+        score = shared / (size + len(reference) - shared)
+        if score > best_score:
+            best_id, best_score = spdx_id, score
+
+    if best_id is None or best_score < LICENSE_MATCH_THRESHOLD:
+        return None
+    return LicenseMatch(best_id, round(best_score, 3))
+
+
+def declared_license_identifier(text: str) -> Optional[str]:
+    """Return the expression of an SPDX-License-Identifier line, if any."""
+    match = _SPDX_IDENTIFIER.search(text)
+    return match.group(1).strip() if match else None
+
+
+def license_file_names(names: Iterable[str]) -> List[str]:
+    """Pick the license files among a directory's file names.
+
+    LICENSE and LICENCE files come before COPYING ones, and the bare name
+    before ones with a suffix (COPYING before COPYING.LESSER). A name may
+    carry a variant (LICENSE-MIT) and a text extension (.txt, .md, .rst);
+    files with any other extension are not license texts.
+
+    Args:
+        names: File names in a directory
+
+    Returns:
+        License file names in the order they should be checked
+    """
+    candidates = []
+    for name in names:
+        match = _LICENSE_FILE.fullmatch(name)
+        if match:
+            rank = LICENSE_FILE_STEMS.index(match.group(1).lower())
+            candidates.append((rank, len(name), name))
+    return [name for _, _, name in sorted(candidates)]
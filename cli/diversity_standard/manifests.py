@@ -0,0 +1,324 @@
+"""Readers for package manifests (pyproject.toml, Cargo.toml, pom.xml, ...)."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Hosts where a Go module path is also the repository URL
+GO_MODULE_HOSTS = ("github.com/", "gitlab.com/", "bitbucket.org/", "codeberg.org/")
+
+# project_urls / [project.urls] keys that point at the source repository, best first
+REPOSITORY_URL_KEYS = ["repository", "source", "source code", "code", "homepage"]
+
+
+@dataclass
+class ManifestInfo:
+    """Project metadata declared by one manifest; unknown fields are None."""
+
+    source: str
+    name: Optional[str] = None
+    description: Optional[str] = None
+    license: Optional[str] = None
+    repository: Optional[str] = None
+    maintainers: List[Dict[str, str]] = field(default_factory=list)
+
+
+# Reads a manifest from its content
+ManifestReader = Callable[[str], ManifestInfo]
+
+# Manifest file name -> reader, in order of authority: when several manifests
+# declare the same field, the one registered first wins
+MANIFEST_READERS: Dict[str, ManifestReader] = {}
+
+
+def manifest_reader(filename: str) -> Callable[[ManifestReader], ManifestReader]:
+    """Register a reader for a manifest file name.
+
+    Readers import their parser inside the function, so an ecosystem's
+    parser is only loaded for projects that have its manifest.
+
+    Args:
+        filename: Manifest file name in the project root
+
+    Returns:
+        Decorator registering the reader
+    """
+
+    def register(reader: ManifestReader) -> ManifestReader:
+        MANIFEST_READERS[filename] = reader
+        return reader
+
+    return register
+
+
+def parse_person(value: Any) -> Optional[Dict[str, str]]:
+    """Normalise an author entry to {"name", "email"}.
+
+    Accepts "Name <email> (url)" strings and dictionaries with name/email keys.
+
+    Args:
+        value: Author entry from a manifest
+
+    Returns:
+        Dictionary with a name and, if known, an email; None if unusable
+    """
+    if isinstance(value, dict):
+        person = {key: str(value[key]) for key in ("name", "email") if value.get(key)}
+        return person or None
+    if not isinstance(value, str) or not value.strip():
+        return None
+    match = re.match(r"\s*([^<(]*?)\s*(?:<([^>]*)>)?\s*(?:\(([^)]*)\))?\s*$", value)
+    if not match or not (match.group(1) or match.group(2)):
+        return {"name": value.strip()}
+    person = {}
+    if match.group(1):
+        person["name"] = match.group(1)
+    if match.group(2):
+        person["email"] = match.group(2)
+    return person
+
+
+def _people(values: Any) -> List[Dict[str, str]]:
+    """Normalise a list of author entries, dropping unusable ones."""
+    if not isinstance(values, list):
+        values = [values]
+    return [person for person in map(parse_person, values) if person]
+
+
+def _string(value: Any) -> Optional[str]:
+    """Return a non-empty string value, or None."""
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _repository_url(urls: Any) -> Optional[str]:
+    """Pick the source repository from a label -> URL table."""
+    if not isinstance(urls, dict):
+        return None
+    by_label = {str(label).lower(): url for label, url in urls.items()}
+    for key in REPOSITORY_URL_KEYS:
+        url = _string(by_label.get(key))
+        if url:
+            return url
+    return None
+
+
+def _load_toml(content: str) -> Optional[Dict[str, Any]]:
+    """Parse TOML with tomllib, or tomli before Python 3.11."""
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            return None
+    try:
+        return tomllib.loads(content)
+    except tomllib.TOMLDecodeError:
+        return None
+
+
+@manifest_reader("pyproject.toml")
+def read_pyproject(content: str) -> ManifestInfo:
+    """Read the [project] table (PEP 621), or [tool.poetry]."""
+    info = ManifestInfo(source="pyproject.toml")
+    data = _load_toml(content)
+    if not data:
+        return info
+    project = data.get("project")
+    if not isinstance(project, dict):
+        project = data.get("tool", {}).get("poetry")
+        if not isinstance(project, dict):
+            return info
+        info.repository = _string(project.get("repository"))
+
+    info.name = _string(project.get("name"))
+    info.description = _string(project.get("description"))
+    license_value = project.get("license")
+    if isinstance(license_value, dict):
+        license_value = license_value.get("text")
+    info.license = _string(license_value)
+    info.repository = info.repository or _repository_url(project.get("urls"))
+    info.maintainers = _people(project.get("maintainers") or project.get("authors") or [])
+    return info
+
+
+@manifest_reader("package.json")
+def read_package_json(content: str) -> ManifestInfo:
+    """Read name, author and friends from package.json."""
+    info = ManifestInfo(source="package.json")
+    try:
+        data = json.loads(content)
+    except json.JSONDecodeError:
+        return info
+    if not isinstance(data, dict):
+        return info
+
+    info.name = _string(data.get("name"))
+    info.description = _string(data.get("description"))
+    license_value = data.get("license")
+    if isinstance(license_value, dict):
+        license_value = license_value.get("type")
+    info.license = _string(license_value)
+    repository = data.get("repository")
+    if isinstance(repository, dict):
+        repository = repository.get("url")
+    info.repository = _string(repository)
+    info.maintainers = _people(data.get("author") or []) + _people(
+        data.get("maintainers") or []
+    )
+    return info
+
+
+@manifest_reader("Cargo.toml")
+def read_cargo_toml(content: str) -> ManifestInfo:
+    """Read the [package] table of a Rust crate."""
+    info = ManifestInfo(source="Cargo.toml")
+    data = _load_toml(content)
+    package = data.get("package") if data else None
+    if not isinstance(package, dict):
+        return info
+
+    # Values inherited with `key.workspace = true` are tables and are skipped
+    info.name = _string(package.get("name"))
+    info.description = _string(package.get("description"))
+    info.license = _string(package.get("license"))
+    info.repository = _string(package.get("repository")) or _string(package.get("homepage"))
+    info.maintainers = _people(package.get("authors") or [])
+    return info
+
+
+@manifest_reader("setup.cfg")
+def read_setup_cfg(content: str) -> ManifestInfo:
+    """Read the [metadata] section of setup.cfg."""
+    import configparser
+
+    info = ManifestInfo(source="setup.cfg")
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read_string(content)
+    except configparser.Error:
+        return info
+    if not parser.has_section("metadata"):
+        return info
+    metadata = parser["metadata"]
+
+    info.name = _string(metadata.get("name"))
+    info.description = _string(metadata.get("description"))
+    info.license = _string(metadata.get("license"))
+    urls = {}
+    for line in metadata.get("project_urls", "").splitlines():
+        label, _, url = line.partition("=")
+        if url.strip():
+            urls[label.strip()] = url.strip()
+    info.repository = _repository_url(urls) or _string(metadata.get("url"))
+    for role in ("maintainer", "author"):
+        person = parse_person(
+            {"name": metadata.get(role, ""), "email": metadata.get(f"{role}_email", "")}
+        )
+        if person:
+            info.maintainers.append(person)
+            break
+    return info
+
+
+@manifest_reader("pom.xml")
+def read_pom_xml(content: str) -> ManifestInfo:
+    """Read a Maven POM in one streaming pass.
+
+    Only elements at known depths are kept, so a <name> inside <parent> or
+    <dependency> is never mistaken for the project's own.
+    """
+    import io
+    import xml.etree.ElementTree as ElementTree
+
+    info = ManifestInfo(source="pom.xml")
+    values: Dict[str, str] = {}
+    licenses: List[str] = []
+    stack: List[str] = []
+    developer: Dict[str, str] = {}
+    try:
+        for event, element in ElementTree.iterparse(
+            io.StringIO(content), events=("start", "end")
+        ):
+            tag = element.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                stack.append(tag)
+                continue
+            location = "/".join(stack[1:])
+            text = (element.text or "").strip()
+            if location in ("artifactId", "name", "description", "url", "scm/url"):
+                values[location] = text
+            elif location == "licenses/license/name" and text:
+                licenses.append(text)
+            elif location in ("developers/developer/name", "developers/developer/email"):
+                developer[tag] = text
+            elif location == "developers/developer":
+                person = parse_person(developer)
+                if person:
+                    info.maintainers.append(person)
+                developer = {}
+            stack.pop()
+            if len(stack) <= 2:
+                # Children of top-level elements are no longer needed
+                element.clear()
+    except (ElementTree.ParseError, OSError):
+        return info
+
+    info.name = _string(values.get("name")) or _string(values.get("artifactId"))
+    info.description = _string(values.get("description"))
+    info.license = " OR ".join(licenses) or None
+    info.repository = _string(values.get("scm/url")) or _string(values.get("url"))
+    return info
+
+
+@manifest_reader("go.mod")
+def read_go_mod(content: str) -> ManifestInfo:
+    """Read the module path of a Go module."""
+    info = ManifestInfo(source="go.mod")
+    match = re.search(r"^\s*module\s+\"?([^\s\"]+)\"?", content, re.MULTILINE)
+    if not match:
+        return info
+    module = match.group(1)
+    # example.com/org/tool/v2 is version 2 of "tool"
+    parts = [part for part in module.split("/") if not re.fullmatch(r"v\d+", part)]
+    info.name = parts[-1] if parts else module
+    if module.startswith(GO_MODULE_HOSTS):
+        info.repository = "https://" + "/".join(module.split("/")[:3])
+    return info
+
+
+@manifest_reader("setup.py")
+def read_setup_py(content: str) -> ManifestInfo:
+    """Read literal keyword arguments from setup.py (basic parsing)."""
+    info = ManifestInfo(source="setup.py")
+    for key in ("name", "description", "license", "url"):
+        match = re.search(rf'\b{key}\s*=\s*["\']([^"\']+)["\']', content)
+        if match:
+            setattr(info, "repository" if key == "url" else key, match.group(1))
+    return info
+
+
+def read_manifests(
+    filenames: Iterable[str], read_text: Callable[[str], Optional[str]]
+) -> List[ManifestInfo]:
+    """Read every known manifest that a project has.
+
+    Args:
+        filenames: Names of the files in the project root
+        read_text: Returns a root file's content, or None if unreadable
+
+    Returns:
+        ManifestInfo for each present manifest, most authoritative first
+    """
+    present = set(filenames)
+    manifests = []
+    for filename, reader in MANIFEST_READERS.items():
+        if filename not in present:
+            continue
+        content = read_text(filename)
+        if content is not None:
+            manifests.append(reader(content))
+    return manifests
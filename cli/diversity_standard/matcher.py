@@ -0,0 +1,214 @@
+"""Precompiled matchers shared by every blueprint document lookup."""
+
+import re
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Kinds of filename match reported by FilenameMatcher
+MATCH_EXACT = "exact"
+MATCH_PARTIAL = "partial"
+
+# Substring rules only match between these (or at the ends of the name)
+_BOUNDARY_BEFORE = r"(?<![A-Za-z0-9])"
+_BOUNDARY_AFTER = r"(?![A-Za-z0-9])"
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton matching many labelled keywords in one pass.
+
+    Every keyword is tagged with the label (blueprint document name) it was
+    registered for, so a single scan of a text reports all labels whose
+    keywords occur in it. Matching is case-insensitive.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        """Compile the automaton.
+
+        Args:
+            keywords: Mapping of label to the keywords that identify it
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+
+        pending_out: List[Set[str]] = [set()]
+        for label, words in keywords.items():
+            for word in words:
+                word = word.lower()
+                if not word:
+                    continue
+                state = 0
+                for ch in word:
+                    next_state = self._goto[state].get(ch)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][ch] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        pending_out.append(set())
+                    state = next_state
+                pending_out[state].add(label)
+
+        # Breadth-first pass wires failure links and folds in their outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                pending_out[next_state] |= pending_out[self._fail[next_state]]
+
+        self._out = [frozenset(labels) for labels in pending_out]
+        self.labels: FrozenSet[str] = frozenset(keywords)
+
+    def search(self, text: str, targets: Optional[Set[str]] = None) -> Set[str]:
+        """Find every label whose keywords occur in a text.
+
+        Args:
+            text: Text to scan
+            targets: If given, stop as soon as all of these labels are found
+
+        Returns:
+            Set of matched labels
+        """
+        found: Set[str] = set()
+        self.feed(text.lower(), 0, found, targets)
+        return found
+
+    def search_chunks(
+        self, chunks: Iterable[str], targets: Optional[Set[str]] = None
+    ) -> Set[str]:
+        """Find every label whose keywords occur in a stream of text chunks.
+
+        The automaton state carries over between chunks, so keywords split
+        across a chunk boundary are still found without re-scanning overlap.
+
+        Args:
+            chunks: Text chunks in order, e.g. from utils.iter_text_chunks
+            targets: If given, stop reading as soon as all of these labels
+                    are found
+
+        Returns:
+            Set of matched labels
+        """
+        found: Set[str] = set()
+        state = 0
+        for chunk in chunks:
+            state = self.feed(chunk.lower(), state, found, targets)
+            if targets is not None and targets <= found:
+                break
+        return found
+
+    def feed(
+        self,
+        text: str,
+        state: int,
+        found: Set[str],
+        targets: Optional[Set[str]] = None,
+    ) -> int:
+        """Advance the automaton over already-lowercased text.
+
+        Args:
+            text: Lowercased text to scan
+            state: Automaton state to resume from (0 to start fresh)
+            found: Set that matched labels are added to
+            targets: If given, stop as soon as all of these labels are found
+
+        Returns:
+            Automaton state after the scan, for resuming on the next chunk
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+                if targets is not None and targets <= found:
+                    break
+        return state
+
+
+class FilenameMatcher:
+    """Matches file names against every document's filename rules at once.
+
+    Each rule matches a file name exactly, or as a substring that starts and
+    ends on a token boundary (anything but a letter or digit), so
+    "SECURITY.md" matches "docs-SECURITY.md" but "review.md" does not match
+    "preview.md". Matching is case-insensitive.
+    """
+
+    def __init__(self, filenames: Dict[str, Iterable[str]], case_sensitive: bool = False):
+        """Compile the matcher.
+
+        Args:
+            filenames: Mapping of label to its filename rules
+            case_sensitive: Compare names with their case preserved
+        """
+        self.case_sensitive = case_sensitive
+        self._exact: Dict[str, List[str]] = {}
+        self._partial: List[Tuple[str, "re.Pattern[str]"]] = []
+        alternatives: Set[str] = set()
+
+        for label, patterns in filenames.items():
+            seen: Set[str] = set()
+            for pattern in patterns:
+                pattern = self._normalize(pattern)
+                if not pattern or pattern in seen:
+                    continue
+                seen.add(pattern)
+                self._exact.setdefault(pattern, []).append(label)
+                escaped = re.escape(pattern)
+                alternatives.add(escaped)
+                self._partial.append(
+                    (label, re.compile(_BOUNDARY_BEFORE + escaped + _BOUNDARY_AFTER))
+                )
+
+        # One alternation rejects the (vast majority of) names that match no
+        # rule; the rare hits are then attributed rule by rule. Longest first,
+        # so a rule is never shadowed by one of its own prefixes.
+        self._any: Optional["re.Pattern[str]"] = None
+        if alternatives:
+            ordered = sorted(alternatives, key=lambda escaped: (-len(escaped), escaped))
+            self._any = re.compile(
+                _BOUNDARY_BEFORE + "(?:" + "|".join(ordered) + ")" + _BOUNDARY_AFTER
+            )
+        self.labels: FrozenSet[str] = frozenset(filenames)
+
+    def match(self, name: str) -> List[Tuple[str, str]]:
+        """Find every label whose filename rules match a file name.
+
+        Args:
+            name: File name (not a path)
+
+        Returns:
+            (label, kind) pairs in label registration order, where kind is
+            MATCH_EXACT or MATCH_PARTIAL
+        """
+        name = self._normalize(name)
+        exact = self._exact.get(name, [])
+        if self._any is None or (not exact and self._any.search(name) is None):
+            return [(label, MATCH_EXACT) for label in exact]
+
+        results: List[Tuple[str, str]] = []
+        seen: Set[str] = set()
+        for label, regex in self._partial:
+            if label in seen:
+                continue
+            if label in exact:
+                seen.add(label)
+                results.append((label, MATCH_EXACT))
+            elif regex.search(name):
+                seen.add(label)
+                results.append((label, MATCH_PARTIAL))
+        return results
+
+    def _normalize(self, name: str) -> str:
+        """Fold a name or rule to the case used for comparisons."""
+        return name if self.case_sensitive else name.lower()
@@ -0,0 +1,200 @@
+"""Memoised access to the files project auto-detection reads."""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from diversity_standard.manifests import ManifestInfo, read_manifests
+from diversity_standard.utils import (
+    FileEntry,
+    build_file_index,
+    find_file_by_name,
+    read_file_content,
+)
+
+# Where a README usually lives besides the root, in the order hosting sites
+# prefer them
+README_DIRECTORIES = [".github", "docs"]
+
+
+class ProjectMetadata:
+    """Reads each manifest of a project at most once per run.
+
+    Every auto-detection step asks this object for file contents instead of
+    reading them itself, so package.json, setup.py, the README and friends
+    are read and parsed once no matter how many fields they feed.
+    Manifest fields come from the most authoritative manifest declaring
+    them (see manifests.MANIFEST_READERS).
+    """
+
+    def __init__(self, root: Path, index: Optional[List[FileEntry]] = None):
+        """Initialize the metadata reader.
+
+        Args:
+            root: Project root directory
+            index: File index of the project, if one is already built. It is
+                  only consulted (or built) when the README is neither in the
+                  root nor in one of README_DIRECTORIES.
+        """
+        self.root = root
+        self._index = index
+        self._text: Dict[str, Optional[str]] = {}
+        self._readme: Optional[Path] = None
+        self._readme_searched = False
+        self._root_names: Optional[Set[str]] = None
+        self._manifests: Optional[List[ManifestInfo]] = None
+
+    def read_text(self, rel_path: str) -> Optional[str]:
+        """Read a project file once.
+
+        Args:
+            rel_path: POSIX-style path relative to the project root
+
+        Returns:
+            File content, or None if it is missing or not valid UTF-8
+        """
+        if rel_path not in self._text:
+            self._text[rel_path] = read_file_content(self.root / rel_path)
+        return self._text[rel_path]
+
+    def root_names(self) -> Set[str]:
+        """Return the names of the files in the project root, listed once."""
+        if self._root_names is None:
+            try:
+                with os.scandir(self.root) as it:
+                    self._root_names = {entry.name for entry in it if entry.is_file()}
+            except OSError:
+                self._root_names = set()
+        return self._root_names
+
+    def manifests(self) -> List[ManifestInfo]:
+        """Read the project's manifests, most authoritative first.
+
+        Only manifests present in the root are read, and only their readers'
+        parsers are imported.
+
+        Returns:
+            One ManifestInfo per manifest found
+        """
+        if self._manifests is None:
+            self._manifests = read_manifests(self.root_names(), self.read_text)
+        return self._manifests
+
+    def declared(self, key: str) -> Optional[str]:
+        """Return a field from the most authoritative manifest declaring it.
+
+        Args:
+            key: "name", "description", "license" or "repository"
+
+        Returns:
+            Field value, or None if no manifest declares it
+        """
+        for manifest in self.manifests():
+            value = getattr(manifest, key)
+            if value:
+                return value
+        return None
+
+    def declared_maintainers(self) -> List[Dict[str, str]]:
+        """Return the people listed by the most authoritative manifest listing any."""
+        for manifest in self.manifests():
+            if manifest.maintainers:
+                return list(manifest.maintainers)
+        return []
+
+    def readme(self) -> Optional[Path]:
+        """Locate the project README.
+
+        README.md (any case) is looked up in the root, .github/ and docs/
+        first; only if none has one is the file index searched.
+
+        Returns:
+            Path to the README, or None
+        """
+        if self._readme_searched:
+            return self._readme
+        self._readme_searched = True
+
+        self._readme = self.root_readme()
+        if self._readme is not None:
+            return self._readme
+        for directory in README_DIRECTORIES:
+            try:
+                with os.scandir(self.root / directory) as it:
+                    for entry in it:
+                        if entry.name.lower() == "readme.md" and entry.is_file():
+                            self._readme = Path(entry.path)
+                            return self._readme
+            except OSError:
+                continue
+
+        if self._index is None:
+            self._index = build_file_index(self.root)
+        self._readme = find_file_by_name(self.root, "README.md", index=self._index)
+        return self._readme
+
+    def root_readme(self) -> Optional[Path]:
+        """Locate README.md (any case) in the project root only.
+
+        Returns:
+            Path to the README, or None
+        """
+        for name in sorted(self.root_names()):
+            if name.lower() == "readme.md":
+                return self.root / name
+        return None
+
+    def readme_text(self, root_only: bool = False) -> Optional[str]:
+        """Return the README's content, read once.
+
+        Args:
+            root_only: Only read a README in the project root, never one
+                      from .github/, docs/ or a nested package
+        """
+        readme = self.root_readme() if root_only else self.readme()
+        if readme is None:
+            return None
+        return self.read_text(readme.relative_to(self.root).as_posix())
+
+    def project_name(self) -> Optional[str]:
+        """Extract the project name from manifests, or the directory name.
+
+        Returns:
+            Project name
+        """
+        name = self.declared("name")
+        if name:
+            return name
+
+        # Fall back to directory name
+        return self.root.name
+
+    def repository_url(self) -> Optional[str]:
+        """Extract the repository URL from manifests, git config or README.
+
+        Returns:
+            Repository URL or None
+        """
+        # Try manifests
+        repo = self.declared("repository")
+        if repo:
+            return repo
+
+        # Try .git/config
+        content = self.read_text(".git/config")
+        if content:
+            match = re.search(r'url\s*=\s*(.+)', content)
+            if match:
+                return match.group(1).strip()
+
+        # Try README for GitHub links
+        content = self.readme_text()
+        if content:
+            match = re.search(
+                r'https?://github\.com/[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+', content
+            )
+            if match:
+                return match.group(0)
+
+        return None
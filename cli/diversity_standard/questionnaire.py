@@ -1,6 +1,5 @@
 """Interactive questionnaire system for personalizing documents."""
 
-import yaml
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -11,10 +10,16 @@ from rich.prompt import Confirm, Prompt
 from rich.table import Table
 
 from diversity_standard.config import ProjectConfig
+from diversity_standard.contributors import DEFAULT_WINDOW_DAYS
 from diversity_standard.inspector import InspectionResult
+from diversity_standard.registry import UNKNOWN_CATEGORY, get_registry
+from diversity_standard.yaml_cache import load_yaml
 
 console = Console()
 
+# Active contributors listed when asking about maintainers
+ACTIVE_CONTRIBUTORS_SHOWN = 10
+
 
 @dataclass
 class Question:
@@ -50,6 +55,7 @@ class Questionnaire:
         if questions_file is None:
             questions_file = Path(__file__).parent / "questions.yml"
         self.questions_file = questions_file
+        self.registry = get_registry()
         self.questions = self._load_questions()
         self.answers: Dict[str, Any] = {}
 
@@ -62,8 +68,7 @@ class Questionnaire:
         if not self.questions_file.exists():
             return []
 
-        with open(self.questions_file) as f:
-            data = yaml.safe_load(f)
+        data = load_yaml(self.questions_file)
 
         questions = []
         for q_data in data.get("questions", []):
@@ -219,6 +224,23 @@ class Questionnaire:
             }
             if question.id in config_key_map:
                 default = config.get(config_key_map[question.id])
+            if question.id == "license_type" and config.license_match:
+                match = config.license_match
+                console.print(
+                    f"[dim]Detected {match.spdx_id} in {match.path.name} "
+                    f"({match.score:.0%} match)[/dim]"
+                )
+
+        # Maintainers suggested from git history: show who they came from
+        if question.id == "maintainer_count" and config.contributors:
+            default = len(config.get("maintainers", [])) or default
+            window = config.get("contributors.window_days", DEFAULT_WINDOW_DAYS)
+            console.print(f"[dim]Active contributors in the last {window} days:[/dim]")
+            for contributor in config.contributors[:ACTIVE_CONTRIBUTORS_SHOWN]:
+                console.print(
+                    f"[dim]  {contributor.name} <{contributor.email}> "
+                    f"({contributor.commits} commits)[/dim]"
+                )
 
         # Ask based on question type
         if question.type == "yes_no":
@@ -253,6 +275,9 @@ class Questionnaire:
             else:
                 # Single-select: allow number or option text
                 default_idx = default if isinstance(default, int) else (default if default is None else None)
+                if isinstance(default, str) and default in question.options:
+                    # Auto-detected value, e.g. the license identifier
+                    default_idx = question.options.index(default)
                 if default_idx is None and question.options:
                     default_idx = 0
                 
@@ -360,21 +385,18 @@ class Questionnaire:
         if not missing_documents:
             return []
 
-        # Load document mapping to get categories
-        import yaml
-
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        with open(mapping_file) as f:
-            mapping = yaml.safe_load(f)
-
-        # Group by category
+        # Group by category, in mapping order
+        missing = set(missing_documents)
         by_category: Dict[str, List[str]] = {}
-        for doc_name in missing_documents:
-            doc_config = mapping.get("documents", {}).get(doc_name, {})
-            category = doc_config.get("category", "Unknown")
-            if category not in by_category:
-                by_category[category] = []
-            by_category[category].append(doc_name)
+        for category, doc_names in self.registry.by_category.items():
+            docs = [doc_name for doc_name in doc_names if doc_name in missing]
+            if docs:
+                by_category[category] = docs
+        unknown = [
+            doc_name for doc_name in missing_documents if doc_name not in self.registry.categories
+        ]
+        if unknown:
+            by_category.setdefault(UNKNOWN_CATEGORY, []).extend(unknown)
 
         # Show selection interface
         console.print("Select which documents to generate:\n")
@@ -398,14 +420,7 @@ class Questionnaire:
         Returns:
             Category name
         """
-        import yaml
-
-        mapping_file = Path(__file__).parent / "document_mapping.yml"
-        with open(mapping_file) as f:
-            mapping = yaml.safe_load(f)
-
-        doc_config = mapping.get("documents", {}).get(doc_name, {})
-        return doc_config.get("category", "Unknown")
+        return self.registry.category(doc_name)
 
     def get_answers(self) -> Dict[str, Any]:
         """Get collected answers.
@@ -0,0 +1,121 @@
+"""The document mapping and the views every module derives from it."""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional
+
+from diversity_standard.matcher import FilenameMatcher, KeywordAutomaton
+from diversity_standard.yaml_cache import load_yaml
+
+MAPPING_FILE = Path(__file__).parent / "document_mapping.yml"
+
+UNKNOWN_CATEGORY = "Unknown"
+DEFAULT_SKIP_REASON = "Skipped based on questionnaire"
+
+
+@dataclass(frozen=True)
+class SkipRule:
+    """A document that is only wanted when a yes/no answer is true."""
+
+    blueprint_name: str
+    answer: str  # Questionnaire answer id
+    reason: str
+
+    def applies(self, answers: Dict[str, Any]) -> bool:
+        """Check whether the answers make the document unnecessary."""
+        return not bool(answers.get(self.answer, False))
+
+
+SKIP_RULES = [
+    SkipRule("FUNDING.md", "has_funding", "No funding (has_funding: false)"),
+    SkipRule("MEETINGS.md", "has_meetings", "No meetings (has_meetings: false)"),
+    SkipRule(
+        "LOCALIZATION.md",
+        "supports_multiple_languages",
+        "No multi-language support (supports_multiple_languages: false)",
+    ),
+    SkipRule("ADOPTERS.md", "tracks_adopters", "Not tracking adopters (tracks_adopters: false)"),
+]
+
+
+class MappingRegistry:
+    """Document mapping with precomputed lookup indexes.
+
+    The registry is shared by every module, so the mapping and documents
+    are exposed as read-only views. Filename and keyword lookups go through
+    the compiled filename_matcher and keyword_automaton.
+
+    Use get_registry() to share one instance per process instead of
+    creating registries directly.
+    """
+
+    def __init__(self, mapping: Dict[str, Any]):
+        """Build the indexes.
+
+        Args:
+            mapping: Parsed document_mapping.yml
+        """
+        documents = {
+            name: MappingProxyType(config)
+            for name, config in (mapping.get("documents") or {}).items()
+        }
+        self.documents: Mapping[str, Mapping[str, Any]] = MappingProxyType(documents)
+        self.mapping: Mapping[str, Any] = MappingProxyType(dict(mapping, documents=self.documents))
+        self.categories: Dict[str, str] = {}
+        self.by_category: Dict[str, List[str]] = {}
+        for name, config in self.documents.items():
+            category = config.get("category", UNKNOWN_CATEGORY)
+            self.categories[name] = category
+            self.by_category.setdefault(category, []).append(name)
+        self.skip_rules: Dict[str, SkipRule] = {rule.blueprint_name: rule for rule in SKIP_RULES}
+        self.filename_matcher = FilenameMatcher(
+            {name: config.get("filenames", []) for name, config in self.documents.items()}
+        )
+        self.keyword_automaton = KeywordAutomaton(
+            {name: config.get("content_keywords", []) for name, config in self.documents.items()}
+        )
+
+    def category(self, blueprint_name: str) -> str:
+        """Return a document's category, "Unknown" if it is not mapped."""
+        return self.categories.get(blueprint_name, UNKNOWN_CATEGORY)
+
+    def is_skipped(self, blueprint_name: str, answers: Dict[str, Any]) -> bool:
+        """Check if a document is unnecessary given the questionnaire answers.
+
+        Args:
+            blueprint_name: Document name
+            answers: Questionnaire answers
+
+        Returns:
+            True if the document should be skipped
+        """
+        rule = self.skip_rules.get(blueprint_name)
+        return rule is not None and rule.applies(answers)
+
+    def skip_reason(self, blueprint_name: str) -> str:
+        """Explain why a skipped document is not needed."""
+        rule = self.skip_rules.get(blueprint_name)
+        return rule.reason if rule else DEFAULT_SKIP_REASON
+
+
+def get_registry(mapping_file: Optional[Path] = None) -> MappingRegistry:
+    """Return the process-wide registry of a mapping file.
+
+    Args:
+        mapping_file: Document mapping to load. If None, the bundled
+                     document_mapping.yml is used.
+
+    Returns:
+        Registry built on first use; empty if the file does not exist
+    """
+    return _load_registry(mapping_file or MAPPING_FILE)
+
+
+@lru_cache(maxsize=None)
+def _load_registry(mapping_file: Path) -> MappingRegistry:
+    """Build the registry of a mapping file, once per path."""
+    if mapping_file.exists():
+        return MappingRegistry(load_yaml(mapping_file) or {})
+    return MappingRegistry({"documents": {}})
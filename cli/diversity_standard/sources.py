@@ -0,0 +1,350 @@
+"""Alternative ways of listing a project's files than walking the tree."""
+
+import io
+import os
+import stat
+import subprocess
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from diversity_standard.utils import DirectoryItem, FileEntry, IgnoreRules, is_excluded
+
+# Values accepted by ProjectInspector(source=...) and inspect --source
+SOURCE_AUTO = "auto"
+SOURCE_GIT_INDEX = "git-index"
+SOURCE_FILESYSTEM = "filesystem"
+SOURCES = [SOURCE_AUTO, SOURCE_GIT_INDEX, SOURCE_FILESYSTEM]
+
+
+def walk_order_key(rel_path: str) -> List[Tuple[int, str]]:
+    """Sort key that orders paths like utils.walk_project_files yields them.
+
+    Within each directory, files come before subdirectories and names sort
+    alphabetically, so listings from git match a depth-first walk.
+
+    Args:
+        rel_path: POSIX-style relative path
+
+    Returns:
+        Comparable key
+    """
+    parts = rel_path.split("/")
+    key = [(1, part) for part in parts[:-1]]
+    key.append((0, parts[-1]))
+    return key
+
+
+def list_git_index_files(
+    root: Path,
+    ignore: Optional[IgnoreRules] = None,
+    list_directory: Optional[Callable[[Path, str], List[DirectoryItem]]] = None,
+) -> Optional[List[FileEntry]]:
+    """List a git work tree's files from the index with one git call.
+
+    Tracked files come from the index and untracked, non-ignored files from
+    git's own scan (``git ls-files --cached --others --exclude-standard``),
+    so nothing under .gitignore'd directories is ever visited. Files that
+    were deleted from the work tree are dropped.
+
+    Args:
+        root: Work tree root (or a directory inside one)
+        ignore: Ignore rules for the deny list and inspect.exclude. If None,
+                IgnoreRules.for_project(root) is used.
+        list_directory: Called with (directory, relative prefix) to get the
+                        stat data of the listed files' directories, see
+                        walk_project_files. If None, every file is stat'ed.
+
+    Returns:
+        List of FileEntry objects in walk order, or None if root is not
+        inside a git work tree or git is unavailable
+    """
+    if ignore is None:
+        ignore = IgnoreRules.for_project(root)
+
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(root), "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except OSError:
+        return None
+    if completed.returncode != 0:
+        return None
+
+    rel_paths = {os.fsdecode(raw) for raw in completed.stdout.split(b"\0") if raw}
+    verdicts: Dict[str, bool] = {}
+    listings: Dict[str, Dict[str, DirectoryItem]] = {}
+    entries: List[FileEntry] = []
+    for rel_path in sorted(rel_paths, key=walk_order_key):
+        if is_excluded(rel_path, ignore, verdicts):
+            continue
+        path = root / rel_path
+        prefix, _, name = rel_path.rpartition("/")
+        if list_directory is not None:
+            # One (possibly cached) listing per directory instead of a stat
+            # per file
+            listing = listings.get(prefix)
+            if listing is None:
+                try:
+                    items = list_directory(path.parent, prefix + "/" if prefix else "")
+                except OSError:
+                    items = []
+                listing = listings[prefix] = {item[0]: item for item in items if not item[1]}
+            item = listing.get(name)
+            if item is None:
+                continue
+            size, mtime_ns, inode = item[2:]
+        else:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            size, mtime_ns, inode = st.st_size, st.st_mtime_ns, st.st_ino
+        entries.append(
+            FileEntry(
+                path=path,
+                rel_path=rel_path,
+                name=name,
+                size=size,
+                mtime_ns=mtime_ns,
+                inode=inode,
+            )
+        )
+    return entries
+
+
+# ls-tree modes of entries the working tree would show as regular files
+_REGULAR_FILE_MODES = {"100644", "100755"}
+
+
+def parse_ls_tree(output: bytes) -> Iterator[Tuple[str, str, str, str]]:
+    """Parse the output of ``git ls-tree -z``.
+
+    Args:
+        output: Raw NUL-separated output
+
+    Yields:
+        (mode, type, object id, path) for each entry
+    """
+    for record in output.split(b"\0"):
+        if not record:
+            continue
+        info, _, raw_path = record.partition(b"\t")
+        mode, object_type, object_id = info.decode("ascii").split()[:3]
+        yield mode, object_type, object_id, os.fsdecode(raw_path)
+
+
+# Bytes read at a time when dropping the part of an object beyond a cap
+_SKIP_CHUNK_BYTES = 1024 * 1024
+
+
+class GitBlobReader:
+    """Reads git objects through one long-lived ``git cat-file --batch``.
+
+    Starting git once and streaming requests over its stdin avoids a process
+    per blob. Reads are serialised, so the reader can be shared by threads.
+    """
+
+    def __init__(self, root: Path):
+        """Start the cat-file process.
+
+        Args:
+            root: Directory inside the repository
+
+        Raises:
+            OSError: If git cannot be started
+        """
+        self._process = subprocess.Popen(
+            ["git", "-C", str(root), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lock = threading.Lock()
+
+    def read(self, object_id: str, max_bytes: Optional[int] = None) -> bytes:
+        """Read one object's content.
+
+        Args:
+            object_id: Object name (hash, or anything git rev-parse accepts)
+            max_bytes: Return at most this many bytes. If None, read it all.
+
+        Returns:
+            Object content
+
+        Raises:
+            OSError: If the object does not exist or git has exited
+        """
+        return self.read_sized(object_id, max_bytes)[0]
+
+    def read_sized(self, object_id: str, max_bytes: Optional[int] = None) -> Tuple[bytes, int]:
+        """Read the start of one object's content, and its full size.
+
+        Bytes beyond max_bytes are read from git in chunks and dropped, so
+        a large blob never has to fit in memory.
+
+        Args:
+            object_id: Object name (hash, or anything git rev-parse accepts)
+            max_bytes: Return at most this many bytes. If None, read it all.
+
+        Returns:
+            (content, size of the whole object)
+
+        Raises:
+            OSError: If the object does not exist or git has exited
+        """
+        stdin = self._process.stdin
+        stdout = self._process.stdout
+        assert stdin is not None and stdout is not None
+        with self._lock:
+            try:
+                stdin.write(object_id.encode("utf-8") + b"\n")
+                stdin.flush()
+            except (BrokenPipeError, ValueError) as e:
+                raise OSError(f"git cat-file is not running: {e}") from e
+            header = stdout.readline().split()
+            if len(header) != 3:
+                raise OSError(f"Cannot read git object {object_id}")
+            size = int(header[2])
+            kept = size if max_bytes is None else min(size, max_bytes)
+            content = stdout.read(kept)
+            # The rest of the object, then its trailing newline
+            remaining = size - kept + 1
+            while remaining > 0:
+                skipped = len(stdout.read(min(remaining, _SKIP_CHUNK_BYTES)))
+                if not skipped:
+                    raise OSError(f"git cat-file exited while reading {object_id}")
+                remaining -= skipped
+        return content, size
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        if self._process.stdin:
+            self._process.stdin.close()
+        self._process.wait()
+        if self._process.stdout:
+            self._process.stdout.close()
+
+    def __enter__(self) -> "GitBlobReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class GitRevisionSource:
+    """Lists and reads a project's files as of a git revision.
+
+    The tree is listed with one ``git ls-tree -r`` and blobs are fetched
+    through a GitBlobReader, so nothing is checked out or written to disk.
+    Entries get paths under the project root as if the revision were
+    checked out there.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        rev: str,
+        ignore: Optional[IgnoreRules] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """Prepare to read a revision.
+
+        Args:
+            root: Project root (the repository root or a directory inside it)
+            rev: Any revision git accepts, e.g. a tag, branch or commit hash
+            ignore: Ignore rules for the deny list and inspect.exclude. If
+                    None, IgnoreRules.for_project(root) is used.
+            max_bytes: Only keep this many bytes of each opened blob. If
+                      None, blobs are read whole.
+        """
+        self.root = root
+        self.rev = rev
+        self.ignore = ignore if ignore is not None else IgnoreRules.for_project(root)
+        self.max_bytes = max_bytes
+        self._blobs: Dict[str, str] = {}
+        self._reader: Optional[GitBlobReader] = None
+        self._lock = threading.Lock()
+
+    def list_files(self) -> List[FileEntry]:
+        """List the revision's regular files that are not ignored.
+
+        Blob sizes are not asked for: with ``--long`` git would read the
+        header of every blob in the tree. An entry's size is -1 until open()
+        reads it.
+
+        Returns:
+            FileEntry objects in walk order (mtime and inode are 0)
+
+        Raises:
+            OSError: If git is unavailable or the revision does not exist
+        """
+        try:
+            completed = subprocess.run(
+                ["git", "-C", str(self.root), "ls-tree", "-r", "-z", self.rev],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        except OSError as e:
+            raise OSError(f"Cannot run git: {e}") from e
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip()
+            raise OSError(f"Cannot list revision {self.rev}: {message}")
+
+        verdicts: Dict[str, bool] = {}
+        entries: List[FileEntry] = []
+        for mode, _, object_id, rel_path in parse_ls_tree(completed.stdout):
+            if mode not in _REGULAR_FILE_MODES:
+                continue
+            if is_excluded(rel_path, self.ignore, verdicts):
+                continue
+            self._blobs[rel_path] = object_id
+            entries.append(
+                FileEntry(
+                    path=self.root / rel_path,
+                    rel_path=rel_path,
+                    name=rel_path.rsplit("/", 1)[-1],
+                    size=-1,
+                    mtime_ns=0,
+                )
+            )
+        entries.sort(key=lambda entry: walk_order_key(entry.rel_path))
+        return entries
+
+    def open(self, entry: FileEntry) -> BinaryIO:
+        """Open a listed file's blob for reading, filling in its size.
+
+        Only the first max_bytes of the blob are kept in memory.
+
+        Args:
+            entry: Entry returned by list_files
+
+        Returns:
+            Binary stream of the blob's content
+
+        Raises:
+            OSError: If the blob cannot be read
+        """
+        with self._lock:
+            if self._reader is None:
+                self._reader = GitBlobReader(self.root)
+        content, entry.size = self._reader.read_sized(self._blobs[entry.rel_path], self.max_bytes)
+        return io.BytesIO(content)
+
+    def close(self) -> None:
+        """Stop the cat-file process if one was started."""
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def __enter__(self) -> "GitRevisionSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -1,13 +1,392 @@
 """Utility functions for the diversity standard CLI."""
 
+import codecs
 import json
+import os
 import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from diversity_standard.matcher import FilenameMatcher
+
+
+# Directories and files that never hold project documentation. Patterns use
+# .gitignore syntax and can be re-included with "!pattern" in inspect.exclude.
+DEFAULT_EXCLUDES = [
+    ".git/",
+    ".hg/",
+    ".svn/",
+    "node_modules/",
+    "bower_components/",
+    "vendor/",
+    "third_party/",
+    "venv/",
+    ".venv/",
+    "site-packages/",
+    "__pycache__/",
+    ".tox/",
+    ".nox/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".ruff_cache/",
+    ".eggs/",
+    "*.egg-info/",
+    "build/",
+    "dist/",
+    "target/",
+    ".diversity-standard-cache/",
+]
+
+# Streaming reads: chunk size, and how much of the first chunk is checked
+# for NUL bytes to tell binary files apart from text
+CHUNK_SIZE = 64 * 1024
+BINARY_SNIFF_BYTES = 8000
+
+IgnoreRule = Tuple["re.Pattern[str]", bool, bool]  # (regex, negated, directory only)
+DirectoryItem = Tuple[str, bool, int, int, int]  # (name, is_dir, size, mtime_ns, inode)
+# (directory, prefix relative to the root, (prefix, rules) of enclosing .gitignore files)
+WalkFrame = Tuple[Path, str, Tuple[Tuple[str, List[IgnoreRule]], ...]]
+
+
+@dataclass
+class FileEntry:
+    """A regular file discovered while indexing a project tree."""
+
+    path: Path
+    rel_path: str  # POSIX-style path relative to the indexed root
+    name: str
+    size: int
+    mtime_ns: int
+    inode: int = 0
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a .gitignore glob into a regular expression.
+
+    Args:
+        pattern: Glob with leading "!" and trailing "/" already removed
+
+    Returns:
+        Regular expression source matching a relative POSIX path
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i : i + 2] == "**":
+                if pattern[i + 2 : i + 3] == "/":
+                    parts.append("(?:.*/)?")
+                    i += 3
+                else:
+                    parts.append(".*")
+                    i += 2
+                continue
+            parts.append("[^/]*")
+        elif c == "?":
+            parts.append("[^/]")
+        elif c == "[":
+            close = pattern.find("]", i + 2)
+            if close == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : close]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append("[" + body.replace("\\", "\\\\") + "]")
+                i = close
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return "".join(parts)
+
+
+def parse_ignore_patterns(lines: Iterable[str]) -> List[IgnoreRule]:
+    """Compile .gitignore-style lines into ignore rules.
+
+    Args:
+        lines: Pattern lines (comments and blank lines are skipped)
+
+    Returns:
+        List of (regex, negated, directory_only) tuples in file order
+    """
+    rules: List[IgnoreRule] = []
+    for line in lines:
+        line = line.rstrip("\n").rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to its base directory
+        anchored = "/" in line
+        line = line.lstrip("/")
+        regex = _glob_to_regex(line)
+        if not anchored:
+            regex = "(?:.*/)?" + regex
+        rules.append((re.compile(regex, re.DOTALL), negated, directory_only))
+    return rules
+
+
+class IgnoreRules:
+    """Decides which paths a project walk should skip.
+
+    Rules are evaluated with .gitignore semantics: the last matching pattern
+    wins and "!" re-includes a path. Precedence, lowest first, is the built-in
+    DEFAULT_EXCLUDES, .git/info/exclude, .gitignore files (deeper files win)
+    and finally the project's inspect.exclude setting.
+    """
+
+    def __init__(
+        self,
+        base: Optional[List[IgnoreRule]] = None,
+        overrides: Optional[List[IgnoreRule]] = None,
+    ):
+        """Initialize ignore rules.
+
+        Args:
+            base: Rules applying from the project root (defaults, info/exclude)
+            overrides: Rules that take precedence over any .gitignore
+        """
+        self.base = base or []
+        self.overrides = overrides or []
+
+    @classmethod
+    def for_project(
+        cls, root: Path, exclude: Optional[List[str]] = None
+    ) -> "IgnoreRules":
+        """Build the rules for a project root.
+
+        Args:
+            root: Project root directory
+            exclude: Extra patterns, typically inspect.exclude from config
+
+        Returns:
+            IgnoreRules instance
+        """
+        base = parse_ignore_patterns(DEFAULT_EXCLUDES)
+        info_exclude = read_file_content(root / ".git" / "info" / "exclude")
+        if info_exclude:
+            base.extend(parse_ignore_patterns(info_exclude.splitlines()))
+        return cls(base, parse_ignore_patterns(exclude or []))
+
+    def is_ignored(
+        self,
+        rel_path: str,
+        is_dir: bool,
+        nested: Sequence[Tuple[str, List[IgnoreRule]]] = (),
+    ) -> bool:
+        """Check whether a path is ignored.
+
+        Args:
+            rel_path: POSIX-style path relative to the project root
+            is_dir: Whether the path is a directory
+            nested: (directory prefix, rules) pairs from .gitignore files,
+                    shallowest first
+
+        Returns:
+            True if the path should be skipped
+        """
+        layers = [("", self.overrides)]
+        layers.extend(reversed(nested))
+        layers.append(("", self.base))
+        for prefix, rules in layers:
+            if prefix:
+                if not rel_path.startswith(prefix):
+                    continue
+                subject = rel_path[len(prefix) :]
+            else:
+                subject = rel_path
+            for regex, negated, directory_only in reversed(rules):
+                if directory_only and not is_dir:
+                    continue
+                if regex.fullmatch(subject):
+                    return not negated
+        return False
+
+
+def is_excluded(
+    rel_path: str, ignore: IgnoreRules, verdicts: Dict[str, bool]
+) -> bool:
+    """Check a path and each of its parent directories against ignore rules.
+
+    For flat listings (git, archives) that are not produced by a walk that
+    prunes ignored directories before descending.
+
+    Args:
+        rel_path: POSIX-style path relative to the project root
+        ignore: Ignore rules (deny list and inspect.exclude)
+        verdicts: Memo of directory prefix to ignored flag, shared per run
+
+    Returns:
+        True if the path or any parent directory is ignored
+    """
+    prefix_end = rel_path.find("/")
+    while prefix_end != -1:
+        directory = rel_path[:prefix_end]
+        ignored = verdicts.get(directory)
+        if ignored is None:
+            ignored = verdicts[directory] = ignore.is_ignored(directory, True)
+        if ignored:
+            return True
+        prefix_end = rel_path.find("/", prefix_end + 1)
+    return ignore.is_ignored(rel_path, False)
+
+
+def scan_directory(directory: Path) -> List[DirectoryItem]:
+    """List a directory's files and subdirectories with their stat data.
+
+    Args:
+        directory: Directory to list
+
+    Returns:
+        List of (name, is_dir, size, mtime_ns, inode) tuples in scandir
+        order. Entries that are neither regular files nor real directories
+        are left out.
+
+    Raises:
+        OSError: If the directory cannot be read
+    """
+    items: List[DirectoryItem] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    items.append((entry.name, True, 0, 0, entry.inode()))
+                elif entry.is_file():
+                    stat = entry.stat()
+                    items.append(
+                        (entry.name, False, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+                    )
+            except OSError:
+                continue
+    return items
+
+
+def walk_project_files(
+    root: Path,
+    ignore: Optional[IgnoreRules] = None,
+    list_directory: Optional[Callable[[Path, str], List[DirectoryItem]]] = None,
+) -> Iterator[FileEntry]:
+    """Walk a project tree, pruning ignored directories before descending.
+
+    Within each directory, files come first and then each subdirectory
+    depth-first, both sorted by name. The order does not depend on the file
+    system, so it matches sources.walk_order_key and every listing source
+    reports the same first match. Symlinked directories are not descended
+    into.
+
+    Args:
+        root: Root directory to walk
+        ignore: Ignore rules. If None, IgnoreRules.for_project(root) is used.
+        list_directory: Called with (directory, relative prefix) to list a
+                        directory. Defaults to scan_directory; the inspection
+                        cache passes its own to reuse unchanged listings.
+
+    Yields:
+        FileEntry for every file that is not ignored
+    """
+    if ignore is None:
+        ignore = IgnoreRules.for_project(root)
+
+    stack: List[WalkFrame] = [(root, "", ())]
+    while stack:
+        frame = stack.pop()
+        directory, prefix, _ = frame
+        try:
+            if list_directory is None:
+                items = scan_directory(directory)
+            else:
+                items = list_directory(directory, prefix)
+        except OSError:
+            continue
+
+        files, subdirs = filter_directory(frame, items, ignore)
+        yield from files
+        # Reversed so the first subdirectory is popped (and walked) first
+        stack.extend(reversed(subdirs))
+
+
+def filter_directory(
+    frame: WalkFrame, items: List[DirectoryItem], ignore: IgnoreRules
+) -> Tuple[List[FileEntry], List[WalkFrame]]:
+    """Apply ignore rules to one listed directory of a project walk.
+
+    Args:
+        frame: (directory, relative prefix, nested .gitignore rules) of the
+               directory, as produced for its parent
+        items: Directory listing from scan_directory
+        ignore: Ignore rules of the project
+
+    Returns:
+        (files, subdirectories): the directory's files that are not ignored,
+        and a frame for each subdirectory to descend into, both sorted by name
+    """
+    directory, prefix, nested = frame
+    if any(not is_dir and name == ".gitignore" for name, is_dir, *_ in items):
+        gitignore = read_file_content(directory / ".gitignore")
+        if gitignore:
+            rules = parse_ignore_patterns(gitignore.splitlines())
+            if rules:
+                nested = nested + ((prefix, rules),)
+
+    files: List[FileEntry] = []
+    subdirs: List[WalkFrame] = []
+    for name, is_dir, size, mtime_ns, inode in sorted(items, key=lambda item: item[0]):
+        rel_path = prefix + name
+        if ignore.is_ignored(rel_path, is_dir, nested):
+            continue
+        if is_dir:
+            subdirs.append((directory / name, rel_path + "/", nested))
+            continue
+        files.append(
+            FileEntry(
+                path=directory / name,
+                rel_path=rel_path,
+                name=name,
+                size=size,
+                mtime_ns=mtime_ns,
+                inode=inode,
+            )
+        )
+    return files, subdirs
+
+
+def build_file_index(
+    root: Path,
+    ignore: Optional[IgnoreRules] = None,
+    list_directory: Optional[Callable[[Path, str], List[DirectoryItem]]] = None,
+) -> List[FileEntry]:
+    """Index every non-ignored file under a directory in a single walk.
+
+    Args:
+        root: Root directory to index
+        ignore: Ignore rules. If None, IgnoreRules.for_project(root) is used.
+        list_directory: Directory lister, see walk_project_files
+
+    Returns:
+        List of FileEntry objects in walk order
+    """
+    return list(walk_project_files(root, ignore, list_directory))
 
 
 def find_file_by_name(
-    root: Path, filename: str, case_sensitive: bool = False
+    root: Path,
+    filename: str,
+    case_sensitive: bool = False,
+    index: Optional[List[FileEntry]] = None,
 ) -> Optional[Path]:
     """Find a file by name in the directory tree.
 
@@ -15,48 +394,52 @@ def find_file_by_name(
         root: Root directory to search
         filename: Filename to search for
         case_sensitive: Whether to do case-sensitive matching
+        index: Prebuilt file index of root. If None, the tree is walked
+               skipping ignored paths.
 
     Returns:
         Path to the file if found, None otherwise
     """
     pattern = filename if case_sensitive else filename.lower()
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        if case_sensitive:
-            if path.name == filename:
-                return path
-        else:
-            if path.name.lower() == pattern:
-                return path
+    if index is not None:
+        for entry in index:
+            name = entry.name if case_sensitive else entry.name.lower()
+            if name == pattern:
+                return entry.path
+        return None
+
+    for entry in walk_project_files(root):
+        name = entry.name if case_sensitive else entry.name.lower()
+        if name == pattern:
+            return entry.path
     return None
 
 
 def find_files_by_patterns(
-    root: Path, patterns: list[str], case_sensitive: bool = False
+    root: Path,
+    patterns: list[str],
+    case_sensitive: bool = False,
+    index: Optional[List[FileEntry]] = None,
 ) -> list[Path]:
     """Find files matching any of the given patterns.
 
+    A pattern matches a file name exactly, or as a substring delimited by
+    token boundaries (see matcher.FilenameMatcher).
+
     Args:
         root: Root directory to search
         patterns: List of filename patterns to match
         case_sensitive: Whether to do case-sensitive matching
+        index: Prebuilt file index of root. If None, the tree is walked
+               skipping ignored paths.
 
     Returns:
         List of matching file paths
     """
-    matches = []
-    patterns_lower = [p.lower() for p in patterns] if not case_sensitive else patterns
-
-    for path in root.rglob("*"):
-        if not path.is_file():
-            continue
-        name = path.name if case_sensitive else path.name.lower()
-        for pattern in patterns_lower:
-            if pattern in name or name == pattern:
-                matches.append(path)
-                break
-    return matches
+    matcher = FilenameMatcher({"": patterns}, case_sensitive=case_sensitive)
+    if index is None:
+        index = build_file_index(root)
+    return [entry.path for entry in index if matcher.match(entry.name)]
 
 
 def read_json_file(path: Path) -> Optional[Dict[str, Any]]:
@@ -83,16 +466,79 @@ def read_file_content(path: Path) -> Optional[str]:
         path: Path to file
 
     Returns:
-        File content or None if file doesn't exist
+        File content or None if file doesn't exist or is not valid UTF-8
     """
     try:
         if path.exists():
             return path.read_text(encoding="utf-8")
-    except IOError:
+    except (IOError, UnicodeDecodeError):
         pass
     return None
 
 
+def iter_text_chunks(
+    path: Path, chunk_size: int = CHUNK_SIZE, max_bytes: Optional[int] = None
+) -> Iterator[str]:
+    """Stream a text file as decoded chunks without loading it whole.
+
+    See iter_stream_chunks for the decoding rules.
+
+    Args:
+        path: Path to file
+        chunk_size: Bytes read per chunk
+        max_bytes: Stop after this many bytes. If None, read the whole file.
+
+    Yields:
+        Decoded text chunks
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    with open(path, "rb") as f:
+        yield from iter_stream_chunks(f, chunk_size, max_bytes)
+
+
+def iter_stream_chunks(
+    stream: BinaryIO, chunk_size: int = CHUNK_SIZE, max_bytes: Optional[int] = None
+) -> Iterator[str]:
+    """Decode a binary stream into text chunks without loading it whole.
+
+    The first block is sniffed for NUL bytes; binary content yields nothing.
+    Invalid UTF-8 is replaced rather than raising, and multi-byte characters
+    split across blocks are decoded correctly.
+
+    Args:
+        stream: Readable binary stream, e.g. an open file or archive member
+        chunk_size: Bytes read per chunk
+        max_bytes: Stop after this many bytes. If None, read to the end.
+
+    Yields:
+        Decoded text chunks
+
+    Raises:
+        OSError: If the stream cannot be read
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    remaining = max_bytes
+    first_block = True
+    while remaining is None or remaining > 0:
+        block = stream.read(chunk_size if remaining is None else min(chunk_size, remaining))
+        if not block:
+            break
+        if first_block:
+            first_block = False
+            if b"\0" in block[:BINARY_SNIFF_BYTES]:
+                return
+        if remaining is not None:
+            remaining -= len(block)
+        text = decoder.decode(block)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
 def contains_keywords(content: str, keywords: list[str], case_sensitive: bool = False) -> bool:
     """Check if content contains any of the given keywords.
 
@@ -114,6 +560,18 @@ def contains_keywords(content: str, keywords: list[str], case_sensitive: bool =
     return False
 
 
+def user_cache_dir() -> Path:
+    """Return the per-user cache directory of the tool.
+
+    Honours XDG_CACHE_HOME and defaults to ~/.cache/diversity-standard.
+
+    Returns:
+        Cache directory (not created)
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "diversity-standard"
+
+
 def extract_project_name(root: Path) -> Optional[str]:
     """Extract project name from various sources.
 
@@ -123,33 +581,9 @@ def extract_project_name(root: Path) -> Optional[str]:
     Returns:
         Project name or None
     """
-    # Try package.json
-    package_json = root / "package.json"
-    if package_json.exists():
-        data = read_json_file(package_json)
-        if data and "name" in data:
-            return data["name"]
-
-    # Try setup.py (basic parsing)
-    setup_py = root / "setup.py"
-    if setup_py.exists():
-        content = read_file_content(setup_py)
-        if content:
-            match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1)
-
-    # Try pyproject.toml
-    pyproject = root / "pyproject.toml"
-    if pyproject.exists():
-        content = read_file_content(pyproject)
-        if content:
-            match = re.search(r'name\s*=\s*["\']([^"\']+)["\']', content)
-            if match:
-                return match.group(1)
-
-    # Fall back to directory name
-    return root.name
+    from diversity_standard.metadata import ProjectMetadata
+
+    return ProjectMetadata(root).project_name()
 
 
 def extract_repository_url(root: Path) -> Optional[str]:
@@ -161,37 +595,7 @@ def extract_repository_url(root: Path) -> Optional[str]:
     Returns:
         Repository URL or None
     """
-    # Try package.json
-    package_json = root / "package.json"
-    if package_json.exists():
-        data = read_json_file(package_json)
-        if data:
-            repo = data.get("repository")
-            if isinstance(repo, str):
-                return repo
-            elif isinstance(repo, dict) and "url" in repo:
-                return repo["url"]
-
-    # Try .git/config
-    git_config = root / ".git" / "config"
-    if git_config.exists():
-        content = read_file_content(git_config)
-        if content:
-            match = re.search(r'url\s*=\s*(.+)', content)
-            if match:
-                return match.group(1).strip()
-
-    # Try README for GitHub links
-    readme = find_file_by_name(root, "README.md")
-    if readme:
-        content = read_file_content(readme)
-        if content:
-            # Look for GitHub URLs
-            match = re.search(
-                r'https?://github\.com/[a-zA-Z0-9_-]+/[a-zA-Z0-9_.-]+', content
-            )
-            if match:
-                return match.group(0)
+    from diversity_standard.metadata import ProjectMetadata
 
-    return None
+    return ProjectMetadata(root).repository_url()
 
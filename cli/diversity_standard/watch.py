@@ -0,0 +1,491 @@
+"""Live re-inspection of a project as its files change."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+from diversity_standard.inspector import DocumentMatch, InspectionResult, ProjectInspector
+from diversity_standard.sources import walk_order_key
+from diversity_standard.utils import (
+    FileEntry,
+    IgnoreRules,
+    WalkFrame,
+    filter_directory,
+    scan_directory,
+)
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+# Editors save in several steps; events this close together are one change
+DEBOUNCE_SECONDS = 0.05
+POLL_INTERVAL_SECONDS = 1.0
+
+# (dirty directory prefixes or None for "everything", touched file rel_paths)
+ChangeBatch = Tuple[Optional[Set[str]], Set[str]]
+
+
+class InotifyEvents:
+    """Directory change events from Linux inotify, loaded through ctypes."""
+
+    name = "inotify"
+
+    def __init__(self):
+        """Open an inotify instance.
+
+        Raises:
+            OSError: If inotify is unavailable on this platform
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._prefixes: Dict[int, str] = {}
+        self._watches: Dict[str, int] = {}
+
+    def add_directory(self, directory: Path, prefix: str) -> None:
+        """Start watching a directory; failures (e.g. watch limits) are ignored."""
+        if prefix in self._watches:
+            return
+        wd = self._add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self._prefixes[wd] = prefix
+            self._watches[prefix] = wd
+
+    def remove_directory(self, prefix: str) -> None:
+        """Stop watching a directory that left the walk."""
+        wd = self._watches.pop(prefix, None)
+        if wd is not None:
+            self._prefixes.pop(wd, None)
+            self._rm_watch(self._fd, wd)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[ChangeBatch]:
+        """Block until something changes, then collect the burst of events.
+
+        Args:
+            timeout: Seconds to wait for the first event. None waits forever.
+
+        Returns:
+            ChangeBatch, or None if nothing changed before the timeout
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return None
+        dirty: Optional[Set[str]] = set()
+        touched: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                data = b""
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    dirty = None
+                    continue
+                prefix = self._prefixes.get(wd)
+                if mask & IN_IGNORED:
+                    self._prefixes.pop(wd, None)
+                    if prefix is not None and self._watches.get(prefix) == wd:
+                        del self._watches[prefix]
+                    continue
+                if prefix is None:
+                    continue
+                if dirty is not None:
+                    dirty.add(prefix)
+                if name and not mask & IN_ISDIR:
+                    touched.add(prefix + name)
+            if not select.select([self._fd], [], [], DEBOUNCE_SECONDS)[0]:
+                return dirty, touched
+
+    def close(self) -> None:
+        """Release the inotify instance."""
+        os.close(self._fd)
+
+
+class PollingEvents:
+    """Fallback change source that re-lists the whole tree periodically."""
+
+    name = "polling"
+
+    def __init__(self, interval: float = POLL_INTERVAL_SECONDS):
+        """Initialize the poller.
+
+        Args:
+            interval: Seconds between two scans of the tree
+        """
+        self.interval = interval
+
+    def add_directory(self, directory: Path, prefix: str) -> None:
+        """Nothing to register; every directory is re-listed on each poll."""
+
+    def remove_directory(self, prefix: str) -> None:
+        """Nothing to unregister."""
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[ChangeBatch]:
+        """Sleep for one interval and report every directory as dirty."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        return None, set()
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+@dataclass
+class _Directory:
+    """One walked directory: its frame, visible files and subdirectories."""
+
+    frame: WalkFrame
+    files: List[FileEntry]
+    subdirs: List[WalkFrame]
+
+
+class ProjectWatcher:
+    """Keeps a project's inspection up to date from filesystem events.
+
+    The listing of every walked directory, the keyword hits of every
+    markdown file and, per blueprint document, the files matching its
+    filenames or keywords are kept in memory. On a change only the dirty
+    directories are re-listed, only new or changed markdown files are
+    re-read, and only the documents whose matching files changed are
+    re-evaluated, from their own matches rather than the whole index.
+    Files are always listed by walking the tree; the on-disk cache is not
+    used.
+    """
+
+    def __init__(
+        self,
+        inspector: ProjectInspector,
+        project_root: Path,
+        exclude: Optional[List[str]] = None,
+        events: Optional[object] = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            inspector: Inspector providing the mapping and keyword automaton
+            project_root: Root directory of the project to watch
+            exclude: Extra .gitignore-style patterns to skip
+            events: Change source (InotifyEvents or PollingEvents). If None,
+                    inotify is used where available, polling otherwise.
+        """
+        self.inspector = inspector
+        self.project_root = project_root
+        self.ignore = IgnoreRules.for_project(project_root, exclude)
+        if events is None:
+            try:
+                events = InotifyEvents()
+            except (OSError, AttributeError):
+                events = PollingEvents()
+        self.events = events
+        self.documents: Mapping[str, Mapping] = inspector.registry.documents
+
+        self._directories: Dict[str, _Directory] = {}
+        self._walked: Set[str] = set()
+        # Files listed since the indexes were last updated; None if removed
+        self._changes: Dict[str, Optional[FileEntry]] = {}
+        self.entries: Dict[str, FileEntry] = {}
+        self.hits: Dict[str, Set[str]] = {}
+        self.matches: Dict[str, List[DocumentMatch]] = {}
+        # Document -> {rel_path: match kind} of files its filenames match
+        self._filename_paths: Dict[str, Dict[str, str]] = {}
+        # Document -> rel_paths of markdown files mentioning its keywords
+        self._content_paths: Dict[str, Set[str]] = {}
+        self._filename_memo: Dict[str, List[Tuple[str, str]]] = {}
+
+    def start(self) -> InspectionResult:
+        """Walk the project, scan every markdown file and inspect it fully.
+
+        Returns:
+            InspectionResult for the current state of the project
+        """
+        self._visit((self.project_root, "", ()))
+        self._apply_changes(set())
+        for blueprint_name in self.documents:
+            self._evaluate(blueprint_name)
+        return self.result()
+
+    def refresh(
+        self, dirty: Optional[Set[str]] = None, touched: Optional[Set[str]] = None
+    ) -> Set[str]:
+        """Apply a batch of changes and re-evaluate the affected documents.
+
+        Args:
+            dirty: Directory prefixes to re-list. None re-lists everything.
+            touched: File rel_paths reported as written; they are re-read even
+                    if their size and mtime look unchanged
+
+        Returns:
+            Names of the documents that were re-evaluated
+        """
+        if dirty is None:
+            dirty = set(self._directories)
+        # Shallowest first, so a subtree re-walked for its parent is not
+        # listed a second time
+        self._walked = set()
+        for prefix in sorted(dirty, key=lambda prefix: prefix.count("/")):
+            directory = self._directories.get(prefix)
+            if directory is not None and prefix not in self._walked:
+                self._relist(directory)
+
+        affected = self._apply_changes(touched or set())
+        for blueprint_name in affected:
+            self._evaluate(blueprint_name)
+        return affected
+
+    def result(self) -> InspectionResult:
+        """Assemble the current matches into an InspectionResult."""
+        found_documents: List[DocumentMatch] = []
+        for blueprint_name in self.documents:
+            found_documents.extend(self.matches.get(blueprint_name, []))
+        return InspectionResult(
+            found_documents=found_documents,
+            missing_documents=sorted(
+                name for name in self.documents if not self.matches.get(name)
+            ),
+            project_root=self.project_root,
+        )
+
+    def run(
+        self,
+        on_update: Callable[[InspectionResult, Set[str], float], None],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """Wait for changes and report each refreshed result until interrupted.
+
+        Args:
+            on_update: Called with (result, re-evaluated documents, seconds
+                      spent) after every batch of changes
+            timeout: Stop after this many seconds without changes (for tests).
+                    None watches until KeyboardInterrupt.
+        """
+        try:
+            while True:
+                batch = self.events.wait(timeout)
+                if batch is None:
+                    if timeout is not None:
+                        return
+                    continue
+                started = time.perf_counter()
+                affected = self.refresh(*batch)
+                # A poll that found nothing new is not worth a redraw
+                if affected or batch[0] is not None:
+                    on_update(self.result(), affected, time.perf_counter() - started)
+        finally:
+            self.events.close()
+
+    def _apply_changes(self, touched: Set[str]) -> Set[str]:
+        """Fold the files listed since the last update into the indexes.
+
+        Args:
+            touched: File rel_paths to re-read even if their stat looks unchanged
+
+        Returns:
+            Documents whose matching files changed
+        """
+        changes, self._changes = self._changes, {}
+        for rel_path in touched:
+            if rel_path not in changes and rel_path in self.entries:
+                changes[rel_path] = self.entries[rel_path]
+
+        affected: Set[str] = set()
+        to_scan: List[FileEntry] = []
+        for rel_path, entry in changes.items():
+            old = self.entries.get(rel_path)
+            if entry is None:
+                if old is not None:
+                    del self.entries[rel_path]
+                    affected |= self._index_filename(old, add=False)
+                    affected |= self._set_hits(rel_path, set())
+                continue
+            self.entries[rel_path] = entry
+            if old is None:
+                affected |= self._index_filename(entry, add=True)
+            changed = old is None or rel_path in touched or (
+                (old.size, old.mtime_ns, old.inode) != (entry.size, entry.mtime_ns, entry.inode)
+            )
+            if changed and entry.name.endswith(".md"):
+                to_scan.append(entry)
+
+        if self.inspector.jobs > 1 and len(to_scan) > 1:
+            with ThreadPoolExecutor(max_workers=self.inspector.jobs) as executor:
+                scanned = list(executor.map(self._scan, to_scan))
+        else:
+            scanned = [self._scan(entry) for entry in to_scan]
+        for entry, hits in zip(to_scan, scanned):
+            affected |= self._set_hits(entry.rel_path, hits)
+        return affected
+
+    def _index_filename(self, entry: FileEntry, add: bool) -> Set[str]:
+        """Add a file to (or remove it from) the filename matches of its documents.
+
+        Returns:
+            Documents whose filename patterns match the file
+        """
+        documents = set()
+        for blueprint_name, kind in self._filename_matches(entry.name):
+            documents.add(blueprint_name)
+            if add:
+                self._filename_paths.setdefault(blueprint_name, {})[entry.rel_path] = kind
+            else:
+                self._filename_paths.get(blueprint_name, {}).pop(entry.rel_path, None)
+        return documents
+
+    def _set_hits(self, rel_path: str, hits: Set[str]) -> Set[str]:
+        """Record a markdown file's keyword hits.
+
+        Returns:
+            Documents the file started or stopped mentioning
+        """
+        old = self.hits.pop(rel_path, set())
+        if hits:
+            self.hits[rel_path] = hits
+        for blueprint_name in hits - old:
+            self._content_paths.setdefault(blueprint_name, set()).add(rel_path)
+        for blueprint_name in old - hits:
+            self._content_paths.get(blueprint_name, set()).discard(rel_path)
+        return hits ^ old
+
+    def _scan(self, entry: FileEntry) -> Set[str]:
+        """Read a markdown file for every document's keywords."""
+        hits, _ = self.inspector.scan_file(entry, None, None)
+        return hits or set()
+
+    def _filename_matches(self, name: str) -> List[Tuple[str, str]]:
+        """Match a file name against the filename rules, memoised by name."""
+        matches = self._filename_memo.get(name)
+        if matches is None:
+            matches = self._filename_memo[name] = self.inspector.filename_matcher.match(name)
+        return matches
+
+    def _evaluate(self, blueprint_name: str) -> None:
+        """Recompute one document's matches from the files known to match it.
+
+        Filename matches are listed in walk order; otherwise the first file
+        in walk order mentioning one of the document's keywords is used.
+        """
+        filename_paths = self._filename_paths.get(blueprint_name)
+        if filename_paths:
+            self.matches[blueprint_name] = [
+                self.inspector.filename_match(blueprint_name, self.entries[rel_path].path, kind)
+                for rel_path, kind in sorted(
+                    filename_paths.items(), key=lambda item: walk_order_key(item[0])
+                )
+            ]
+            return
+        content_paths = self._content_paths.get(blueprint_name)
+        if content_paths:
+            first = min(content_paths, key=walk_order_key)
+            self.matches[blueprint_name] = [
+                self.inspector.content_match(blueprint_name, self.entries[first].path)
+            ]
+            return
+        self.matches[blueprint_name] = []
+
+    def _visit(self, frame: WalkFrame) -> None:
+        """Walk a subtree, recording and watching every directory in it."""
+        stack = [frame]
+        while stack:
+            frame = stack.pop()
+            directory, prefix, _ = frame
+            # Watch before listing, so nothing created in between is missed
+            self.events.add_directory(directory, prefix)
+            try:
+                items = scan_directory(directory)
+            except OSError:
+                self.events.remove_directory(prefix)
+                continue
+            files, subdirs = filter_directory(frame, items, self.ignore)
+            self._directories[prefix] = _Directory(frame, files, subdirs)
+            self._walked.add(prefix)
+            for entry in files:
+                self._changes[entry.rel_path] = entry
+            stack.extend(reversed(subdirs))
+
+    def _relist(self, directory: _Directory) -> None:
+        """Re-list one directory, re-walking only subtrees that changed."""
+        frame = directory.frame
+        prefix = frame[1]
+        try:
+            items = scan_directory(frame[0])
+        except OSError:
+            self._forget(prefix)
+            return
+        files, subdirs = filter_directory(frame, items, self.ignore)
+        for entry in directory.files:
+            self._changes[entry.rel_path] = None
+        for entry in files:
+            self._changes[entry.rel_path] = entry
+        old_subdirs = {sub[1]: sub for sub in directory.subdirs}
+        directory.files = files
+        directory.subdirs = subdirs
+        self._walked.add(prefix)
+
+        new_prefixes = {sub[1] for sub in subdirs}
+        for sub_prefix, old in old_subdirs.items():
+            if sub_prefix not in new_prefixes:
+                self._forget(sub_prefix)
+        for sub in subdirs:
+            old = old_subdirs.get(sub[1])
+            if old is None or old[2] != sub[2]:
+                # New directory, or the .gitignore rules above it changed
+                self._forget(sub[1])
+                self._visit(sub)
+
+    def _forget(self, prefix: str) -> None:
+        """Drop a directory and everything below it from the walk."""
+        stack = [prefix]
+        while stack:
+            directory = self._directories.pop(stack.pop(), None)
+            if directory is None:
+                continue
+            self.events.remove_directory(directory.frame[1])
+            for entry in directory.files:
+                self._changes[entry.rel_path] = None
+            stack.extend(sub[1] for sub in directory.subdirs)
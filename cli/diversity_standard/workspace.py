@@ -0,0 +1,221 @@
+"""Monorepo support: find sub-projects and inspect each of them."""
+
+import copy
+import dataclasses
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from diversity_standard.cache import InspectionCache, mapping_fingerprint
+from diversity_standard.config import ProjectConfig
+from diversity_standard.inspector import InspectionResult, ProjectInspector
+from diversity_standard.metadata import ProjectMetadata
+from diversity_standard.utils import FileEntry, IgnoreRules, is_excluded, parse_ignore_patterns
+
+# Files whose presence makes a directory the root of its own package
+MANIFEST_FILENAMES = {
+    "package.json",
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "Cargo.toml",
+    "go.mod",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+    "composer.json",
+    "Gemfile",
+}
+
+PackageTask = Tuple[Path, str, List[FileEntry]]
+
+
+@dataclass
+class PackageReport:
+    """Inspection results for one package of a workspace."""
+
+    name: str  # Package directory relative to the workspace root ("." for the root)
+    project_name: str
+    result: InspectionResult
+    answers: Dict[str, Any]
+
+
+def find_subprojects(index: List[FileEntry]) -> List[str]:
+    """Find package roots from a workspace's file index.
+
+    Args:
+        index: File index of the whole workspace
+
+    Returns:
+        Sorted package directory prefixes: "" for the workspace root, which
+        is always included first, otherwise "path/to/pkg/"
+    """
+    roots = {""}
+    for entry in index:
+        if entry.name in MANIFEST_FILENAMES:
+            roots.add(entry.rel_path[: -len(entry.name)])
+    return sorted(roots)
+
+
+def partition_index(
+    index: List[FileEntry], roots: List[str]
+) -> Dict[str, List[FileEntry]]:
+    """Assign every file to the innermost package that contains it.
+
+    Args:
+        index: File index of the whole workspace
+        roots: Package prefixes from find_subprojects
+
+    Returns:
+        Dictionary mapping package prefix to its files, with rel_path
+        rewritten relative to the package root
+    """
+    root_set = set(roots)
+    owners: Dict[str, str] = {}
+    partitions: Dict[str, List[FileEntry]] = {prefix: [] for prefix in roots}
+
+    for entry in index:
+        directory = entry.rel_path[: -len(entry.name)]
+        owner = owners.get(directory)
+        if owner is None:
+            candidate = directory
+            while candidate not in root_set:
+                candidate = candidate[:-1].rpartition("/")[0]
+                candidate = candidate + "/" if candidate else ""
+            owner = owners[directory] = candidate
+        partitions[owner].append(
+            dataclasses.replace(entry, rel_path=entry.rel_path[len(owner) :])
+        )
+    return partitions
+
+
+_worker_inspector: Optional[ProjectInspector] = None
+
+
+def _init_worker(inspector_options: Dict[str, Any]) -> None:
+    """Build the per-process inspector once, when a pool worker starts."""
+    global _worker_inspector
+    _worker_inspector = ProjectInspector(**inspector_options)
+
+
+def _inspect_package(
+    task: PackageTask, inspector: Optional[ProjectInspector] = None
+) -> PackageReport:
+    """Inspect one package from its slice of the shared file index.
+
+    The package's own .diversity-standard.yml is applied as if inspect ran
+    inside the package: its inspect.exclude patterns (relative to the
+    package) drop entries, and its inspect.max_file_bytes overrides the
+    workspace's. Files the workspace walk already skipped cannot be
+    re-included.
+
+    Only the project name is detected, from the package's manifests, so no
+    license files or git history are read per package.
+    """
+    package_root, prefix, entries = task
+    inspector = inspector or _worker_inspector or ProjectInspector()
+
+    config = ProjectConfig(package_root)
+    config.load_from_file()
+    project_name = config.get("project.name")
+    if not project_name:
+        project_name = ProjectMetadata(package_root, entries).project_name()
+
+    exclude = config.get("inspect.exclude", [])
+    if exclude:
+        rules = IgnoreRules(overrides=parse_ignore_patterns(exclude))
+        verdicts: Dict[str, bool] = {}
+        entries = [entry for entry in entries if not is_excluded(entry.rel_path, rules, verdicts)]
+    max_file_bytes = config.get("inspect.max_file_bytes")
+    if max_file_bytes is not None and max_file_bytes != inspector.max_file_bytes:
+        inspector = copy.copy(inspector)
+        inspector.max_file_bytes = max_file_bytes
+    result = inspector.inspect_index(package_root, entries)
+
+    return PackageReport(
+        name=prefix.rstrip("/") or ".",
+        project_name=str(project_name),
+        result=result,
+        answers=config.get("answers", {}),
+    )
+
+
+def inspect_workspace(
+    workspace_root: Path,
+    inspector_options: Optional[Dict[str, Any]] = None,
+    exclude: Optional[List[str]] = None,
+    processes: Optional[int] = None,
+) -> List[PackageReport]:
+    """Inspect every package of a monorepo from one shared walk.
+
+    See iter_workspace for details.
+
+    Args:
+        workspace_root: Root directory of the monorepo
+        inspector_options: Keyword arguments for ProjectInspector
+        exclude: Extra ignore patterns for the shared walk
+        processes: Number of worker processes. If None, one per CPU.
+
+    Returns:
+        One PackageReport per package, sorted by package path
+    """
+    return list(iter_workspace(workspace_root, inspector_options, exclude, processes))
+
+
+def iter_workspace(
+    workspace_root: Path,
+    inspector_options: Optional[Dict[str, Any]] = None,
+    exclude: Optional[List[str]] = None,
+    processes: Optional[int] = None,
+) -> Iterator[PackageReport]:
+    """Inspect every package of a monorepo from one shared walk.
+
+    The workspace is listed once (honouring the cache and source settings),
+    split into packages by their manifests, and each package is inspected
+    in a process pool whose workers build their inspector only once.
+
+    Args:
+        workspace_root: Root directory of the monorepo
+        inspector_options: Keyword arguments for ProjectInspector
+        exclude: Extra ignore patterns for the shared walk
+        processes: Number of worker processes. If None, one per CPU.
+
+    Yields:
+        One PackageReport per package, sorted by package path, as soon as
+        it and every package before it are done
+    """
+    inspector_options = dict(inspector_options or {})
+    inspector = ProjectInspector(**inspector_options)
+
+    cache = None
+    if inspector.use_cache:
+        cache = InspectionCache.load(
+            workspace_root, mapping_fingerprint(inspector.mapping_file, inspector.max_file_bytes)
+        )
+    index = inspector.build_index(
+        workspace_root, IgnoreRules.for_project(workspace_root, exclude), cache
+    )
+    if cache:
+        cache.save(index)
+
+    roots = find_subprojects(index)
+    partitions = partition_index(index, roots)
+    tasks: List[PackageTask] = [
+        (workspace_root / prefix, prefix, partitions[prefix]) for prefix in roots
+    ]
+
+    processes = min(processes or os.cpu_count() or 1, len(tasks))
+    if processes <= 1:
+        for task in tasks:
+            yield _inspect_package(task, inspector)
+        return
+
+    # Packages are inspected without the content cache: each worker reads
+    # its own files, and processes already provide the parallelism.
+    worker_options = dict(inspector_options, use_cache=False, jobs=1)
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(worker_options,)
+    ) as executor:
+        yield from executor.map(_inspect_package, tasks, chunksize=4)
@@ -0,0 +1,109 @@
+"""Fast loading of the bundled YAML data files (mapping, questions)."""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import yaml
+
+from diversity_standard import __version__
+from diversity_standard.utils import user_cache_dir
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+# Bump when the cache layout changes
+YAML_CACHE_FORMAT = 1
+
+_CACHE_SUFFIX = f".{sys.implementation.cache_tag}.marshal"
+
+
+def load_yaml(path: Path) -> Any:
+    """Load a YAML file through a marshal cache of its parsed content.
+
+    The cache is stamped with the tool version, cache format, marshal
+    version and a hash of the YAML source, so it is rebuilt whenever any of
+    them changes. It is kept in a __pycache__ directory next to the YAML
+    file, or in the user cache directory if that one is read-only; if
+    neither is writable the file is just parsed. Parsing uses libyaml's
+    CSafeLoader when PyYAML was built with it.
+
+    Args:
+        path: YAML file
+
+    Returns:
+        Parsed content
+
+    Raises:
+        OSError: If the YAML file cannot be read
+        yaml.YAMLError: If it is not valid YAML
+    """
+    source = path.read_bytes()
+    stamp = _stamp(source)
+
+    for cache_path in _cache_paths(path):
+        data = _read_cache(cache_path, stamp)
+        if data is not None:
+            return data[1]
+
+    data = yaml.load(source, Loader=SafeLoader)
+    try:
+        payload = marshal.dumps((stamp, data))
+    except ValueError:
+        # Timestamps and other non-builtin values cannot be marshalled
+        return data
+    for cache_path in _cache_paths(path):
+        if _write_cache(cache_path, payload):
+            break
+    return data
+
+
+def _stamp(source: bytes) -> str:
+    """Identify the YAML source and everything the cache format depends on."""
+    digest = hashlib.sha256(source).hexdigest()
+    return f"{__version__}:{YAML_CACHE_FORMAT}:{marshal.version}:{digest}"
+
+
+def _cache_paths(path: Path) -> Iterator[Path]:
+    """Yield where a YAML file's cache may live, preferred location first."""
+    yield path.parent / "__pycache__" / (path.name + _CACHE_SUFFIX)
+    # Files from different installs share the user cache, so add the location
+    location = hashlib.sha256(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    yield user_cache_dir() / "yaml" / f"{path.name}.{location}{_CACHE_SUFFIX}"
+
+
+def _read_cache(cache_path: Path, stamp: str) -> Optional[tuple]:
+    """Return (stamp, data) from a cache file if it matches the stamp."""
+    try:
+        with open(cache_path, "rb") as f:
+            cached = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == stamp:
+        return cached
+    return None
+
+
+def _write_cache(cache_path: Path, payload: bytes) -> bool:
+    """Atomically write a cache file; False if the location is not writable."""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            # mkstemp creates the file private; make it readable like a .pyc
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+    return True
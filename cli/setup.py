@@ -36,7 +36,11 @@ setup(
     },
     include_package_data=True,
     package_data={
-        "diversity_standard": ["document_mapping.yml", "templates/**/*.md"],
+        "diversity_standard": [
+            "document_mapping.yml",
+            "license_index.json",
+            "templates/**/*.md",
+        ],
     },
 )
 
@@ -1,12 +1,47 @@
 """Basic tests for CLI functionality."""
 
+import json
+import os
+import shutil
+import subprocess
 import tempfile
+import time
 from pathlib import Path
 
 import pytest
 
+from diversity_standard import watch
+from diversity_standard.archives import ArchiveSource
+from diversity_standard.cache import InspectionCache
 from diversity_standard.config import ProjectConfig
+from diversity_standard.contributors import detect_contributors, iter_git_authors
+from diversity_standard.fleet import checkpoint_path, scan_fleet
+from diversity_standard.history import HistoryInspector
 from diversity_standard.inspector import ProjectInspector
+from diversity_standard.licenses import license_file_names
+from diversity_standard.registry import get_registry
+from diversity_standard.sources import GitRevisionSource, list_git_index_files
+from diversity_standard.utils import build_file_index
+from diversity_standard.watch import PollingEvents, ProjectWatcher
+from diversity_standard.workspace import inspect_workspace
+from diversity_standard.yaml_cache import load_yaml
+
+
+@pytest.fixture(autouse=True)
+def user_cache_home(tmp_path, monkeypatch):
+    """Keep the per-user cache (compiled templates, parsed YAML) out of ~/.cache."""
+    cache_home = tmp_path / "xdg-cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home
+
+
+def make_template_tree(root, templates):
+    """Write {relative path: content} under root/templates and return that directory."""
+    template_dir = root / "templates"
+    for rel_path, content in templates.items():
+        (template_dir / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (template_dir / rel_path).write_text(content)
+    return template_dir
 
 
 def test_config_auto_detect():
@@ -17,6 +52,8 @@ def test_config_auto_detect():
         # Create a simple package.json
         package_json = project_root / "package.json"
         package_json.write_text('{"name": "test-project", "description": "A test project"}')
+        (project_root / "packages" / "sub").mkdir(parents=True)
+        (project_root / "packages" / "sub" / "README.md").write_text("An unrelated package.\n")
         
         config = ProjectConfig(project_root)
         config.auto_detect()
@@ -25,6 +62,240 @@ def test_config_auto_detect():
         assert config.get("project.description") == "A test project"
 
 
+def test_config_auto_detect_reads_each_manifest_once(monkeypatch):
+    """Auto-detection reads every manifest once and finds docs/README.md without a walk."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "package.json").write_text(
+            json.dumps({"name": "pkg", "author": "Jane Doe", "license": "MIT"})
+        )
+        (project_root / "setup.py").write_text("setup(description='x')\n")
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "README.md").write_text(
+            "The pkg project.\n\nSee https://github.com/org/pkg for more.\n"
+        )
+
+        reads = []
+        original = Path.read_text
+
+        def counting_read_text(self, *args, **kwargs):
+            reads.append(self.relative_to(project_root).as_posix())
+            return original(self, *args, **kwargs)
+
+        def no_walk(*args, **kwargs):
+            raise AssertionError("the tree should not be walked")
+
+        monkeypatch.setattr(Path, "read_text", counting_read_text)
+        monkeypatch.setattr("diversity_standard.metadata.build_file_index", no_walk)
+
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+
+        assert config.get("project.name") == "pkg"
+        assert config.get("project.repository") == "https://github.com/org/pkg"
+        # Only a root README describes the project
+        assert config.get("project.description") == "x"
+        assert config.get("license.type") == "MIT"
+        assert config.get("maintainers") == [{"name": "Jane Doe"}]
+        assert sorted(reads) == ["docs/README.md", "package.json", "setup.py"]
+
+
+@pytest.mark.parametrize(
+    "filename,content",
+    [
+        (
+            "pyproject.toml",
+            '[project]\nname = "tool"\ndescription = "A tool"\nlicense = {text = "MIT"}\n'
+            'authors = [{name = "Jane Doe", email = "jane@example.com"}]\n'
+            '[project.urls]\nRepository = "https://github.com/org/tool"\n'
+            '[tool.other]\nname = "not-the-project"\n',
+        ),
+        (
+            "setup.cfg",
+            "[metadata]\nname = tool\ndescription = A tool\nlicense = MIT\n"
+            "author = Jane Doe\nauthor_email = jane@example.com\n"
+            "project_urls =\n    Source = https://github.com/org/tool\n",
+        ),
+        (
+            "Cargo.toml",
+            '[package]\nname = "tool"\ndescription = "A tool"\nlicense = "MIT"\n'
+            'authors = ["Jane Doe <jane@example.com>"]\n'
+            'repository = "https://github.com/org/tool"\n'
+            '[dependencies]\nserde = "1"\n',
+        ),
+        (
+            "pom.xml",
+            '<?xml version="1.0"?>\n<project xmlns="http://maven.apache.org/POM/4.0.0">'
+            "<parent><artifactId>parent</artifactId><name>Parent</name></parent>"
+            "<artifactId>tool</artifactId><description>A tool</description>"
+            "<licenses><license><name>MIT</name></license></licenses>"
+            "<developers><developer><name>Jane Doe</name><email>jane@example.com</email>"
+            "</developer></developers>"
+            "<scm><url>https://github.com/org/tool</url></scm>"
+            "<dependencies><dependency><artifactId>dep</artifactId></dependency></dependencies>"
+            "</project>\n",
+        ),
+    ],
+)
+def test_config_auto_detect_reads_manifests(filename, content):
+    """Project metadata comes from the manifest's own fields, not the first `name =`."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / filename).write_text(content)
+
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+
+        assert config.get("project.name") == "tool"
+        assert config.get("project.description") == "A tool"
+        assert config.get("project.repository") == "https://github.com/org/tool"
+        assert config.get("license.type") == "MIT"
+        assert config.get("maintainers") == [{"name": "Jane Doe", "email": "jane@example.com"}]
+
+
+def test_config_detects_license_from_fingerprint():
+    """License files are matched against the index, not by keyword."""
+    mit = (Path(__file__).parent.parent / "license_texts" / "MIT.txt").read_text()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        # Mentions GPL but is the MIT license with a filled-in holder
+        (project_root / "LICENSE.md").write_text(
+            mit.replace("<year> <copyright holders>", "2024 GPL Tools Ltd, Version 3 team")
+        )
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("license.type") == "MIT"
+        assert config.license_match.path == project_root / "LICENSE.md"
+        assert config.license_match.score > 0.95
+
+    repo_license = Path(__file__).parent.parent.parent / "LICENSE"
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        shutil.copy(repo_license, project_root / "COPYING")
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("license.type") == "GPL-3.0"
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "LICENSE").write_text(
+            "SPDX-License-Identifier: EUPL-1.2\n\nSee the EUPL for details; not GPL.\n"
+        )
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("license.type") == "EUPL-1.2"
+        assert config.license_match is None
+
+
+def test_license_file_names_skip_source_files():
+    """Only license texts are picked, not source files named after licenses."""
+    names = [
+        "license_check.py",
+        "LICENSE.go",
+        "COPYING.LESSER",
+        "LICENSE-MIT",
+        "LICENSE.md",
+        "COPYING",
+        "licenses.rs",
+        "README.md",
+    ]
+    assert license_file_names(names) == ["LICENSE.md", "LICENSE-MIT", "COPYING", "COPYING.LESSER"]
+
+
+def test_config_parses_maintainers_table():
+    """MAINTAINERS.md tables are read by column, without header or separator rows."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "MAINTAINERS.md").write_text(
+            "# Maintainers\n\n"
+            "| Name / Handle | Area(s) | Contact |\n"
+            "|---------------|:-------:|---------|\n"
+            "| Jane Doe | Docs | jane@example.com |\n"
+            "|               |         |         |\n"
+        )
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("maintainers") == [
+            {"name": "Jane Doe", "role": "Docs", "email": "jane@example.com"}
+        ]
+
+        (project_root / "MAINTAINERS.md").write_text(
+            "| GitHub | Maintainer | Email |\n"
+            "|--------|------------|-------|\n"
+            "| @jdoe | Jane Doe | jane@example.com |\n"
+        )
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("maintainers") == [{"name": "Jane Doe", "email": "jane@example.com"}]
+
+
+def test_config_detects_maintainers_from_git_history():
+    """Without declared maintainers, the most active recent committers are used."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        subprocess.run(["git", "init", "-q", str(project_root)], check=True)
+        (project_root / ".mailmap").write_text(
+            "Jane Doe <jane@example.com> <jdoe@old-laptop.local>\n"
+        )
+
+        now = int(time.time())
+        commits = [
+            ("Old Timer", "old@example.com", now - 800 * 86400),
+            ("jdoe", "jdoe@old-laptop.local", now - 3600),
+            ("Jane Doe", "jane@example.com", now - 1800),
+            ("Jane Doe", "jane@example.com", now - 900),
+            ("Sam Roe", "sam@example.com", now - 600),
+            ("dependabot[bot]", "bot@users.noreply.github.com", now - 300),
+        ]
+        for number, (name, email, timestamp) in enumerate(commits):
+            (project_root / "notes.txt").write_text(str(number))
+            env = dict(
+                os.environ,
+                GIT_AUTHOR_NAME=name,
+                GIT_AUTHOR_EMAIL=email,
+                GIT_COMMITTER_NAME=name,
+                GIT_COMMITTER_EMAIL=email,
+                GIT_AUTHOR_DATE=f"{timestamp} +0000",
+                GIT_COMMITTER_DATE=f"{timestamp} +0000",
+            )
+            subprocess.run(["git", "-C", str(project_root), "add", "-A"], check=True, env=env)
+            subprocess.run(
+                ["git", "-C", str(project_root), "commit", "-q", "-m", f"Change {number}"],
+                check=True,
+                env=env,
+            )
+
+        config = ProjectConfig(project_root)
+        config.auto_detect()
+        assert config.get("maintainers") == []
+        assert config.contributors == []
+
+        config = ProjectConfig(project_root)
+        config.auto_detect(history=True)
+        assert config.get("maintainers") == [
+            {"name": "Jane Doe", "email": "jane@example.com"},
+            {"name": "Sam Roe", "email": "sam@example.com"},
+        ]
+        assert [c.commits for c in config.contributors] == [3, 1]
+
+        config = ProjectConfig(project_root)
+        config.set("contributors.window_days", 1000)
+        config.auto_detect(history=True)
+        assert {"name": "Old Timer", "email": "old@example.com"} in config.get("maintainers")
+
+
+def test_git_authors_report_git_errors():
+    """Git's error output is kept (in a file, not an unread pipe) for the exception."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with pytest.raises(OSError, match="(?i)not a git repository"):
+            list(iter_git_authors(Path(tmpdir), window_days=None))
+        assert detect_contributors(Path(tmpdir)) == []
+
+
 def test_inspector_find_documents():
     """Test document inspection."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -65,3 +336,853 @@ def test_config_get_set():
         
         assert config.get("project.nonexistent", "default") == "default"
 
+
+def test_config_revision_tracks_changes():
+    """Every change made through ProjectConfig bumps its revision."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        config = ProjectConfig(project_root)
+        assert config.revision == 0
+
+        config.set("project.name", "Test Project")
+        after_set = config.revision
+        assert after_set > 0
+
+        config.get("project.name")
+        assert config.revision == after_set
+
+        config.auto_detect()
+        assert config.revision > after_set
+
+
+
+def test_yaml_cache_rebuilds_when_source_changes(monkeypatch):
+    """Parsed YAML is cached next to the file, or in the user cache if that fails."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir) / "data"
+        data_dir.mkdir()
+        monkeypatch.setenv("XDG_CACHE_HOME", str(Path(tmpdir) / "cache"))
+        source = data_dir / "mapping.yml"
+        source.write_text("documents:\n  A.md: {category: Daily}\n")
+
+        assert load_yaml(source) == {"documents": {"A.md": {"category": "Daily"}}}
+        assert len(list((data_dir / "__pycache__").iterdir())) == 1
+
+        with monkeypatch.context() as patch:
+            # Served from the cache without parsing
+            patch.setattr("diversity_standard.yaml_cache.yaml.load", None)
+            assert load_yaml(source) == {"documents": {"A.md": {"category": "Daily"}}}
+
+        source.write_text("documents:\n  B.md: {category: Procedural}\n")
+        assert load_yaml(source) == {"documents": {"B.md": {"category": "Procedural"}}}
+
+        # An unwritable package directory falls back to the user cache
+        shutil.rmtree(data_dir / "__pycache__")
+        (data_dir / "__pycache__").write_text("not a directory")
+        assert load_yaml(source) == {"documents": {"B.md": {"category": "Procedural"}}}
+        assert len(list((Path(tmpdir) / "cache" / "diversity-standard" / "yaml").iterdir())) == 1
+
+
+def test_mapping_registry_is_shared_and_indexed():
+    """Every consumer shares one registry with precomputed views of the mapping."""
+    registry = get_registry()
+    inspector = ProjectInspector()
+    assert inspector.registry is registry
+    assert ProjectInspector().keyword_automaton is registry.keyword_automaton
+
+    assert "CONTRIBUTING.md" in registry.by_category["Daily"]
+    assert registry.category("SECURITY.md") == "Procedural"
+    assert registry.category("NOT_MAPPED.md") == "Unknown"
+    assert registry.filename_matcher.match("sponsors.md") == [("FUNDING.md", "exact")]
+    assert "SECURITY.md" in registry.keyword_automaton.search("Reporting a vulnerability")
+    with pytest.raises(TypeError):
+        registry.documents["SECURITY.md"] = {}
+    with pytest.raises(TypeError):
+        registry.documents["SECURITY.md"]["category"] = "Daily"
+
+    assert registry.is_skipped("FUNDING.md", {})
+    assert not registry.is_skipped("FUNDING.md", {"has_funding": True})
+    assert not registry.is_skipped("SECURITY.md", {})
+    assert registry.skip_reason("FUNDING.md") == "No funding (has_funding: false)"
+
+
+def test_file_index_matches_rglob():
+    """Test the single-pass file index walks the tree like rglob."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        (project_root / "docs" / "nested").mkdir(parents=True)
+        (project_root / "README.md").write_text("# Readme")
+        (project_root / "docs" / "SECURITY.md").write_text("# Security")
+        (project_root / "docs" / "nested" / "notes.txt").write_text("notes")
+
+        index = build_file_index(project_root)
+
+        expected = [p for p in project_root.rglob("*") if p.is_file()]
+        assert [entry.path for entry in index] == expected
+        assert {entry.rel_path for entry in index} == {
+            "README.md",
+            "docs/SECURITY.md",
+            "docs/nested/notes.txt",
+        }
+
+
+def test_inspector_skips_ignored_paths():
+    """Test that vendored, .gitignore'd and excluded paths are not matched."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        (project_root / "node_modules" / "pkg").mkdir(parents=True)
+        (project_root / "node_modules" / "pkg" / "SECURITY.md").write_text("# Security")
+        (project_root / "generated").mkdir()
+        (project_root / "generated" / "GOVERNANCE.md").write_text("# Governance")
+        (project_root / "archive").mkdir()
+        (project_root / "archive" / "CREDITS.md").write_text("# Credits")
+        (project_root / ".gitignore").write_text("generated/\n")
+
+        inspector = ProjectInspector()
+        result = inspector.inspect(project_root, exclude=["/archive"])
+
+        found_names = [doc.blueprint_name for doc in result.found_documents]
+        assert "SECURITY.md" not in found_names
+        assert "GOVERNANCE.md" not in found_names
+        assert "CREDIT.md" not in found_names
+
+
+def test_inspector_filename_matches_on_token_boundaries():
+    """Test exact and partial filename matches, and substring false positives."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "preview.md").write_text("# Preview")
+        (project_root / "SECURITY.md").write_text("# Security")
+        (project_root / "team-governance.md").write_text("# Team")
+
+        result = ProjectInspector().inspect(project_root)
+        found = {doc.blueprint_name: doc for doc in result.found_documents}
+
+        assert "CODE_REVIEW.md" not in found
+        assert found["SECURITY.md"].confidence == 0.9
+        assert found["GOVERNANCE.md"].confidence == 0.8
+        assert found["GOVERNANCE.md"].match_type == "filename"
+
+
+def test_inspector_content_match_single_pass():
+    """Test that one markdown file can satisfy several documents by content."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        (project_root / "policies.md").write_text(
+            "# Policies\n\nOur Security Policy and our Code of Conduct live here."
+        )
+
+        inspector = ProjectInspector()
+        result = inspector.inspect(project_root)
+
+        content_matches = {
+            doc.blueprint_name: doc.actual_path.name
+            for doc in result.found_documents
+            if doc.match_type == "content"
+        }
+        assert content_matches["SECURITY.md"] == "policies.md"
+        assert content_matches["CODE_OF_CONDUCT.md"] == "policies.md"
+        assert "SECURITY.md" not in result.missing_documents
+
+
+def test_inspector_cache_reuses_and_invalidates():
+    """Test that cached keyword hits are reused until a file changes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        notes = project_root / "notes.md"
+        notes.write_text("Our security policy is below.")
+        # Backdate so the cache does not treat the files as racily modified
+        old = time.time() - 60
+        os.utime(notes, (old, old))
+        os.utime(project_root, (old, old))
+
+        inspector = ProjectInspector(use_cache=True)
+        first = inspector.inspect(project_root)
+        assert (project_root / ".diversity-standard-cache" / "inspect.json").exists()
+
+        second = inspector.inspect(project_root)
+        assert [d.actual_path for d in second.found_documents] == [
+            d.actual_path for d in first.found_documents
+        ]
+        assert "SECURITY.md" not in second.missing_documents
+
+        notes.write_text("Nothing relevant any more.")
+        os.utime(notes, (old + 1, old + 1))
+        third = inspector.inspect(project_root)
+        assert "SECURITY.md" in third.missing_documents
+
+
+def test_inspector_parallel_content_is_deterministic():
+    """Test that parallel reads pick the same first content match as serial."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        for i in range(20):
+            (project_root / f"notes-{i:02d}.md").write_text(
+                "Meeting notes and our governance model." if i % 3 else "Nothing here."
+            )
+
+        serial = ProjectInspector(jobs=1).inspect(project_root)
+        parallel = ProjectInspector(jobs=4).inspect(project_root)
+
+        assert [(d.blueprint_name, d.actual_path) for d in parallel.found_documents] == [
+            (d.blueprint_name, d.actual_path) for d in serial.found_documents
+        ]
+        assert parallel.missing_documents == serial.missing_documents
+
+
+def test_inspector_streaming_scan_handles_bad_files():
+    """Test binary, non-UTF-8 and capped files during content matching."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        (project_root / "a-binary.md").write_bytes(b"\x00\x01security policy")
+        (project_root / "b-latin1.md").write_bytes("Caf\xe9 governance model".encode("latin-1"))
+        (project_root / "c-large.md").write_text("x" * 200_000 + " code of conduct")
+
+        result = ProjectInspector(max_file_bytes=100_000).inspect(project_root)
+        found_names = [doc.blueprint_name for doc in result.found_documents]
+
+        assert "SECURITY.md" not in found_names
+        assert "GOVERNANCE.md" in found_names
+        assert "CODE_OF_CONDUCT.md" not in found_names
+
+        result = ProjectInspector().inspect(project_root)
+        found_names = [doc.blueprint_name for doc in result.found_documents]
+        assert "CODE_OF_CONDUCT.md" in found_names
+
+
+def test_inspector_git_index_source(monkeypatch):
+    """Test listing files from the git index, including untracked files."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        subprocess.run(["git", "init", "-q", str(project_root)], check=True)
+
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "SECURITY.md").write_text("# Security")
+        (project_root / "CONTRIBUTING.md").write_text("# Contributing")
+        (project_root / "build").mkdir()
+        (project_root / "build" / "GOVERNANCE.md").write_text("# Governance")
+        (project_root / ".gitignore").write_text("scratch/\n")
+        (project_root / "scratch").mkdir()
+        (project_root / "scratch" / "CREDITS.md").write_text("# Credits")
+        # Several content matches for one document: the first in walk order wins
+        for name in ["zeta", "mid", "omega"]:
+            (project_root / "notes" / name).mkdir(parents=True)
+            (project_root / "notes" / name / "rules.md").write_text("Our governance model")
+        subprocess.run(["git", "-C", str(project_root), "add", "docs", "notes"], check=True)
+
+        index = list_git_index_files(project_root)
+        assert [entry.rel_path for entry in index] == [
+            ".gitignore",
+            "CONTRIBUTING.md",
+            "docs/SECURITY.md",
+            "notes/mid/rules.md",
+            "notes/omega/rules.md",
+            "notes/zeta/rules.md",
+        ]
+
+        # A warm cache lists each directory from its stored stat data
+        past = time.time() - 3600
+        for directory in [project_root, *project_root.glob("**/")]:
+            os.utime(directory, (past, past))
+        cold = InspectionCache(project_root, "fingerprint")
+        assert list_git_index_files(project_root, None, cold.list_directory) == index
+        warm = InspectionCache(project_root, "fingerprint")
+        warm.directories = cold.directories
+        monkeypatch.setattr("diversity_standard.cache.scan_directory", None)
+        assert list_git_index_files(project_root, None, warm.list_directory) == index
+        monkeypatch.undo()
+
+        git_result = ProjectInspector(source="git-index").inspect(project_root)
+        fs_result = ProjectInspector(source="filesystem").inspect(project_root)
+        assert git_result.missing_documents == fs_result.missing_documents
+        assert [
+            (doc.blueprint_name, doc.actual_path) for doc in git_result.found_documents
+        ] == [(doc.blueprint_name, doc.actual_path) for doc in fs_result.found_documents]
+
+
+def test_inspector_reports_every_decision():
+    """Test that each document is reported once and results serialise to JSON."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "SECURITY.md").write_text("# Security")
+
+        decisions = []
+        inspector = ProjectInspector()
+        result = inspector.inspect(
+            project_root, on_decision=lambda name, matches: decisions.append((name, matches))
+        )
+
+        decided = [name for name, _ in decisions]
+        assert sorted(decided) == sorted(inspector.mapping["documents"])
+        assert dict(decisions)["SECURITY.md"][0].actual_path == project_root / "docs" / "SECURITY.md"
+
+        data = json.loads(json.dumps(result.to_dict()))
+        assert data["found_documents"][0]["path"] == "docs/SECURITY.md"
+        assert data["missing_documents"] == result.missing_documents
+
+
+def test_watcher_refresh_matches_full_inspection():
+    """Test that incremental watch updates agree with a fresh inspection."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "notes.md").write_text("# Notes")
+
+        inspector = ProjectInspector()
+        watcher = ProjectWatcher(inspector, project_root, events=PollingEvents())
+        watcher.start()
+
+        def outcome(result):
+            return (
+                [(doc.blueprint_name, doc.actual_path) for doc in result.found_documents],
+                result.missing_documents,
+            )
+
+        changes = [
+            lambda: (project_root / "docs" / "notes.md").write_text("Read our security policy."),
+            lambda: (project_root / "SECURITY.md").write_text("# Security"),
+            lambda: (project_root / ".gitignore").write_text("docs/\n"),
+            lambda: (project_root / "SECURITY.md").unlink(),
+        ]
+        for change in changes:
+            change()
+            affected = watcher.refresh(None, {"docs/notes.md"})
+            assert "SECURITY.md" in affected
+            assert outcome(watcher.result()) == outcome(inspector.inspect(project_root))
+
+
+def test_watcher_relists_only_dirty_directories(monkeypatch):
+    """A targeted refresh re-lists only the dirty subtree and re-reads only changed files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        for name in ["docs", "src", "src/deep"]:
+            (project_root / name).mkdir()
+        (project_root / "docs" / "notes.md").write_text("# Notes")
+        (project_root / "src" / "deep" / "guide.md").write_text("Our governance model")
+        (project_root / "CONTRIBUTING.md").write_text("# Contributing")
+
+        inspector = ProjectInspector(use_cache=False)
+        watcher = ProjectWatcher(inspector, project_root, events=PollingEvents())
+        watcher.start()
+
+        listed = []
+        scanned = []
+        original_scan_directory = watch.scan_directory
+        original_scan_file = inspector.scan_file
+
+        def counting_scan_directory(directory):
+            listed.append(directory.relative_to(project_root).as_posix())
+            return original_scan_directory(directory)
+
+        def counting_scan_file(entry, *args, **kwargs):
+            scanned.append(entry.rel_path)
+            return original_scan_file(entry, *args, **kwargs)
+
+        monkeypatch.setattr(watch, "scan_directory", counting_scan_directory)
+        monkeypatch.setattr(inspector, "scan_file", counting_scan_file)
+
+        (project_root / "docs" / "notes.md").write_text("Read our security policy.")
+        (project_root / "docs" / "more").mkdir()
+        (project_root / "docs" / "more" / "SUPPORT.md").write_text("# Support")
+        affected = watcher.refresh({"docs/"}, {"docs/notes.md"})
+
+        assert listed == ["docs", "docs/more"]
+        assert sorted(scanned) == ["docs/more/SUPPORT.md", "docs/notes.md"]
+        assert {"SECURITY.md", "SUPPORT.md"} <= affected
+        assert "GOVERNANCE.md" not in affected
+        found = watcher.result().found_documents
+        expected = inspector.inspect(project_root).found_documents
+        assert [(doc.blueprint_name, doc.actual_path) for doc in found] == [
+            (doc.blueprint_name, doc.actual_path) for doc in expected
+        ]
+
+
+@pytest.mark.parametrize("archive_format", ["gztar", "zip"])
+def test_inspector_reads_archives_without_extracting(archive_format):
+    """Test that an archive gives the same result as its extracted tree."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir) / "project"
+        (project_root / "docs").mkdir(parents=True)
+        (project_root / "docs" / "SECURITY.md").write_text("# Security")
+        (project_root / "docs" / "notes.md").write_text("Our code of conduct applies.")
+        (project_root / "node_modules" / "dep").mkdir(parents=True)
+        (project_root / "node_modules" / "dep" / "CONTRIBUTING.md").write_text("# Dep")
+
+        archive = Path(shutil.make_archive(str(Path(tmpdir) / "release"), archive_format, project_root))
+
+        inspector = ProjectInspector(source="filesystem")
+        expected = inspector.inspect(project_root).to_dict()
+        actual = inspector.inspect(archive).to_dict()
+
+        assert actual["project_root"] == str(archive)
+        assert actual["found_documents"] == expected["found_documents"]
+        assert actual["missing_documents"] == expected["missing_documents"]
+
+        if archive_format == "gztar":
+            # Tarball members are only read into memory up to the cap
+            with ArchiveSource(archive, max_bytes=3) as source:
+                entries = {entry.rel_path: entry for entry in source.list_files()}
+                assert source.open(entries["docs/notes.md"]).read() == b"Our"
+
+
+def test_inspector_revision_matches_checkout(monkeypatch):
+    """Test that inspecting a revision equals inspecting its checkout."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        def git(*args):
+            subprocess.run(
+                ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                cwd=project_root,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+
+        git("init", "-q")
+        (project_root / "SECURITY.md").write_text("# Security")
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "notes.md").write_text("See our code of conduct.")
+        git("add", "-A")
+        git("commit", "-q", "-m", "first")
+        expected = ProjectInspector(source="git-index").inspect(project_root).to_dict()
+
+        # Later work-tree changes must not leak into the revision
+        (project_root / "SECURITY.md").unlink()
+        (project_root / "GOVERNANCE.md").write_text("# Governance")
+        git("add", "-A")
+        git("commit", "-q", "-m", "second")
+
+        actual = ProjectInspector().inspect_revision(project_root, "HEAD~1").to_dict()
+        assert actual == expected
+
+        # Blob sizes come from reading the blob, not from listing the tree
+        with GitRevisionSource(project_root, "HEAD~1") as source:
+            entries = {entry.rel_path: entry for entry in source.list_files()}
+            assert entries["docs/notes.md"].size == -1
+            assert source.open(entries["docs/notes.md"]).read() == b"See our code of conduct."
+            assert entries["docs/notes.md"].size == len(b"See our code of conduct.")
+
+        # Capped reads drop the rest of each blob and stay in step with git
+        monkeypatch.setattr("diversity_standard.sources._SKIP_CHUNK_BYTES", 4)
+        with GitRevisionSource(project_root, "HEAD~1", max_bytes=3) as source:
+            entries = {entry.rel_path: entry for entry in source.list_files()}
+            assert source.open(entries["docs/notes.md"]).read() == b"See"
+            assert entries["docs/notes.md"].size == len(b"See our code of conduct.")
+            assert source.open(entries["SECURITY.md"]).read() == b"# S"
+
+        with pytest.raises(OSError):
+            ProjectInspector().inspect_revision(project_root, "no-such-ref")
+
+
+def test_history_timeline_reuses_unchanged_trees():
+    """Test the coverage timeline against per-revision inspections."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+
+        def commit(message):
+            for args in (["add", "-A"], ["commit", "-q", "-m", message]):
+                subprocess.run(
+                    ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                    cwd=project_root,
+                    check=True,
+                )
+
+        subprocess.run(["git", "init", "-q", str(project_root)], check=True)
+        (project_root / "docs").mkdir()
+        (project_root / "docs" / "notes.md").write_text("Our code of conduct applies.")
+        commit("notes")
+        (project_root / "src").mkdir()
+        (project_root / "src" / "main.py").write_text("print('hi')")
+        commit("code")
+        (project_root / "SECURITY.md").write_text("# Security")
+        commit("security")
+
+        inspector = ProjectInspector()
+        history = HistoryInspector(inspector, project_root)
+        points = list(history.timeline("HEAD"))
+
+        assert [point.subject for point in points] == ["notes", "code", "security"]
+        assert "SECURITY.md" not in points[1].found
+        assert "SECURITY.md" in points[2].found
+        assert "CODE_OF_CONDUCT.md" in points[0].found
+        for point in points:
+            expected = inspector.inspect_revision(project_root, point.commit)
+            assert point.result.to_dict() == expected.to_dict()
+        # docs/ never changed, so it was summarised once and each markdown
+        # blob (docs/notes.md, SECURITY.md) was scanned once
+        assert [prefix for _, prefix in history._trees].count("docs/") == 1
+        assert len(history._blob_hits) == 2
+
+
+def test_history_timeline_keeps_subjects_with_line_breaking_characters():
+    """Subjects with characters str.splitlines() breaks on stay one commit each."""
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        subprocess.run(["git", "init", "-q", str(project_root)], check=True)
+        subjects = ["fix\x0cpage", "group\x1dsep", "next\u2028line"]
+        for number, subject in enumerate(subjects):
+            (project_root / f"file{number}.txt").write_text(subject)
+            for args in (["add", "-A"], ["commit", "-q", "-m", subject]):
+                subprocess.run(
+                    ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                    cwd=project_root,
+                    check=True,
+                )
+
+        points = list(HistoryInspector(ProjectInspector(), project_root).timeline("HEAD"))
+        assert [point.subject for point in points] == subjects
+
+
+def test_inspect_history_table_shows_subjects_verbatim():
+    """Commit subjects are not read as rich markup in the history table."""
+    for module in ("click", "rich", "jinja2"):
+        pytest.importorskip(module)
+    from click.testing import CliRunner
+
+    from diversity_standard.cli import main
+
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        subprocess.run(["git", "init", "-q", str(project_root)], check=True)
+        subjects = ["[/bold] fix", "[user-1] add security"]
+        for number, subject in enumerate(subjects):
+            (project_root / ("SECURITY.md" if number else "README.md")).write_text(subject)
+            for args in (["add", "-A"], ["commit", "-q", "-m", subject]):
+                subprocess.run(
+                    ["git", "-c", "user.name=t", "-c", "user.email=t@example.com", *args],
+                    cwd=project_root,
+                    check=True,
+                )
+
+        result = CliRunner().invoke(
+            main, ["inspect", str(project_root), "--history", "HEAD"], env={"COLUMNS": "200"}
+        )
+        assert result.exit_code == 0, result.output
+        for subject in subjects:
+            assert subject in result.output
+
+
+def test_inspect_reports_skipped_documents_without_a_generator(user_cache_home, monkeypatch):
+    """inspect tells skipped documents from the registry, not a DocumentGenerator."""
+    for module in ("click", "rich", "jinja2"):
+        pytest.importorskip(module)
+    from click.testing import CliRunner
+
+    from diversity_standard.cli import main
+
+    def unexpected(*args, **kwargs):
+        raise AssertionError("inspect built a DocumentGenerator")
+
+    monkeypatch.setattr("diversity_standard.cli.DocumentGenerator", unexpected)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        project_root = Path(tmpdir)
+        (project_root / ".diversity-standard.yml").write_text("answers:\n  has_meetings: false\n")
+
+        result = CliRunner().invoke(main, ["inspect", str(project_root), "--format", "json"])
+        assert result.exit_code == 0, result.output
+        assert "MEETINGS.md" in json.loads(result.output)["intentionally_skipped"]
+        assert not user_cache_home.exists()
+
+
+def test_inspect_workspace_reports_each_package():
+    """Test that a monorepo is split into packages with their own coverage."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace_root = Path(tmpdir)
+
+        (workspace_root / "CODE_OF_CONDUCT.md").write_text("# Code of Conduct")
+        for name in ["alpha", "beta"]:
+            package = workspace_root / "packages" / name
+            package.mkdir(parents=True)
+            (package / "package.json").write_text(f'{{"name": "{name}"}}')
+        (workspace_root / "packages" / "alpha" / "SECURITY.md").write_text("# Security")
+
+        serial = inspect_workspace(workspace_root, processes=1)
+        parallel = inspect_workspace(workspace_root, processes=2)
+
+        assert [r.name for r in serial] == [".", "packages/alpha", "packages/beta"]
+        assert [r.project_name for r in serial][1:] == ["alpha", "beta"]
+
+        found = {
+            r.name: {doc.blueprint_name for doc in r.result.found_documents} for r in parallel
+        }
+        assert "SECURITY.md" in found["packages/alpha"]
+        assert "SECURITY.md" not in found["packages/beta"]
+        assert "SECURITY.md" not in found["."]
+        assert "CODE_OF_CONDUCT.md" in found["."]
+        assert [r.result.missing_documents for r in serial] == [
+            r.result.missing_documents for r in parallel
+        ]
+
+
+def test_inspect_workspace_applies_package_config(monkeypatch):
+    """Each package's own config applies as if inspect ran inside it."""
+    def unexpected(*args, **kwargs):
+        raise AssertionError("workspace inspection ran full auto-detection")
+
+    monkeypatch.setattr("diversity_standard.config.identify_license", unexpected)
+    monkeypatch.setattr("diversity_standard.config.detect_contributors", unexpected)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workspace_root = Path(tmpdir)
+        package = workspace_root / "packages" / "alpha"
+        (package / "examples").mkdir(parents=True)
+        (package / "Cargo.toml").write_text('[package]\nname = "alpha-crate"\n')
+        (package / "LICENSE").write_text("MIT License\n")
+        (package / "examples" / "SECURITY.md").write_text("# Security")
+        (package / "CONTRIBUTING.md").write_text("# Contributing")
+        (package / ".diversity-standard.yml").write_text(
+            "inspect:\n  exclude:\n    - examples/\n"
+        )
+
+        reports = {r.name: r for r in inspect_workspace(workspace_root, processes=1)}
+        alpha = reports["packages/alpha"]
+        expected = ProjectInspector(use_cache=False).inspect(package, exclude=["examples/"])
+
+        assert alpha.project_name == "alpha-crate"
+        assert alpha.result.missing_documents == expected.missing_documents
+        assert "SECURITY.md" in alpha.result.missing_documents
+        assert [doc.actual_path for doc in alpha.result.found_documents] == [
+            doc.actual_path for doc in expected.found_documents
+        ]
+
+
+def test_scan_fleet_resumes_from_checkpoint():
+    """Test that a fleet scan skips repositories recorded in the checkpoint."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        fleet_root = Path(tmpdir) / "mirrors"
+        for name in ["alpha", "beta"]:
+            (fleet_root / name).mkdir(parents=True)
+        (fleet_root / "beta" / "SECURITY.md").write_text("# Security")
+
+        output = Path(tmpdir) / "report.json"
+        checkpoint_path(output).write_text(
+            '{"repository": "alpha", "path": "", "found": [], "missing": ["X.md"], '
+            '"skipped": [], "error": null}\n{"repository": "be'
+        )
+
+        report = scan_fleet(fleet_root, output, processes=1)
+
+        assert [r["repository"] for r in report["repositories"]] == ["alpha", "beta"]
+        assert report["repositories"][0]["missing"] == ["X.md"]
+        assert report["repositories"][1]["found"][0]["document"] == "SECURITY.md"
+        assert output.exists()
+        assert not checkpoint_path(output).exists()
+
+
+def test_generator_renders_through_loader_and_bytecode_cache(user_cache_home, monkeypatch):
+    """Templates load by name through the Jinja loader; compiled code is reused across runs."""
+    pytest.importorskip("jinja2")
+    from diversity_standard.generator import DocumentGenerator
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        template_dir = make_template_tree(
+            root, {"Daily/SUPPORT.md": "{% if true %}Support for {{ project_name }}{% endif %}"}
+        )
+        config = ProjectConfig(root)
+        config.set("project.name", "Demo")
+
+        generator = DocumentGenerator(root, template_dir)
+        loaded = []
+        original_get_template = generator.env.get_template
+
+        def recording_get_template(name, *args, **kwargs):
+            loaded.append(name)
+            return original_get_template(name, *args, **kwargs)
+
+        monkeypatch.setattr(generator.env, "get_template", recording_get_template)
+        output = root / "out" / "SUPPORT.md"
+        assert generator.generate_document("SUPPORT.md", output, config, "Daily")
+        assert loaded == ["Daily/SUPPORT.md"]
+        assert output.read_text() == "Support for Demo"
+        assert len(list((user_cache_home / "diversity-standard" / "jinja").iterdir())) == 1
+
+        # A new generator (a later run) loads the bytecode instead of compiling
+        second = DocumentGenerator(root, template_dir)
+
+        def no_compile(*args, **kwargs):
+            raise AssertionError("the template should come from the bytecode cache")
+
+        monkeypatch.setattr(second.env, "compile", no_compile)
+        output = root / "again" / "SUPPORT.md"
+        assert second.generate_document("SUPPORT.md", output, config, "Daily")
+        assert output.read_text() == "Support for Demo"
+
+
+def test_generator_writes_in_parallel_atomically(monkeypatch):
+    """Parallel generation keeps the document order, file modes and no temporary files."""
+    pytest.importorskip("jinja2")
+    from diversity_standard.generator import DocumentGenerator
+    from diversity_standard.inspector import InspectionResult
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        names = [
+            "SUPPORT.md",
+            "CODE_OF_CONDUCT.md",
+            "SECURITY.md",
+            "CONTRIBUTING.md",
+            "GOVERNANCE.md",
+        ]
+        template_dir = make_template_tree(root, {name: f"# {name}" for name in names})
+        project_root = root / "project"
+        project_root.mkdir()
+        # A directory where a document should go makes its final rename fail
+        (project_root / "GOVERNANCE.md").mkdir()
+        # Overwritten files keep their mode, and symlinks are written through
+        shared = project_root / "shared"
+        shared.mkdir()
+        (shared / "SECURITY.md").write_text("old")
+        (shared / "SECURITY.md").chmod(0o600)
+        (project_root / "SECURITY.md").symlink_to(shared / "SECURITY.md")
+
+        generator = DocumentGenerator(root, template_dir, jobs=4)
+
+        # The first document finishes last; results must still come back in order
+        original_write = generator._write_atomic
+
+        def slow_first_write(output_path, content):
+            if output_path.name == names[0]:
+                time.sleep(0.2)
+            original_write(output_path, content)
+
+        monkeypatch.setattr(generator, "_write_atomic", slow_first_write)
+        result = InspectionResult(
+            found_documents=[], missing_documents=names, project_root=project_root
+        )
+        old_umask = os.umask(0o027)
+        try:
+            generated = generator.generate_missing_documents(
+                result, ProjectConfig(project_root), output_preferences={}, force=True
+            )
+        finally:
+            os.umask(old_umask)
+
+        assert generated == [project_root / name for name in names[:-1]]
+        for path in generated:
+            assert path.read_text() == f"# {path.name}"
+            expected_mode = 0o600 if path.name == "SECURITY.md" else 0o640
+            assert path.stat().st_mode & 0o777 == expected_mode
+        assert (project_root / "SECURITY.md").is_symlink()
+        assert (shared / "SECURITY.md").read_text() == "# SECURITY.md"
+        # The failed write removed its temporary file
+        assert (project_root / "GOVERNANCE.md").is_dir()
+        assert sorted(p.name for p in project_root.iterdir()) == sorted(names + ["shared"])
+        assert [p.name for p in shared.iterdir()] == ["SECURITY.md"]
+
+
+def test_generator_template_manifest_precedence():
+    """Templates come from the category directory, then the root, then other directories."""
+    pytest.importorskip("jinja2")
+    from diversity_standard.generator import DocumentGenerator
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        template_dir = make_template_tree(
+            root,
+            {
+                # Two spellings of one category: the first listed wins
+                "Daily/SUPPORT.md": "",
+                "daily/SUPPORT.md": "",
+                "long-term/CODE_OF_CONDUCT.md": "",
+                "LongTerm/CODE_OF_CONDUCT.md": "",
+                # No category directory: the root wins over subdirectories
+                "SECURITY.md": "",
+                "Zeta/SECURITY.md": "",
+                # Only in other directories: the first by name wins
+                "Zeta/GOVERNANCE.md": "",
+                "Alpha/GOVERNANCE.md": "",
+                "Alpha/CONTRIBUTING.md": "",
+            },
+        )
+        generator = DocumentGenerator(root, template_dir)
+
+        def found(name, category):
+            path = generator._find_template(name, category)
+            return path.relative_to(template_dir).as_posix() if path else None
+
+        assert found("SUPPORT.md", "Daily") == "Daily/SUPPORT.md"
+        assert found("CODE_OF_CONDUCT.md", "Long-Term") == "LongTerm/CODE_OF_CONDUCT.md"
+        assert found("SECURITY.md", "Procedural") == "SECURITY.md"
+        assert found("GOVERNANCE.md", "Long-Term") == "Alpha/GOVERNANCE.md"
+        assert found("SUPPORT.md", "Unknown") == "Daily/SUPPORT.md"
+        assert found("NOT_MAPPED.md", "Daily") is None
+
+        assert sorted(generator.template_conflicts) == [
+            "CODE_OF_CONDUCT.md",
+            "GOVERNANCE.md",
+            "SECURITY.md",
+            "SUPPORT.md",
+        ]
+        assert "CONTRIBUTING.md" not in generator.template_conflicts
+        assert generator.template_conflict_messages() == [
+            "CODE_OF_CONDUCT.md has 2 templates; using LongTerm/CODE_OF_CONDUCT.md, "
+            "ignoring long-term/CODE_OF_CONDUCT.md",
+            "GOVERNANCE.md has 2 templates; using Alpha/GOVERNANCE.md, ignoring Zeta/GOVERNANCE.md",
+            "SECURITY.md has 2 templates; using SECURITY.md, ignoring Zeta/SECURITY.md",
+            "SUPPORT.md has 2 templates; using Daily/SUPPORT.md, ignoring daily/SUPPORT.md",
+        ]
+
+
+def test_generator_base_context_follows_config_changes():
+    """The shared context is rebuilt after a change and does not alias the config."""
+    pytest.importorskip("jinja2")
+    from diversity_standard.generator import DocumentGenerator
+    from diversity_standard.inspector import InspectionResult
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+        template_dir = make_template_tree(
+            root,
+            {
+                "MEETINGS.md": "{{ project_name }} meets {{ meeting_cadence }}; "
+                "{{ maintainer_names }}"
+            },
+        )
+        project_root = root / "project"
+        project_root.mkdir()
+        config = ProjectConfig(project_root)
+        config.set("project.name", "Demo")
+        config.set("maintainers", [{"name": "Jane Doe"}])
+        config.set("answers", {"has_meetings": True, "meeting_cadence": "weekly"})
+
+        generator = DocumentGenerator(root, template_dir, jobs=1)
+        result = InspectionResult(
+            found_documents=[], missing_documents=["MEETINGS.md"], project_root=project_root
+        )
+        output = project_root / "MEETINGS.md"
+
+        generator.generate_missing_documents(result, config, output_preferences={})
+        assert output.read_text() == "Demo meets weekly; Jane Doe"
+
+        # Changes made through set() are rendered on the next run
+        config.set("answers", {"has_meetings": True, "meeting_cadence": "monthly"})
+        generator.generate_missing_documents(result, config, output_preferences={}, force=True)
+        assert output.read_text() == "Demo meets monthly; Jane Doe"
+
+        # The cached context holds copies, not the config's own containers
+        base = generator._base_context(config)
+        config.get("maintainers").append({"name": "Sam Roe"})
+        assert base["maintainers"] == [{"name": "Jane Doe"}]
+        config.touch()
+        generator.generate_missing_documents(result, config, output_preferences={}, force=True)
+        assert output.read_text() == "Demo meets monthly; Jane Doe, Sam Roe"